@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from pathlib import Path
 
 from PyQt6.QtGui import QUndoCommand, QUndoStack
 from PyQt6.QtWidgets import QMainWindow
 
-from app.core.scene import Node, Scene
+from app.core.scene import Node, Scene, SpriteRegion, intern_path
+from app.core.tilemap import AnyTileLayer, TileDiff, Tilemap
+
+# QUndoCommand.id() of pencil strokes, so the stack merges their events
+TILE_STROKE_ID = 1001
 
 
 def create_undo_stack(parent) -> QUndoStack:
@@ -54,23 +59,13 @@ class RemoveNodeCommand(QUndoCommand):
 		# Find parent and snapshot
 		if self._snapshot is None:
 			self._snapshot = self._scene.find_node(self._node_id)
-			# Find parent by DFS
-			self._parent_id = self._find_parent_id(self._scene.root, self._node_id)
+			self._parent_id = self._scene.parent_id(self._node_id)
 		self._scene.remove_node(self._node_id)
 
 	def undo(self) -> None:  # type: ignore[override]
 		if self._snapshot and self._parent_id:
 			self._scene.add_child(self._parent_id, self._snapshot)
 
-	def _find_parent_id(self, start: Node, child_id: str) -> str | None:
-		for child in start.children:
-			if child.id == child_id:
-				return start.id
-			found = self._find_parent_id(child, child_id)
-			if found:
-				return found
-		return None
-
 
 class DeleteNodesCommand(QUndoCommand):
 	def __init__(self, scene: Scene, node_ids: list[str]) -> None:
@@ -82,44 +77,37 @@ class DeleteNodesCommand(QUndoCommand):
 	def redo(self) -> None:  # type: ignore[override]
 		if not self._snapshots:
 			for nid in self._node_ids:
-				parent_id = self._find_parent_id(self._scene.root, nid)
+				parent_id = self._scene.parent_id(nid)
 				if parent_id is None:
 					continue
 				node = self._scene.find_node(nid)
 				if node is None:
 					continue
 				self._snapshots.append((parent_id, node))
-		for nid in self._node_ids:
-			self._scene.remove_node(nid)
+		with self._scene.batch():
+			for nid in self._node_ids:
+				self._scene.remove_node(nid)
 
 	def undo(self) -> None:  # type: ignore[override]
-		for parent_id, node in self._snapshots:
-			self._scene.add_child(parent_id, node)
+		with self._scene.batch():
+			for parent_id, node in self._snapshots:
+				self._scene.add_child(parent_id, node)
 
 	def _filter_top_level(self, ids: list[str]) -> list[str]:
 		id_set = set(ids)
 		result: list[str] = []
 		for nid in ids:
-			cur = self._find_parent_id(self._scene.root, nid)
+			cur = self._scene.parent_id(nid)
 			top = True
 			while cur is not None:
 				if cur in id_set:
 					top = False
 					break
-				cur = self._find_parent_id(self._scene.root, cur)
+				cur = self._scene.parent_id(cur)
 			if top:
 				result.append(nid)
 		return result
 
-	def _find_parent_id(self, start: Node, child_id: str) -> str | None:
-		for child in start.children:
-			if child.id == child_id:
-				return start.id
-			found = self._find_parent_id(child, child_id)
-			if found:
-				return found
-		return None
-
 
 def _clone_node_with_new_ids(node: Node) -> Node:
 	copy = Node(name=node.name)
@@ -141,20 +129,23 @@ class PasteNodesCommand(QUndoCommand):
 		from app.core.scene import Node
 
 		self.created_ids.clear()
-		for nd in self._nodes_data:
-			node = Node.from_dict(nd)
-			node = _clone_node_with_new_ids(node)
-			self._scene.add_child(self._parent_id, node)
-			self.created_ids.append(node.id)
+		with self._scene.batch():
+			for nd in self._nodes_data:
+				node = Node.from_dict(nd)
+				node = _clone_node_with_new_ids(node)
+				self._scene.add_child(self._parent_id, node)
+				self.created_ids.append(node.id)
 
 	def undo(self) -> None:  # type: ignore[override]
-		for nid in self.created_ids:
-			self._scene.remove_node(nid)
+		with self._scene.batch():
+			for nid in self.created_ids:
+				self._scene.remove_node(nid)
 
 
 class CreateSpriteCommand(QUndoCommand):
     def __init__(self, scene: Scene, parent_id: str, sprite_path: str, name: str | None = None,
-                 pos_x: float | None = None, pos_y: float | None = None) -> None:
+                 pos_x: float | None = None, pos_y: float | None = None,
+                 region: SpriteRegion | None = None) -> None:
         super().__init__("Create Sprite")
         self._scene = scene
         self._parent_id = parent_id
@@ -162,13 +153,15 @@ class CreateSpriteCommand(QUndoCommand):
         self._name = name or f"Sprite:{Path(sprite_path).name}"
         self._pos_x = pos_x
         self._pos_y = pos_y
+        self._region = region
         self.created_id: str | None = None
 
     def redo(self) -> None:  # type: ignore[override]
         from app.core.scene import Node
 
         node = Node(name=self._name)
-        node.sprite_path = self._sprite_path
+        node.sprite_path = intern_path(self._sprite_path)
+        node.sprite_region = self._region
         if self._pos_x is not None:
             node.transform.x = float(self._pos_x)
         if self._pos_y is not None:
@@ -195,13 +188,13 @@ class SetNodeNameCommand(QUndoCommand):
 			return
 		if self._old is None:
 			self._old = node.name
-		node.name = self._new
+		self._scene.rename_node(self._node_id, self._new)
 
 	def undo(self) -> None:  # type: ignore[override]
 		node = self._scene.find_node(self._node_id)
 		if not node or self._old is None:
 			return
-		node.name = self._old
+		self._scene.rename_node(self._node_id, self._old)
 
 
 class SetTransformFieldCommand(QUndoCommand):
@@ -221,9 +214,132 @@ class SetTransformFieldCommand(QUndoCommand):
 		if self._old is None:
 			self._old = float(cur)
 		setattr(node.transform, self._field, self._new)
+		self._scene.notify_transform_changed([self._node_id])
 
 	def undo(self) -> None:  # type: ignore[override]
 		node = self._scene.find_node(self._node_id)
 		if not node or self._old is None:
 			return
 		setattr(node.transform, self._field, self._old)
+		self._scene.notify_transform_changed([self._node_id])
+
+
+class OffsetTransformFieldCommand(QUndoCommand):
+	"""Add ``delta`` to one transform field of several nodes (inspector multi-select)."""
+
+	def __init__(self, scene: Scene, node_ids: list[str], field: str, delta: float) -> None:
+		super().__init__(f"Offset {field}")
+		self._scene = scene
+		self._node_ids = list(node_ids)
+		self._field = field
+		self._delta = float(delta)
+
+	def redo(self) -> None:  # type: ignore[override]
+		self._apply(self._delta)
+
+	def undo(self) -> None:  # type: ignore[override]
+		self._apply(-self._delta)
+
+	def _apply(self, delta: float) -> None:
+		store = self._scene.transforms
+		if store is not None:
+			# Array-backed transforms: one vectorized add over all slots
+			store.offset(store.slots(self._node_ids), self._field, delta)
+		else:
+			for node_id in self._node_ids:
+				node = self._scene.find_node(node_id)
+				if node is not None:
+					value = getattr(node.transform, self._field)
+					setattr(node.transform, self._field, value + delta)
+		self._scene.notify_transform_changed(self._node_ids)
+
+
+class TileEditCommand(QUndoCommand):
+	"""Tile edit already made on ``layer``, kept as a ``TileDiff`` of the changed cells.
+
+	Undo and redo write the old or new values back in one bulk call. Commands pushed with
+	the same ``stroke`` number (the pencil events of one drag) merge into a single step.
+	``on_change`` is called with the diff after each undo or redo.
+	"""
+
+	def __init__(
+		self,
+		layer: AnyTileLayer,
+		diff: TileDiff,
+		text: str = "Paint Tiles",
+		stroke: int | None = None,
+		on_change: Callable[[TileDiff], None] | None = None,
+	) -> None:
+		super().__init__(text)
+		self._layer = layer
+		self._diff = diff
+		self._stroke = stroke
+		self._on_change = on_change
+		# The edit is made before the push; the stack's initial redo has nothing to do
+		self._applied = True
+
+	@property
+	def diff(self) -> TileDiff:
+		return self._diff
+
+	def id(self) -> int:  # type: ignore[override]
+		return TILE_STROKE_ID if self._stroke is not None else -1
+
+	def mergeWith(self, other: QUndoCommand) -> bool:  # type: ignore[override]
+		if (
+			not isinstance(other, TileEditCommand)
+			or other._stroke != self._stroke
+			or other._layer is not self._layer
+		):
+			return False
+		self._diff.merge(other._diff)
+		return True
+
+	def redo(self) -> None:  # type: ignore[override]
+		if self._applied:
+			self._applied = False
+			return
+		self._apply(undo=False)
+
+	def undo(self) -> None:  # type: ignore[override]
+		self._apply(undo=True)
+
+	def _apply(self, undo: bool) -> None:
+		self._diff.apply(self._layer, undo=undo)
+		if self._on_change is not None:
+			self._on_change(self._diff)
+
+
+class ReplaceTileLayerCommand(QUndoCommand):
+	"""Swap ``tilemap.layers[index]`` for ``layer``, the same cells stored another way
+	(e.g. ``ChunkedTileLayer.from_layer``); undo puts the previous layer object back.
+
+	Tile edits keep applying to the layer object they were made on, so the history on
+	either side of the swap stays valid. ``on_change`` is called after each swap.
+	"""
+
+	def __init__(
+		self,
+		tilemap: Tilemap,
+		index: int,
+		layer: AnyTileLayer,
+		text: str = "Convert Layer",
+		on_change: Callable[[], None] | None = None,
+	) -> None:
+		super().__init__(text)
+		self._tilemap = tilemap
+		self._index = index
+		self._other = layer
+		self._on_change = on_change
+
+	def redo(self) -> None:  # type: ignore[override]
+		self._swap()
+
+	def undo(self) -> None:  # type: ignore[override]
+		self._swap()
+
+	def _swap(self) -> None:
+		layers = self._tilemap.layers
+		layers[self._index], self._other = self._other, layers[self._index]
+		if self._on_change is not None:
+			self._on_change()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from app.core.scene import Node, Scene, SceneEvent, SpriteRegion, TilemapNode, intern_path
+from app.core.tilemap import Tilemap
+
+# Journal size after which the scene should be rewritten in full and the journal emptied
+COMPACT_BYTES = 4 * 1024 * 1024
+
+
+class SceneJournal:
+	"""Append-only log of the edits made to a scene since it was last saved in full.
+
+	The journal listens to scene events and keeps one JSON record per line:
+
+	- ``{"op": "add", "parent": id, "node": {...}}`` with the added subtree;
+	- ``{"op": "remove", "id": id}``;
+	- ``{"op": "reparent", "id": id, "parent": id, "index": i}``;
+	- ``{"op": "transform", "id": id, "t": [x, y, rotation_deg, scale_x, scale_y]}``;
+	- ``{"op": "set", "id": id, ...}`` with the node's other fields.
+
+	Records hold absolute values, so replaying them over a scene that already contains
+	them is harmless. Transform and field changes are only noted on events and read when
+	``flush`` writes them, so a drag produces one record per node and flush, not per frame.
+	"""
+
+	def __init__(self, scene: Scene, path: Path, compact_bytes: int = COMPACT_BYTES) -> None:
+		self.scene = scene
+		self.path = path
+		self.compact_bytes = int(compact_bytes)
+		self._lines: list[str] = []
+		# id -> "transform" | "set", in the order nodes were first touched
+		self._dirty: dict[str, str] = {}
+		self._size = self._drop_torn_tail()
+		scene.subscribe(self._on_scene_events)
+
+	def close(self) -> None:
+		self.scene.unsubscribe(self._on_scene_events)
+
+	@property
+	def size(self) -> int:
+		"""Bytes written to the journal file so far."""
+		return self._size
+
+	def has_pending(self) -> bool:
+		return bool(self._lines or self._dirty)
+
+	def needs_compaction(self) -> bool:
+		return self._size >= self.compact_bytes
+
+	def flush(self) -> int:
+		"""Append pending records to the file; returns the number of bytes written."""
+		self._take_dirty()
+		if not self._lines:
+			return 0
+		data = "".join(self._lines).encode("utf-8")
+		self._lines.clear()
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		with open(self.path, "ab") as f:
+			f.write(data)
+			f.flush()
+			os.fsync(f.fileno())
+		self._size += len(data)
+		return len(data)
+
+	def truncate(self) -> None:
+		"""Drop all records; call once the scene itself has been saved in full."""
+		self._lines.clear()
+		self._dirty.clear()
+		self.path.unlink(missing_ok=True)
+		self._size = 0
+
+	def _drop_torn_tail(self) -> int:
+		# A record cut short by a crash would swallow the first record appended after it
+		if not self.path.exists():
+			return 0
+		with open(self.path, "rb+") as f:
+			data = f.read()
+			end = data.rfind(b"\n") + 1
+			if end != len(data):
+				f.truncate(end)
+		return end
+
+	def _on_scene_events(self, events: list[SceneEvent]) -> None:
+		for ev in events:
+			if ev.kind == "transform":
+				self._dirty.setdefault(ev.node_id, "transform")
+			elif ev.kind in ("changed", "renamed"):
+				self._dirty[ev.node_id] = "set"
+			elif ev.kind == "added" and ev.node is not None:
+				# Earlier changes must land before the structural record that follows them
+				self._take_dirty()
+				self._append({"op": "add", "parent": ev.parent_id, "node": ev.node.to_dict()})
+			elif ev.kind == "removed":
+				self._take_dirty()
+				self._append({"op": "remove", "id": ev.node_id})
+			elif ev.kind == "reparented" and ev.node is not None:
+				self._take_dirty()
+				parent = self.scene.find_node(ev.parent_id or "")
+				if parent is None or ev.node not in parent.children:
+					continue
+				self._append(
+					{
+						"op": "reparent",
+						"id": ev.node_id,
+						"parent": ev.parent_id,
+						"index": parent.children.index(ev.node),
+					}
+				)
+
+	def _take_dirty(self) -> None:
+		for node_id, kind in self._dirty.items():
+			node = self.scene.find_node(node_id)
+			if node is None:
+				continue
+			t = node.transform
+			record: dict[str, Any] = {
+				"op": "transform",
+				"id": node_id,
+				"t": [t.x, t.y, t.rotation_deg, t.scale_x, t.scale_y],
+			}
+			if kind == "set":
+				record["op"] = "set"
+				record["name"] = node.name
+				record["sprite_path"] = node.sprite_path
+				region = node.sprite_region
+				record["sprite_region"] = region.to_dict() if region is not None else None
+				record.update(node._tail_dict())
+			self._append(record)
+		self._dirty.clear()
+
+	def _append(self, record: dict[str, Any]) -> None:
+		self._lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def replay_journal(scene: Scene, path: Path) -> int:
+	"""Apply the records of the journal at ``path`` to ``scene``; returns how many applied.
+
+	A torn last line (the editor died while appending) is ignored.
+	"""
+	if not path.exists():
+		return 0
+	applied = 0
+	with open(path, encoding="utf-8") as f:
+		for line in f:
+			try:
+				record = json.loads(line)
+			except ValueError:
+				break
+			if apply_record(scene, record):
+				applied += 1
+	return applied
+
+
+def apply_record(scene: Scene, record: dict[str, Any]) -> bool:
+	op = record.get("op")
+	if op == "add":
+		data = record.get("node") or {}
+		if scene.find_node(str(data.get("id", ""))) is not None:
+			return False
+		return scene.add_child(str(record.get("parent", "")), Node.from_dict(data))
+	if op == "remove":
+		return scene.remove_node(str(record.get("id", "")))
+	if op == "reparent":
+		node_id = str(record.get("id", ""))
+		parent_id = str(record.get("parent", ""))
+		if scene.parent_id(node_id) == parent_id:
+			return False
+		return scene.reparent_node(node_id, parent_id, record.get("index"))
+	node = scene.find_node(str(record.get("id", "")))
+	if node is None:
+		return False
+	if op not in ("transform", "set"):
+		return False
+	t = node.transform
+	t.x, t.y, t.rotation_deg, t.scale_x, t.scale_y = (float(v) for v in record["t"])
+	if op == "transform":
+		scene.notify_transform_changed([node.id])
+		return True
+	node.name = str(record.get("name", node.name))
+	node.sprite_path = intern_path(record.get("sprite_path"))
+	node.sprite_region = SpriteRegion.from_dict(record.get("sprite_region"))
+	if isinstance(node, TilemapNode) and "tilemap" in record:
+		tilemap = record.get("tilemap")
+		node.tilemap = Tilemap.from_dict(tilemap) if tilemap is not None else None
+	scene.notify_node_changed([node.id])
+	return True
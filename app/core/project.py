@@ -7,6 +7,9 @@ from typing import TYPE_CHECKING
 
 PROJECT_DIRNAME = ".gameproj"
 PROJECT_FILE = "project.json"
+JOURNAL_DIRNAME = "journal"
+# Scene file format -> file suffix
+SCENE_FORMATS = {"json": ".json", "binary": ".dscene"}
 
 
 @dataclass
@@ -15,6 +18,7 @@ class ProjectMeta:
 	version: int = 1
 	scene_width: int = 1920
 	scene_height: int = 1080
+	scene_format: str = "json"
 
 
 @dataclass
@@ -41,7 +45,11 @@ class Project:
 		data = {
 			"name": self.meta.name,
 			"version": self.meta.version,
-			"scene": {"width": self.meta.scene_width, "height": self.meta.scene_height},
+			"scene": {
+				"width": self.meta.scene_width,
+				"height": self.meta.scene_height,
+				"format": self.meta.scene_format,
+			},
 		}
 		(self.project_dir / PROJECT_FILE).write_text(
 			json.dumps(data, indent=2), encoding="utf-8"
@@ -59,7 +67,10 @@ class Project:
 			version=version,
 			scene_width=int(scene.get("width", 1920)),
 			scene_height=int(scene.get("height", 1080)),
+			scene_format=str(scene.get("format", "json")),
 		)
+		if meta.scene_format not in SCENE_FORMATS:
+			meta.scene_format = "json"
 		return Project(root=root, meta=meta)
 
 
@@ -97,22 +108,58 @@ def save_project_as(project: Project, new_root: Path) -> Project:
 
 
 # Scene helpers
-def scene_path(project: Project, scene_name: str) -> Path:
-	return project.scenes_dir / f"{scene_name}.json"
+def scene_path(project: Project, scene_name: str, scene_format: str | None = None) -> Path:
+	suffix = SCENE_FORMATS[scene_format or project.meta.scene_format]
+	return project.scenes_dir / f"{scene_name}{suffix}"
+
+
+def existing_scene_path(project: Project, scene_name: str) -> Path | None:
+	"""Saved file of the scene, preferring the project's format; None if never saved."""
+	preferred = project.meta.scene_format
+	for scene_format in [preferred] + [f for f in SCENE_FORMATS if f != preferred]:
+		path = scene_path(project, scene_name, scene_format)
+		if path.exists():
+			return path
+	return None
 
 
 if TYPE_CHECKING:  # pragma: no cover
+	from app.core.journal import SceneJournal
 	from app.core.scene import Scene
 
 
+def journal_path(project: Project, scene_name: str) -> Path:
+    return project.project_dir / JOURNAL_DIRNAME / f"{scene_name}.jsonl"
+
+
 def save_scene(project: Project, scene: Scene) -> Path:
     path = scene_path(project, scene.name)
-    scene.save_json(path)
+    if project.meta.scene_format == "binary":
+        scene.save_binary(path)
+    else:
+        scene.save_json(path)
+    # The full file now holds everything the journal recorded
+    journal_path(project, scene.name).unlink(missing_ok=True)
     return path
 
 
 def load_scene(project: Project, scene_name: str) -> Scene:
+    from app.core.journal import replay_journal
     from app.core.scene import Scene
 
-    return Scene.load_json(scene_path(project, scene_name))
+    # A scene saved before the project switched formats is still found and read
+    path = existing_scene_path(project, scene_name) or scene_path(project, scene_name)
+    if path.suffix == SCENE_FORMATS["binary"]:
+        scene = Scene.load_binary(path)
+    else:
+        scene = Scene.load_json(path)
+    # Edits made after the last full save (or before a crash) are in the journal
+    replay_journal(scene, journal_path(project, scene_name))
+    return scene
+
+
+def open_scene_journal(project: Project, scene: Scene) -> SceneJournal:
+    """Start journaling edits of ``scene``; see ``app.core.journal``."""
+    from app.core.journal import SceneJournal
 
+    return SceneJournal(scene, journal_path(project, scene.name))
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import json
+import sys
 import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from app.core.tilemap import Tilemap
 
+if TYPE_CHECKING:
+	from app.core.transform_store import TransformStore
 
-@dataclass
+
+@dataclass(slots=True)
 class Transform:
 	x: float = 0.0
 	y: float = 0.0
@@ -37,57 +42,110 @@ class Transform:
 		)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class SpriteRegion:
+	"""Source rect of a sprite inside its texture, in pixels."""
+	x: int
+	y: int
+	w: int
+	h: int
+
+	def to_dict(self) -> dict[str, int]:
+		return {"x": self.x, "y": self.y, "w": self.w, "h": self.h}
+
+	@staticmethod
+	def from_dict(data: dict[str, Any] | None) -> SpriteRegion | None:
+		if not data:
+			return None
+		return SpriteRegion(
+			x=int(data.get("x", 0)),
+			y=int(data.get("y", 0)),
+			w=int(data.get("w", 0)),
+			h=int(data.get("h", 0)),
+		)
+
+
+def intern_path(path: str | None) -> str | None:
+	"""Share one string object between all nodes referencing the same asset."""
+	return sys.intern(path) if path else None
+
+
+@dataclass(slots=True)
 class Node:
 	name: str
 	id: str = field(default_factory=lambda: str(uuid.uuid4()))
 	transform: Transform = field(default_factory=Transform)
-	sprite_path: str | None = None
-	sprite_region: dict | None = None  # {x,y,w,h}
+	sprite_path: str | None = None  # interned, see intern_path
+	sprite_region: SpriteRegion | None = None
 	children: list[Node] = field(default_factory=list)
 
 	def add_child(self, node: Node) -> None:
 		self.children.append(node)
 
 	def to_dict(self) -> dict[str, Any]:
+		# Iterative so deep hierarchies do not hit the recursion limit
+		root = self._head_dict()
+		stack: list[tuple[Node, dict[str, Any]]] = [(self, root)]
+		while stack:
+			node, data = stack.pop()
+			children: list[dict[str, Any]] = []
+			data["children"] = children
+			data.update(node._tail_dict())
+			for child in node.children:
+				child_data = child._head_dict()
+				children.append(child_data)
+				stack.append((child, child_data))
+		return root
+
+	def _head_dict(self) -> dict[str, Any]:
+		# Fields written before "children"
 		return {
 			"id": self.id,
 			"name": self.name,
 			"transform": self.transform.to_dict(),
 			"sprite_path": self.sprite_path,
-			"sprite_region": self.sprite_region,
-			"children": [child.to_dict() for child in self.children],
+			"sprite_region": self.sprite_region.to_dict() if self.sprite_region else None,
 		}
 
+	def _tail_dict(self) -> dict[str, Any]:
+		# Fields written after "children"
+		return {}
+
 	@staticmethod
 	def from_dict(data: dict[str, Any]) -> Node:
+		return _attach_children(Node._from_fields(data), data)
+
+	@staticmethod
+	def _from_fields(data: dict[str, Any]) -> Node:
 		# If tilemap payload exists, construct TilemapNode
 		if data.get("tilemap") is not None:
-			return TilemapNode.from_dict(data)
+			return TilemapNode._from_fields(data)
 		node = Node(
 			name=str(data.get("name", "Node")),
 			id=str(data.get("id", str(uuid.uuid4()))),
 			transform=Transform.from_dict(data.get("transform", {})),
 		)
-		node.sprite_path = data.get("sprite_path") or None
-		node.sprite_region = data.get("sprite_region") or None
-		for child_data in data.get("children", []) or []:
-			node.children.append(Node.from_dict(child_data))
+		node.sprite_path = intern_path(data.get("sprite_path"))
+		node.sprite_region = SpriteRegion.from_dict(data.get("sprite_region"))
 		return node
 
 
-@dataclass
+@dataclass(slots=True)
 class TilemapNode(Node):
 	"""Node with embedded tilemap data."""
 	tilemap: Tilemap | None = None
 
-	def to_dict(self) -> dict[str, Any]:  # type: ignore[override]
-		base = super().to_dict()
-		base["tilemap"] = self.tilemap.to_dict() if self.tilemap else None
-		return base
+	def _tail_dict(self) -> dict[str, Any]:
+		return {"tilemap": self.tilemap.to_dict() if self.tilemap else None}
 
 	@staticmethod
 	def from_dict(data: dict[str, Any]) -> TilemapNode:
+		node = TilemapNode._from_fields(data)
+		_attach_children(node, data)
+		return node
+
+	@staticmethod
+	def _from_fields(data: dict[str, Any]) -> TilemapNode:
 		node = TilemapNode(
 			name=str(data.get("name", "Tilemap")),
 			id=str(data.get("id", str(uuid.uuid4()))),
@@ -98,15 +156,63 @@ class TilemapNode(Node):
 				node.tilemap = Tilemap.from_dict(data.get("tilemap", {}))
 			except Exception:
 				node.tilemap = None
-		for child_data in data.get("children", []) or []:
-			node.children.append(Node.from_dict(child_data))
 		return node
 
 
+def _attach_children(root: Node, data: dict[str, Any]) -> Node:
+	# Build the subtree described by data["children"] without recursion
+	stack: list[tuple[Node, dict[str, Any]]] = [(root, data)]
+	while stack:
+		node, node_data = stack.pop()
+		for child_data in node_data.get("children", []) or []:
+			child = Node._from_fields(child_data)
+			node.children.append(child)
+			stack.append((child, child_data))
+	return root
+
+
+@dataclass
+class SceneEvent:
+	"""Change notification delivered to scene listeners.
+
+	kind: "added" | "removed" (``node`` is the subtree root, ``parent_id`` its parent);
+	"reparented" (``node`` moved from ``old_parent_id`` to ``parent_id``);
+	"renamed" (name of ``node_id`` changed);
+	"transform" | "changed" (geometry of ``node_id`` itself changed).
+	"""
+	kind: str
+	node_id: str
+	parent_id: str | None = None
+	node: Node | None = None
+	old_parent_id: str | None = None
+
+
+SceneListener = Callable[[list[SceneEvent]], None]
+
+
 @dataclass
 class Scene:
 	name: str
 	root: Node = field(default_factory=lambda: Node(name="Root"))
+	_listeners: list[SceneListener] = field(
+		default_factory=list, init=False, repr=False, compare=False
+	)
+	# id -> node and id -> parent id for every node under root, kept in sync by
+	# add_child/remove_node; the tree must not be mutated behind the scene's back
+	_nodes: dict[str, Node] = field(default_factory=dict, init=False, repr=False, compare=False)
+	_parents: dict[str, str | None] = field(
+		default_factory=dict, init=False, repr=False, compare=False
+	)
+	# Optional array-backed transforms of all nodes, see enable_transform_store
+	transforms: TransformStore | None = field(
+		default=None, init=False, repr=False, compare=False
+	)
+	# Events held back while inside ``batch()``
+	_batch_depth: int = field(default=0, init=False, repr=False, compare=False)
+	_batched: list[SceneEvent] = field(default_factory=list, init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		self.reindex()
 
 	def to_dict(self) -> dict[str, Any]:
 		return {
@@ -122,40 +228,180 @@ class Scene:
 		)
 
 	def save_json(self, path: Path) -> None:
-		path.parent.mkdir(parents=True, exist_ok=True)
-		path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+		from app.core.scene_io import write_scene_json
+
+		write_scene_json(self, path)
 
 	@staticmethod
 	def load_json(path: Path) -> Scene:
-		data = json.loads(path.read_text(encoding="utf-8"))
-		return Scene.from_dict(data)
+		from app.core.scene_io import read_scene_json
+
+		return read_scene_json(path)
+
+	def save_binary(self, path: Path) -> None:
+		from app.core.scene_binary import write_scene_binary
+
+		write_scene_binary(self, path)
+
+	@staticmethod
+	def load_binary(path: Path) -> Scene:
+		from app.core.scene_binary import read_scene_binary
+
+		return read_scene_binary(path)
 
 	# Utilities
+	def reindex(self) -> None:
+		"""Rebuild the id and parent indices from ``root``."""
+		self._nodes.clear()
+		self._parents.clear()
+		self._register(self.root, None)
+
+	def enable_transform_store(self) -> bool:
+		"""Move node transforms into a NumPy-backed store; False if NumPy is missing."""
+		from app.core import transform_store
+
+		if self.transforms is not None:
+			return True
+		if not transform_store.available():
+			return False
+		self.transforms = transform_store.TransformStore(capacity=max(256, len(self._nodes)))
+		for node in self._nodes.values():
+			self.transforms.attach(node)
+		return True
+
+	def iter_nodes(self, start: Node | None = None) -> Iterator[Node]:
+		"""Pre-order traversal without recursion, so deep trees are safe."""
+		stack = [start or self.root]
+		while stack:
+			node = stack.pop()
+			yield node
+			stack.extend(reversed(node.children))
+
 	def find_node(self, node_id: str, start: Node | None = None) -> Node | None:
-		start = start or self.root
-		if start.id == node_id:
-			return start
-		for child in start.children:
-			found = self.find_node(node_id, child)
-			if found:
-				return found
+		node = self._nodes.get(node_id)
+		if node is None or start is None or start is self.root:
+			return node
+		# Restricted to a subtree: the node must have ``start`` among its ancestors
+		cur: str | None = node_id
+		while cur is not None:
+			if cur == start.id:
+				return node
+			cur = self._parents.get(cur)
 		return None
 
+	def parent_id(self, node_id: str) -> str | None:
+		return self._parents.get(node_id)
+
 	def add_child(self, parent_id: str, node: Node) -> bool:
-		parent = self.find_node(parent_id)
+		parent = self._nodes.get(parent_id)
 		if parent is None:
 			return False
 		parent.add_child(node)
+		self._register(node, parent_id)
+		self._emit([SceneEvent("added", node.id, parent_id, node)])
 		return True
 
 	def remove_node(self, node_id: str, start: Node | None = None) -> bool:
-		start = start or self.root
-		for idx, child in enumerate(start.children):
+		if self.find_node(node_id, start) is None:
+			return False
+		parent = self._nodes.get(self._parents.get(node_id) or "")
+		if parent is None:
+			# Root (or a detached node) cannot be removed
+			return False
+		for idx, child in enumerate(parent.children):
 			if child.id == node_id:
-				del start.children[idx]
-				return True
-			if self.remove_node(node_id, child):
+				del parent.children[idx]
+				self._unregister(child)
+				self._emit([SceneEvent("removed", node_id, parent.id, child)])
 				return True
 		return False
 
+	def rename_node(self, node_id: str, name: str) -> bool:
+		node = self._nodes.get(node_id)
+		if node is None:
+			return False
+		if node.name != name:
+			node.name = name
+			self._emit([SceneEvent("renamed", node_id)])
+		return True
+
+	def reparent_node(self, node_id: str, parent_id: str, index: int | None = None) -> bool:
+		"""Move a node (with its subtree) under ``parent_id``, at ``index`` or last."""
+		node = self._nodes.get(node_id)
+		new_parent = self._nodes.get(parent_id)
+		old_parent = self._nodes.get(self._parents.get(node_id) or "")
+		if node is None or new_parent is None or old_parent is None:
+			return False
+		# A node cannot become its own descendant
+		cur: str | None = parent_id
+		while cur is not None:
+			if cur == node_id:
+				return False
+			cur = self._parents.get(cur)
+		old_parent.children.remove(node)
+		if index is None:
+			new_parent.children.append(node)
+		else:
+			new_parent.children.insert(max(0, index), node)
+		self._parents[node_id] = parent_id
+		self._emit([SceneEvent("reparented", node_id, parent_id, node, old_parent.id)])
+		return True
+
+	def _register(self, start: Node, parent_id: str | None) -> None:
+		stack: list[tuple[Node, str | None]] = [(start, parent_id)]
+		while stack:
+			node, pid = stack.pop()
+			self._nodes[node.id] = node
+			self._parents[node.id] = pid
+			if self.transforms is not None:
+				self.transforms.attach(node)
+			stack.extend((child, node.id) for child in node.children)
+
+	def _unregister(self, start: Node) -> None:
+		for node in self.iter_nodes(start):
+			self._nodes.pop(node.id, None)
+			self._parents.pop(node.id, None)
+			# Detached nodes (e.g. kept by undo commands) must not alias a reusable slot
+			if self.transforms is not None:
+				self.transforms.detach(node)
+
+	# Change notifications
+	def subscribe(self, listener: SceneListener) -> None:
+		if listener not in self._listeners:
+			self._listeners.append(listener)
+
+	def unsubscribe(self, listener: SceneListener) -> None:
+		if listener in self._listeners:
+			self._listeners.remove(listener)
+
+	def notify_transform_changed(self, node_ids: Iterable[str]) -> None:
+		self._emit([SceneEvent("transform", nid) for nid in node_ids])
+
+	def notify_node_changed(self, node_ids: Iterable[str]) -> None:
+		self._emit([SceneEvent("changed", nid) for nid in node_ids])
+
+	@contextmanager
+	def batch(self) -> Iterator[None]:
+		"""Deliver all events emitted inside the block to listeners as one list, at its end.
+
+		Batches nest; only the outermost one delivers.
+		"""
+		self._batch_depth += 1
+		try:
+			yield
+		finally:
+			self._batch_depth -= 1
+			if self._batch_depth == 0:
+				events, self._batched = self._batched, []
+				self._emit(events)
+
+	def _emit(self, events: list[SceneEvent]) -> None:
+		if not events:
+			return
+		if self._batch_depth:
+			self._batched.extend(events)
+			return
+		for listener in list(self._listeners):
+			listener(events)
+
 
@@ -0,0 +1,376 @@
+"""Binary scene format (``.dscene``), an alternative to the JSON scene files.
+
+Layout (little-endian):
+
+- header: magic, format version, section offsets, node and string counts;
+- node table: one fixed-size record per node in pre-order, each referencing its parent by
+  index, with the transform stored inline and names, ids and paths as string indices;
+- string table: ``string_count + 1`` u64 offsets followed by UTF-8 data, each distinct
+  string stored once;
+- blobs: tilemaps, each a small header, per-layer headers and raw int32 tile data; sparse
+  layers store each allocated chunk as its coordinate followed by its cells.
+
+The file is read through ``mmap``: ``SceneFile`` decodes records and strings on demand, so
+inspecting a scene does not parse the whole file. Whatever ``Scene.to_dict`` writes
+survives a round trip, so scenes convert to and from JSON without loss.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from app.core.scene import Node, Scene, SpriteRegion, TilemapNode, Transform, intern_path
+from app.core.scene_io import read_scene_json, write_scene_json
+from app.core.tilemap import CHUNK_SIZE, AnyTileLayer, ChunkedTileLayer, TileLayer, Tilemap
+
+SUFFIX = ".dscene"
+MAGIC = b"DSCN"
+VERSION = 2
+
+# magic, version, header size, node count, string count, scene name, reserved,
+# node table offset, string table offset, blob section offset
+_HEADER = struct.Struct("<4sHHIIIIQQQ")
+# parent index, id, name, sprite path, flags, x, y, rotation, scale x, scale y,
+# region x, y, w, h, tilemap offset within the blob section
+_NODE = struct.Struct("<iIIII5d4iQ")
+# tileset path, tile width, tile height, layer count
+_TILEMAP = struct.Struct("<IiiI")
+# name, width, height, number of cells, number of chunks, chunk size (0 for dense layers)
+_LAYER = struct.Struct("<IiiQII")
+# Version 1 layers had no chunk fields
+_LAYER_V1 = struct.Struct("<IiiQ")
+# chunk coordinate, followed by chunk size * chunk size cells
+_CHUNK = struct.Struct("<ii")
+_OFFSET = struct.Struct("<Q")
+
+NO_STRING = 0xFFFFFFFF
+FLAG_REGION = 1
+FLAG_TILEMAP_NODE = 2
+FLAG_TILEMAP = 4
+
+# Lone surrogates are valid in JSON strings and must survive the round trip too
+_ERRORS = "surrogatepass"
+
+
+class NodeRecord(NamedTuple):
+	parent: int
+	id: int
+	name: int
+	sprite_path: int
+	flags: int
+	x: float
+	y: float
+	rotation_deg: float
+	scale_x: float
+	scale_y: float
+	region_x: int
+	region_y: int
+	region_w: int
+	region_h: int
+	tilemap: int
+
+
+class _Strings:
+	def __init__(self) -> None:
+		self.index: dict[str, int] = {}
+
+	def add(self, value: str | None) -> int:
+		if value is None:
+			return NO_STRING
+		idx = self.index.get(value)
+		if idx is None:
+			idx = self.index[value] = len(self.index)
+		return idx
+
+	def to_bytes(self) -> bytes:
+		offsets = bytearray()
+		data = bytearray()
+		for value in self.index:
+			offsets += _OFFSET.pack(len(data))
+			data += value.encode("utf-8", _ERRORS)
+		offsets += _OFFSET.pack(len(data))
+		return bytes(offsets + data)
+
+
+def _pack_tilemap(tilemap: Tilemap, strings: _Strings, blobs: bytearray) -> int:
+	offset = len(blobs)
+	blobs += _TILEMAP.pack(
+		strings.add(tilemap.tileset_path),
+		int(tilemap.tile_width),
+		int(tilemap.tile_height),
+		len(tilemap.layers),
+	)
+	for layer in tilemap.layers:
+		name = strings.add(layer.name)
+		if isinstance(layer, ChunkedTileLayer):
+			blobs += _LAYER.pack(
+				name, int(layer.width), int(layer.height), 0, len(layer.chunks), CHUNK_SIZE
+			)
+			for cx, cy, cells in layer.iter_chunks():
+				blobs += _CHUNK.pack(cx, cy)
+				blobs += _cell_bytes(cells)
+			continue
+		blobs += _LAYER.pack(name, int(layer.width), int(layer.height), len(layer.data), 0, 0)
+		blobs += _cell_bytes(layer.data)
+	return offset
+
+
+def _cell_bytes(cells: array) -> bytes:
+	if sys.byteorder == "big":
+		cells = array("i", cells)
+		cells.byteswap()
+	return cells.tobytes()
+
+
+def _cells(buf: mmap.mmap, pos: int, count: int) -> array:
+	cells = array("i")
+	cells.frombytes(buf[pos : pos + count * cells.itemsize])
+	if sys.byteorder == "big":
+		cells.byteswap()
+	return cells
+
+
+def write_scene_binary(scene: Scene, path: Path) -> None:
+	"""Write ``scene`` to ``path``; the file is replaced only once fully written."""
+	strings = _Strings()
+	scene_name = strings.add(scene.name)
+	nodes = bytearray()
+	blobs = bytearray()
+	count = 0
+	stack: list[tuple[Node, int]] = [(scene.root, -1)]
+	while stack:
+		node, parent = stack.pop()
+		t = node.transform
+		region = node.sprite_region
+		flags = FLAG_REGION if region is not None else 0
+		tilemap_offset = 0
+		if isinstance(node, TilemapNode):
+			flags |= FLAG_TILEMAP_NODE
+			if node.tilemap is not None:
+				flags |= FLAG_TILEMAP
+				tilemap_offset = _pack_tilemap(node.tilemap, strings, blobs)
+		nodes += _NODE.pack(
+			parent,
+			strings.add(node.id),
+			strings.add(node.name),
+			strings.add(node.sprite_path),
+			flags,
+			float(t.x),
+			float(t.y),
+			float(t.rotation_deg),
+			float(t.scale_x),
+			float(t.scale_y),
+			*((region.x, region.y, region.w, region.h) if region is not None else (0, 0, 0, 0)),
+			tilemap_offset,
+		)
+		stack.extend((child, count) for child in reversed(node.children))
+		count += 1
+	string_table = strings.to_bytes()
+	nodes_offset = _HEADER.size
+	strings_offset = nodes_offset + len(nodes)
+	blobs_offset = strings_offset + len(string_table)
+	header = _HEADER.pack(
+		MAGIC,
+		VERSION,
+		_HEADER.size,
+		count,
+		len(strings.index),
+		scene_name,
+		0,
+		nodes_offset,
+		strings_offset,
+		blobs_offset,
+	)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	tmp = path.with_name(path.name + ".tmp")
+	with open(tmp, "wb") as f:
+		f.write(header)
+		f.write(nodes)
+		f.write(string_table)
+		f.write(blobs)
+	os.replace(tmp, path)
+
+
+class SceneFile:
+	"""Read-only, memory-mapped view of a ``.dscene`` file.
+
+	Only the header is decoded on open; node records, strings and tilemaps are read from
+	the mapping when asked for. Use as a context manager or call ``close``.
+	"""
+
+	def __init__(self, path: Path) -> None:
+		with open(path, "rb") as f:
+			size = os.fstat(f.fileno()).st_size
+			if size < _HEADER.size:
+				raise ValueError(f"Not a binary scene file: {path}")
+			self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		(
+			magic,
+			version,
+			_header_size,
+			self.node_count,
+			self.string_count,
+			self._name,
+			_reserved,
+			self._nodes,
+			self._strings,
+			self._blobs,
+		) = _HEADER.unpack_from(self._mm, 0)
+		if magic != MAGIC:
+			self.close()
+			raise ValueError(f"Not a binary scene file: {path}")
+		if version > VERSION:
+			self.close()
+			raise ValueError(f"Unsupported binary scene version {version}: {path}")
+		self.version = version
+		# Start of the string data, after the offsets
+		self._string_data = self._strings + (self.string_count + 1) * _OFFSET.size
+
+	def __enter__(self) -> SceneFile:
+		return self
+
+	def __exit__(self, *exc: object) -> None:
+		self.close()
+
+	def close(self) -> None:
+		self._mm.close()
+
+	@property
+	def name(self) -> str:
+		return self.string(self._name) or ""
+
+	def string(self, idx: int) -> str | None:
+		if idx == NO_STRING:
+			return None
+		start, end = struct.unpack_from("<QQ", self._mm, self._strings + idx * _OFFSET.size)
+		base = self._string_data
+		return self._mm[base + start : base + end].decode("utf-8", _ERRORS)
+
+	def node(self, i: int) -> NodeRecord:
+		if not 0 <= i < self.node_count:
+			raise IndexError(i)
+		return NodeRecord._make(_NODE.unpack_from(self._mm, self._nodes + i * _NODE.size))
+
+	def tilemap(self, offset: int) -> Tilemap:
+		mm = self._mm
+		pos = self._blobs + offset
+		tileset, tile_w, tile_h, layer_count = _TILEMAP.unpack_from(mm, pos)
+		pos += _TILEMAP.size
+		layers: list[AnyTileLayer] = []
+		for _ in range(layer_count):
+			if self.version < 2:
+				name, width, height, cells = _LAYER_V1.unpack_from(mm, pos)
+				pos += _LAYER_V1.size
+				chunks = chunk_size = 0
+			else:
+				name, width, height, cells, chunks, chunk_size = _LAYER.unpack_from(mm, pos)
+				pos += _LAYER.size
+			data = _cells(mm, pos, cells)
+			pos += cells * data.itemsize
+			layer_name = self.string(name) or ""
+			if not chunk_size:
+				layers.append(TileLayer(name=layer_name, width=width, height=height, data=data))
+				continue
+			layer = ChunkedTileLayer(name=layer_name, width=width, height=height)
+			for _ in range(chunks):
+				cx, cy = _CHUNK.unpack_from(mm, pos)
+				pos += _CHUNK.size
+				cells_per_chunk = chunk_size * chunk_size
+				chunk = _cells(mm, pos, cells_per_chunk)
+				pos += cells_per_chunk * chunk.itemsize
+				if chunk_size == CHUNK_SIZE:
+					layer.chunks[(cx, cy)] = chunk
+					continue
+				x0 = cx * chunk_size
+				y0 = cy * chunk_size
+				for i, value in enumerate(chunk):
+					if value >= 0:
+						layer.set(x0 + i % chunk_size, y0 + i // chunk_size, value)
+			layer._recount()
+			layers.append(layer)
+		return Tilemap(
+			tileset_path=self.string(tileset) or "",
+			tile_width=tile_w,
+			tile_height=tile_h,
+			layers=layers,
+		)
+
+	def to_scene(self) -> Scene:
+		# Strings repeat across nodes (sprite paths, common names), decode each only once
+		strings: dict[int, str | None] = {}
+
+		def string(idx: int) -> str | None:
+			if idx not in strings:
+				strings[idx] = self.string(idx)
+			return strings[idx]
+
+		nodes: list[Node] = []
+		unpack = _NODE.unpack_from
+		mm = self._mm
+		for offset in range(self._nodes, self._nodes + self.node_count * _NODE.size, _NODE.size):
+			(
+				parent,
+				node_id,
+				name,
+				sprite,
+				flags,
+				x,
+				y,
+				rot,
+				sx,
+				sy,
+				rx,
+				ry,
+				rw,
+				rh,
+				tilemap,
+			) = unpack(mm, offset)
+			transform = Transform(x=x, y=y, rotation_deg=rot, scale_x=sx, scale_y=sy)
+			if flags & FLAG_TILEMAP_NODE:
+				node: Node = TilemapNode(
+					name=string(name) or "", id=string(node_id) or "", transform=transform
+				)
+				if flags & FLAG_TILEMAP:
+					node.tilemap = self.tilemap(tilemap)
+			else:
+				node = Node(
+					name=string(name) or "", id=string(node_id) or "", transform=transform
+				)
+			node.sprite_path = intern_path(string(sprite))
+			if flags & FLAG_REGION:
+				node.sprite_region = SpriteRegion(rx, ry, rw, rh)
+			if parent >= 0:
+				nodes[parent].children.append(node)
+			nodes.append(node)
+		if not nodes:
+			return Scene(name=self.name)
+		return Scene(name=self.name, root=nodes[0])
+
+
+def read_scene_binary(path: Path) -> Scene:
+	with SceneFile(path) as f:
+		return f.to_scene()
+
+
+def is_scene_binary(path: Path) -> bool:
+	try:
+		with open(path, "rb") as f:
+			return f.read(len(MAGIC)) == MAGIC
+	except OSError:
+		return False
+
+
+def json_to_binary(src: Path, dst: Path) -> None:
+	"""Convert a JSON scene file to the binary format."""
+	write_scene_binary(read_scene_json(src), dst)
+
+
+def binary_to_json(src: Path, dst: Path) -> None:
+	"""Convert a binary scene file to JSON."""
+	write_scene_json(read_scene_binary(src), dst)
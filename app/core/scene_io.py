@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Iterator
+from json.decoder import scanstring
+from json.scanner import NUMBER_RE
+from pathlib import Path
+from typing import Any
+
+from app.core.scene import Node, Scene
+
+_INDENT = "  "
+_WS = re.compile(r"[ \t\n\r]*")
+_CONSTANTS = {
+	"null": None,
+	"true": True,
+	"false": False,
+	"NaN": float("nan"),
+	"Infinity": float("inf"),
+	"-Infinity": float("-inf"),
+}
+
+
+def iter_scene_json(scene: Scene) -> Iterator[str]:
+	"""Yield the text of ``json.dumps(scene.to_dict(), indent=2)`` piece by piece.
+
+	Nodes are visited with an explicit stack and only one node's fields are turned into
+	a dict at a time, so memory stays flat and deep trees cannot overflow the stack.
+	"""
+	yield "{\n" + _INDENT + '"name": ' + json.dumps(scene.name) + ",\n" + _INDENT + '"root": '
+	yield from iter_node_json(scene.root, 1)
+	yield "\n}"
+
+
+def iter_node_json(root: Node, depth: int = 0) -> Iterator[str]:
+	"""Yield ``root`` serialized as by ``Node.to_dict``, indented for nesting ``depth``."""
+	# Items are either nodes to open (with their depth) or literal text to emit
+	stack: list[tuple[Node, int] | str] = [(root, depth)]
+	while stack:
+		item = stack.pop()
+		if isinstance(item, str):
+			yield item
+			continue
+		node, d = item
+		pad = _INDENT * (d + 1)
+		head = ",\n".join(_fields(node._head_dict(), d + 1))
+		tail = "".join(",\n" + line for line in _fields(node._tail_dict(), d + 1))
+		close = "\n" + _INDENT * d + "}"
+		children = node.children
+		if not children:
+			yield "{\n" + head + ",\n" + pad + '"children": []' + tail + close
+			continue
+		yield "{\n" + head + ",\n" + pad + '"children": [\n'
+		stack.append("\n" + pad + "]" + tail + close)
+		child_pad = _INDENT * (d + 2)
+		# Pushed in reverse so children come out in order, each preceded by its separator
+		for i in range(len(children) - 1, -1, -1):
+			stack.append((children[i], d + 2))
+			stack.append(child_pad if i == 0 else ",\n" + child_pad)
+
+
+def write_scene_json(scene: Scene, path: Path) -> None:
+	"""Stream ``scene`` to ``path``; the file is replaced only once fully written."""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	tmp = path.with_name(path.name + ".tmp")
+	with open(tmp, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+		for chunk in iter_scene_json(scene):
+			f.write(chunk)
+	os.replace(tmp, path)
+
+
+def read_scene_json(path: Path) -> Scene:
+	text = path.read_text(encoding="utf-8")
+	try:
+		data = json.loads(text)
+	except RecursionError:
+		# Hierarchy nested deeper than the C decoder allows
+		data = loads_iterative(text)
+	del text
+	return Scene.from_dict(data)
+
+
+def loads_iterative(text: str) -> Any:
+	"""``json.loads`` with an explicit container stack instead of recursion.
+
+	Much slower than the C decoder, so it is only used as a fallback for very deep documents.
+	"""
+	ws = _WS.match
+	pos = ws(text, 0).end()
+	# Open containers with the key awaiting a value (dicts) or None (lists)
+	stack: list[list[Any]] = []
+	while True:
+		ch = text[pos:pos + 1]
+		if ch == "{" or ch == "[":
+			pos = ws(text, pos + 1).end()
+			container: Any = {} if ch == "{" else []
+			if text[pos:pos + 1] != ("}" if ch == "{" else "]"):
+				stack.append([container, None])
+				if ch == "{":
+					pos = _read_key(text, pos, stack[-1])
+				continue
+			pos += 1
+			value = container
+		elif ch == '"':
+			value, pos = scanstring(text, pos + 1)
+		else:
+			number = NUMBER_RE.match(text, pos)
+			if number is not None:
+				integer, frac, exp = number.groups()
+				value = float(integer + (frac or "") + (exp or "")) if frac or exp else int(integer)
+				pos = number.end()
+			else:
+				for literal, constant in _CONSTANTS.items():
+					if text.startswith(literal, pos):
+						value = constant
+						pos += len(literal)
+						break
+				else:
+					raise json.JSONDecodeError("Expecting value", text, pos)
+		# Store the finished value, closing every container that ends right after it
+		while True:
+			pos = ws(text, pos).end()
+			if not stack:
+				if pos != len(text):
+					raise json.JSONDecodeError("Extra data", text, pos)
+				return value
+			top = stack[-1]
+			if isinstance(top[0], dict):
+				top[0][top[1]] = value
+			else:
+				top[0].append(value)
+			ch = text[pos:pos + 1]
+			if ch == ",":
+				pos = ws(text, pos + 1).end()
+				if isinstance(top[0], dict):
+					pos = _read_key(text, pos, top)
+				break
+			if ch != ("}" if isinstance(top[0], dict) else "]"):
+				raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+			pos += 1
+			value = stack.pop()[0]
+
+
+def _read_key(text: str, pos: int, top: list[Any]) -> int:
+	# Parse '"key" :' and return the position of the value
+	if text[pos:pos + 1] != '"':
+		raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, pos)
+	top[1], pos = scanstring(text, pos + 1)
+	pos = _WS.match(text, pos).end()
+	if text[pos:pos + 1] != ":":
+		raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+	return _WS.match(text, pos + 1).end()
+
+
+def _fields(data: dict[str, Any], depth: int) -> list[str]:
+	pad = _INDENT * depth
+	return [pad + json.dumps(key) + ": " + _dump(value, depth) for key, value in data.items()]
+
+
+def _dump(value: Any, depth: int) -> str:
+	# Nested values keep json's relative indentation, shifted to the current depth
+	text = json.dumps(value, indent=2)
+	if "\n" in text:
+		text = text.replace("\n", "\n" + _INDENT * depth)
+	return text
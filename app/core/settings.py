@@ -31,6 +31,7 @@ class EditorSettings(BaseModel):
 	grid_enabled: bool = True
 	grid_step: int = 32
 	snap_to_grid: bool = True
+	canvas_render_mode: str = "immediate"
 
 
 def load_settings() -> EditorSettings:
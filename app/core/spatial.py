@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Hashable, Iterable
+
+Bounds = tuple[float, float, float, float]  # (left, top, right, bottom) in world units
+
+# Items spanning more cells than this are kept in a flat list instead of the grid
+_MAX_ITEM_CELLS = 256
+
+
+class SpatialHash:
+	"""Uniform grid hash of axis-aligned world bounds.
+
+	Point and rect queries touch only the cells they overlap, so their cost depends on
+	how many items are near the query rather than on the total item count.
+	"""
+
+	def __init__(self, cell_size: float = 256.0) -> None:
+		self._cell = float(max(1.0, cell_size))
+		self._cells: dict[tuple[int, int], set[Hashable]] = {}
+		self._items: dict[Hashable, tuple[Bounds, tuple[int, int, int, int] | None]] = {}
+		self._large: set[Hashable] = set()
+
+	def __len__(self) -> int:
+		return len(self._items)
+
+	def __contains__(self, item_id: object) -> bool:
+		return item_id in self._items
+
+	def clear(self) -> None:
+		self._cells.clear()
+		self._items.clear()
+		self._large.clear()
+
+	def bounds(self, item_id: Hashable) -> Bounds | None:
+		entry = self._items.get(item_id)
+		return entry[0] if entry else None
+
+	def insert(self, item_id: Hashable, bounds: Bounds) -> None:
+		"""Insert or move an item."""
+		old = self._items.get(item_id)
+		span = self._cell_span(bounds)
+		if old is not None:
+			if old[1] == span and span is not None:
+				self._items[item_id] = (bounds, span)
+				return
+			self._unlink(item_id, old[1])
+		self._items[item_id] = (bounds, span)
+		if span is None:
+			self._large.add(item_id)
+			return
+		x0, y0, x1, y1 = span
+		for cy in range(y0, y1 + 1):
+			for cx in range(x0, x1 + 1):
+				bucket = self._cells.get((cx, cy))
+				if bucket is None:
+					self._cells[(cx, cy)] = {item_id}
+				else:
+					bucket.add(item_id)
+
+	def remove(self, item_id: Hashable) -> None:
+		old = self._items.pop(item_id, None)
+		if old is not None:
+			self._unlink(item_id, old[1])
+
+	def remove_many(self, item_ids: Iterable[Hashable]) -> None:
+		for item_id in item_ids:
+			self.remove(item_id)
+
+	def query_rect(self, bounds: Bounds) -> set[Hashable]:
+		"""Return ids whose bounds intersect ``bounds``."""
+		left, top, right, bottom = bounds
+		span = self._cell_span(bounds, limit=False)
+		x0, y0, x1, y1 = span
+		result: set[Hashable] = set()
+		if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._items):
+			# Query covers more cells than there are items: a flat scan is cheaper
+			candidates: Iterable[Hashable] = self._items.keys()
+		else:
+			found: set[Hashable] = set()
+			for cy in range(y0, y1 + 1):
+				for cx in range(x0, x1 + 1):
+					bucket = self._cells.get((cx, cy))
+					if bucket:
+						found |= bucket
+			found |= self._large
+			candidates = found
+		items = self._items
+		for item_id in candidates:
+			b = items[item_id][0]
+			if b[0] < right and left < b[2] and b[1] < bottom and top < b[3]:
+				result.add(item_id)
+		return result
+
+	def query_point(self, x: float, y: float) -> set[Hashable]:
+		"""Return ids whose bounds contain the point."""
+		key = (math.floor(x / self._cell), math.floor(y / self._cell))
+		candidates = set(self._cells.get(key, ()))
+		candidates |= self._large
+		items = self._items
+		result: set[Hashable] = set()
+		for item_id in candidates:
+			b = items[item_id][0]
+			if b[0] <= x <= b[2] and b[1] <= y <= b[3]:
+				result.add(item_id)
+		return result
+
+	def _cell_span(
+		self, bounds: Bounds, limit: bool = True
+	) -> tuple[int, int, int, int] | None:
+		left, top, right, bottom = bounds
+		c = self._cell
+		x0, x1 = math.floor(left / c), math.floor(right / c)
+		y0, y1 = math.floor(top / c), math.floor(bottom / c)
+		if limit and (x1 - x0 + 1) * (y1 - y0 + 1) > _MAX_ITEM_CELLS:
+			return None
+		return x0, y0, x1, y1
+
+	def _unlink(self, item_id: Hashable, span: tuple[int, int, int, int] | None) -> None:
+		if span is None:
+			self._large.discard(item_id)
+			return
+		x0, y0, x1, y1 = span
+		for cy in range(y0, y1 + 1):
+			for cx in range(x0, x1 + 1):
+				bucket = self._cells.get((cx, cy))
+				if bucket is None:
+					continue
+				bucket.discard(item_id)
+				if not bucket:
+					del self._cells[(cx, cy)]
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import base64
+import gzip
 import json
-from dataclasses import asdict, dataclass
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from itertools import groupby
 from pathlib import Path
 from typing import Any
 
 from PIL import Image
 
+try:
+	import numpy as np
+except ImportError:  # optional: flood fill finds runs in pure Python without it
+	np = None
+
 
 @dataclass
 class Tileset:
@@ -85,38 +98,503 @@ def list_tilesets(assets_dir: Path) -> list[Path]:
 
 # --- Tilemap structures ---
 
+# Tiles per side of a chunk: the unit of change tracking and cached rendering
+CHUNK_SIZE = 16
+
+
+# How ``TileLayer.to_dict`` stores cells: little-endian int32, compressed, then base64
+TILE_ENCODING = "base64"
+TILE_COMPRESSION = "zlib"
+
+
+def encode_cells(cells: array, compression: str = TILE_COMPRESSION) -> str:
+	"""Cells as a base64 string of little-endian int32, optionally compressed."""
+	if sys.byteorder == "big":
+		cells = array("i", cells)
+		cells.byteswap()
+	raw = cells.tobytes()
+	if compression == "zlib":
+		raw = zlib.compress(raw)
+	elif compression == "gzip":
+		raw = gzip.compress(raw)
+	elif compression:
+		raise ValueError(f"Unsupported tile compression: {compression}")
+	return base64.b64encode(raw).decode("ascii")
+
+
+def decode_cells(payload: str, compression: str = TILE_COMPRESSION) -> array:
+	raw = base64.b64decode(payload)
+	if compression == "zlib":
+		raw = zlib.decompress(raw)
+	elif compression == "gzip":
+		raw = gzip.decompress(raw)
+	elif compression:
+		raise ValueError(f"Unsupported tile compression: {compression}")
+	cells = array("i")
+	if len(raw) % cells.itemsize:
+		raise ValueError("Tile data is not a whole number of int32 cells")
+	cells.frombytes(raw)
+	if sys.byteorder == "big":
+		cells.byteswap()
+	return cells
+
 
 @dataclass
 class TileLayer:
 	name: str
 	width: int
 	height: int
-	data: list[int]
+	# Tile index per cell, row by row; -1 is empty. Lists passed in are converted
+	data: array
+	# Per-chunk edit counters, bumped whenever cells inside the chunk change
+	_chunk_revs: dict[tuple[int, int], int] = field(
+		default_factory=dict, init=False, repr=False, compare=False
+	)
+
+	def __post_init__(self) -> None:
+		if not isinstance(self.data, array) or self.data.typecode != "i":
+			self.data = array("i", self.data)
+		# Short data would make row slices grow the array instead of overwriting it
+		missing = int(self.width) * int(self.height) - len(self.data)
+		if missing > 0:
+			self.data.extend(array("i", [-1]) * missing)
+
+	def get(self, x: int, y: int) -> int:
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return -1
+		i = y * self.width + x
+		return self.data[i] if i < len(self.data) else -1
+
+	def set(self, x: int, y: int, value: int) -> None:
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return
+		self.data[y * self.width + x] = int(value)
+		key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+		self._chunk_revs[key] = self._chunk_revs.get(key, 0) + 1
+
+	def mark_dirty(self, x0: int, y0: int, x1: int, y1: int) -> None:
+		"""Record that cells in the inclusive rect were changed outside ``set``."""
+		for cy in range(max(0, y0) // CHUNK_SIZE, max(0, y1) // CHUNK_SIZE + 1):
+			for cx in range(max(0, x0) // CHUNK_SIZE, max(0, x1) // CHUNK_SIZE + 1):
+				self._chunk_revs[(cx, cy)] = self._chunk_revs.get((cx, cy), 0) + 1
+
+	def chunk_revision(self, cx: int, cy: int) -> int:
+		return self._chunk_revs.get((cx, cy), 0)
+
+	def bounds(self) -> tuple[int, int, int, int]:
+		"""Cell rect (x0, y0, x1, y1), end-exclusive, the layer may hold tiles in."""
+		return 0, 0, int(self.width), int(self.height)
+
+	def read_row(self, y: int, x0: int, x1: int) -> array:
+		"""Cells ``x0..x1`` (end-exclusive) of row ``y``; -1 outside the layer."""
+		cells = array("i", [-1]) * max(0, x1 - x0)
+		if 0 <= y < self.height:
+			lo = max(x0, 0)
+			hi = min(x1, self.width)
+			if lo < hi:
+				start = y * self.width
+				row = self.data[start + lo : min(start + hi, len(self.data))]
+				cells[lo - x0 : lo - x0 + len(row)] = row
+		return cells
+
+	def write_row(self, y: int, x0: int, cells: array) -> None:
+		"""Overwrite row ``y`` from ``x0`` with ``cells``, clipped to the layer.
+
+		Chunk revisions are not bumped; call ``mark_dirty`` once the writes are done.
+		"""
+		if not 0 <= y < self.height:
+			return
+		lo = max(x0, 0)
+		hi = min(x0 + len(cells), self.width)
+		if lo < hi:
+			start = y * self.width
+			self.data[start + lo : start + hi] = cells[lo - x0 : hi - x0]
+
+	def cell_index(self, x: int, y: int) -> int:
+		"""Flat index of a cell in ``data``; consecutive along a row."""
+		return y * self.width + x
+
+	def cell_xy(self, index: int) -> tuple[int, int]:
+		"""Inverse of ``cell_index``; also takes NumPy arrays of indices."""
+		y, x = divmod(index, max(1, self.width))
+		return x, y
+
+	def write_cells(self, index: array, values: array) -> None:
+		"""Set the cells at ``index`` (int64, see ``cell_index``) to ``values`` (int32) at once,
+		bumping the revisions of the chunks they fall in."""
+		if len(index) != len(values):
+			raise ValueError("Cell indices and values must have the same length")
+		if not index:
+			return
+		width = max(1, self.width)
+		if np is not None:
+			idx = np.frombuffer(index, dtype=np.int64)
+			np.frombuffer(self.data, dtype=np.int32)[idx] = np.frombuffer(values, dtype=np.int32)
+			rows, cols = divmod(idx, width)
+			per_row = width // CHUNK_SIZE + 1
+			keys = np.unique((rows // CHUNK_SIZE) * per_row + cols // CHUNK_SIZE).tolist()
+			touched = {(k % per_row, k // per_row) for k in keys}
+		else:
+			data = self.data
+			for i, value in zip(index, values, strict=True):
+				data[i] = value
+			touched = {(i % width // CHUNK_SIZE, i // width // CHUNK_SIZE) for i in index}
+		for key in touched:
+			self._chunk_revs[key] = self._chunk_revs.get(key, 0) + 1
+
+	def chunk(self, cx: int, cy: int) -> array | None:
+		"""Cells of one chunk, row by row, ``-1`` outside the layer; None if out of bounds."""
+		x0 = cx * CHUNK_SIZE
+		y0 = cy * CHUNK_SIZE
+		if cx < 0 or cy < 0 or x0 >= self.width or y0 >= self.height:
+			return None
+		cells = array("i", [-1]) * (CHUNK_SIZE * CHUNK_SIZE)
+		x1 = min(x0 + CHUNK_SIZE, self.width)
+		data = self.data
+		for y in range(y0, min(y0 + CHUNK_SIZE, self.height)):
+			start = y * self.width + x0
+			row = data[start : min(start + x1 - x0, len(data))]
+			dst = (y - y0) * CHUNK_SIZE
+			cells[dst : dst + len(row)] = row
+		return cells
+
+	def iter_chunks(self) -> Iterator[tuple[int, int, array]]:
+		"""``(cx, cy, cells)`` for every chunk overlapping the layer."""
+		for cy in range((self.height + CHUNK_SIZE - 1) // CHUNK_SIZE):
+			for cx in range((self.width + CHUNK_SIZE - 1) // CHUNK_SIZE):
+				cells = self.chunk(cx, cy)
+				if cells is not None:
+					yield cx, cy, cells
 
 	def to_dict(self) -> dict[str, Any]:
 		return {
 			"name": self.name,
 			"width": int(self.width),
 			"height": int(self.height),
-			"data": list(self.data),
+			"encoding": TILE_ENCODING,
+			"compression": TILE_COMPRESSION,
+			"data": encode_cells(self.data),
 		}
 
 	@staticmethod
 	def from_dict(data: dict[str, Any]) -> TileLayer:
+		cells = data.get("data") or []
+		encoding = data.get("encoding")
+		if encoding == TILE_ENCODING:
+			cells = decode_cells(str(cells), str(data.get("compression") or ""))
+		elif encoding:
+			raise ValueError(f"Unsupported tile encoding: {encoding}")
+		else:
+			# Older files: a plain array of ints
+			try:
+				cells = array("i", cells)
+			except TypeError:
+				cells = array("i", (int(x) for x in cells))
 		return TileLayer(
 			name=str(data.get("name", "Layer 1")),
 			width=int(data.get("width", 0)),
 			height=int(data.get("height", 0)),
-			data=[int(x) for x in (data.get("data") or [])],
+			data=cells,
 		)
 
 
+@dataclass
+class ChunkedTileLayer:
+	"""Sparse layer: cells live in ``CHUNK_SIZE`` x ``CHUNK_SIZE`` chunks keyed by chunk
+	coordinate, allocated when a tile is painted in them and freed once emptied again.
+
+	``width``/``height`` bound the layer when positive; a layer with zero size is
+	unbounded and accepts any cell coordinate, negative ones included.
+	"""
+
+	name: str
+	width: int = 0
+	height: int = 0
+	# (cx, cy) -> CHUNK_SIZE * CHUNK_SIZE cells, row by row; -1 is empty
+	chunks: dict[tuple[int, int], array] = field(default_factory=dict)
+	# Non-empty cells per chunk, so emptied chunks can be freed
+	_filled: dict[tuple[int, int], int] = field(
+		default_factory=dict, init=False, repr=False, compare=False
+	)
+	_chunk_revs: dict[tuple[int, int], int] = field(
+		default_factory=dict, init=False, repr=False, compare=False
+	)
+	# Chunk extent (cx0, cy0, cx1, cy1) inclusive, cached for ``bounds``; None until
+	# computed or after an edge chunk is freed. Code editing ``chunks`` directly must
+	# call ``_recount``
+	_extent: tuple[int, int, int, int] | None = field(
+		default=None, init=False, repr=False, compare=False
+	)
+
+	def __post_init__(self) -> None:
+		self._recount()
+
+	def _recount(self) -> None:
+		self._extent = None
+		self._filled.clear()
+		for key, cells in list(self.chunks.items()):
+			if not isinstance(cells, array) or cells.typecode != "i":
+				cells = self.chunks[key] = array("i", cells)
+			filled = CHUNK_SIZE * CHUNK_SIZE - cells.count(-1)
+			if filled:
+				self._filled[key] = filled
+			else:
+				del self.chunks[key]
+
+	@staticmethod
+	def from_layer(layer: TileLayer) -> ChunkedTileLayer:
+		"""Sparse copy of a dense layer, keeping only chunks that hold tiles."""
+		chunked = ChunkedTileLayer(name=layer.name, width=layer.width, height=layer.height)
+		for cx, cy, cells in layer.iter_chunks():
+			filled = CHUNK_SIZE * CHUNK_SIZE - cells.count(-1)
+			if filled:
+				chunked.chunks[(cx, cy)] = cells
+				chunked._filled[(cx, cy)] = filled
+		return chunked
+
+	def _in_bounds(self, x: int, y: int) -> bool:
+		return (self.width <= 0 or 0 <= x < self.width) and (
+			self.height <= 0 or 0 <= y < self.height
+		)
+
+	def get(self, x: int, y: int) -> int:
+		cells = self.chunks.get((x // CHUNK_SIZE, y // CHUNK_SIZE))
+		if cells is None or not self._in_bounds(x, y):
+			return -1
+		return cells[(y % CHUNK_SIZE) * CHUNK_SIZE + x % CHUNK_SIZE]
+
+	def set(self, x: int, y: int, value: int) -> None:
+		if not self._in_bounds(x, y):
+			return
+		value = int(value)
+		if value < 0:
+			value = -1
+		key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+		cells = self.chunks.get(key)
+		if cells is None:
+			if value == -1:
+				return
+			cells = self._new_chunk(key)
+		i = (y % CHUNK_SIZE) * CHUNK_SIZE + x % CHUNK_SIZE
+		old = cells[i]
+		if old == value:
+			return
+		cells[i] = value
+		filled = self._filled.get(key, 0) + (old == -1) - (value == -1)
+		if filled:
+			self._filled[key] = filled
+		else:
+			self._free_chunk(key)
+		self._chunk_revs[key] = self._chunk_revs.get(key, 0) + 1
+
+	def _new_chunk(self, key: tuple[int, int]) -> array:
+		cells = self.chunks[key] = array("i", [-1]) * (CHUNK_SIZE * CHUNK_SIZE)
+		ext = self._extent
+		if ext is not None:
+			cx, cy = key
+			self._extent = (min(ext[0], cx), min(ext[1], cy), max(ext[2], cx), max(ext[3], cy))
+		return cells
+
+	def _free_chunk(self, key: tuple[int, int]) -> None:
+		del self.chunks[key]
+		self._filled.pop(key, None)
+		ext = self._extent
+		if ext is not None and (key[0] in (ext[0], ext[2]) or key[1] in (ext[1], ext[3])):
+			# An edge chunk may shrink the extent; recomputed on the next bounds() call
+			self._extent = None
+
+	def mark_dirty(self, x0: int, y0: int, x1: int, y1: int) -> None:
+		"""Record that cells in the inclusive rect were changed outside ``set``."""
+		for cy in range(y0 // CHUNK_SIZE, y1 // CHUNK_SIZE + 1):
+			for cx in range(x0 // CHUNK_SIZE, x1 // CHUNK_SIZE + 1):
+				self._touch((cx, cy))
+
+	def _touch(self, key: tuple[int, int]) -> None:
+		# Recount a chunk changed in bulk, free it if emptied and bump its revision
+		cells = self.chunks.get(key)
+		if cells is not None:
+			filled = CHUNK_SIZE * CHUNK_SIZE - cells.count(-1)
+			if filled:
+				self._filled[key] = filled
+			else:
+				self._free_chunk(key)
+		self._chunk_revs[key] = self._chunk_revs.get(key, 0) + 1
+
+	def chunk_revision(self, cx: int, cy: int) -> int:
+		return self._chunk_revs.get((cx, cy), 0)
+
+	def bounds(self) -> tuple[int, int, int, int]:
+		"""Cell rect (x0, y0, x1, y1), end-exclusive: the declared size, or for an
+		unbounded layer the extent of its chunks."""
+		if self.width > 0 and self.height > 0:
+			return 0, 0, int(self.width), int(self.height)
+		if not self.chunks:
+			return 0, 0, 0, 0
+		ext = self._extent
+		if ext is None:
+			xs = [cx for cx, _cy in self.chunks]
+			ys = [cy for _cx, cy in self.chunks]
+			ext = self._extent = (min(xs), min(ys), max(xs), max(ys))
+		return (
+			ext[0] * CHUNK_SIZE,
+			ext[1] * CHUNK_SIZE,
+			(ext[2] + 1) * CHUNK_SIZE,
+			(ext[3] + 1) * CHUNK_SIZE,
+		)
+
+	def chunk(self, cx: int, cy: int) -> array | None:
+		"""Cells of one chunk (the stored array, not a copy); None if it holds no tiles."""
+		return self.chunks.get((cx, cy))
+
+	def read_row(self, y: int, x0: int, x1: int) -> array:
+		"""Cells ``x0..x1`` (end-exclusive) of row ``y``; -1 where nothing is painted."""
+		cells = array("i", [-1]) * max(0, x1 - x0)
+		if self.height > 0 and not 0 <= y < self.height:
+			return cells
+		cy, ry = divmod(y, CHUNK_SIZE)
+		ry *= CHUNK_SIZE
+		for cx in range(x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1):
+			chunk = self.chunks.get((cx, cy))
+			if chunk is None:
+				continue
+			lo = max(x0, cx * CHUNK_SIZE)
+			hi = min(x1, cx * CHUNK_SIZE + CHUNK_SIZE)
+			off = ry + lo - cx * CHUNK_SIZE
+			cells[lo - x0 : hi - x0] = chunk[off : off + hi - lo]
+		if self.width > 0:
+			# Cells past the declared size read as empty
+			for lo, hi in ((x0, min(x1, 0)), (max(x0, self.width), x1)):
+				if lo < hi:
+					cells[lo - x0 : hi - x0] = array("i", [-1]) * (hi - lo)
+		return cells
+
+	def write_row(self, y: int, x0: int, cells: array) -> None:
+		"""Overwrite row ``y`` from ``x0`` with ``cells``, clipped to the declared size.
+
+		Chunks are allocated as needed; call ``mark_dirty`` afterwards to bump revisions
+		and free chunks left empty.
+		"""
+		if self.height > 0 and not 0 <= y < self.height:
+			return
+		x1 = x0 + len(cells)
+		if self.width > 0:
+			lo_x, hi_x = max(x0, 0), min(x1, self.width)
+		else:
+			lo_x, hi_x = x0, x1
+		if lo_x >= hi_x:
+			return
+		cy, ry = divmod(y, CHUNK_SIZE)
+		ry *= CHUNK_SIZE
+		for cx in range(lo_x // CHUNK_SIZE, (hi_x - 1) // CHUNK_SIZE + 1):
+			lo = max(lo_x, cx * CHUNK_SIZE)
+			hi = min(hi_x, cx * CHUNK_SIZE + CHUNK_SIZE)
+			part = cells[lo - x0 : hi - x0]
+			chunk = self.chunks.get((cx, cy))
+			if chunk is None:
+				if part.count(-1) == len(part):
+					continue
+				chunk = self._new_chunk((cx, cy))
+			off = ry + lo - cx * CHUNK_SIZE
+			chunk[off : off + hi - lo] = part
+
+	def cell_index(self, x: int, y: int) -> int:
+		"""Cell key ``y * 2**32 + x``: like a dense index, consecutive along a row, but
+		valid for negative coordinates too."""
+		return (y << 32) + x
+
+	def cell_xy(self, index: int) -> tuple[int, int]:
+		"""Inverse of ``cell_index``; also takes NumPy arrays of indices."""
+		y = (index + (1 << 31)) >> 32
+		return index - (y << 32), y
+
+	def write_cells(self, index: array, values: array) -> None:
+		"""Set the cells at ``index`` (int64, see ``cell_index``) to ``values`` (int32) at once,
+		allocating and freeing chunks as needed."""
+		if len(index) != len(values):
+			raise ValueError("Cell indices and values must have the same length")
+		chunks = self.chunks
+		touched: set[tuple[int, int]] = set()
+		for i, value in zip(index, values, strict=True):
+			y = (i + (1 << 31)) >> 32
+			x = i - (y << 32)
+			key = (x // CHUNK_SIZE, y // CHUNK_SIZE)
+			cells = chunks.get(key)
+			if cells is None:
+				if value < 0:
+					continue
+				cells = self._new_chunk(key)
+			cells[(y % CHUNK_SIZE) * CHUNK_SIZE + x % CHUNK_SIZE] = value
+			touched.add(key)
+		for key in touched:
+			self._touch(key)
+
+	def iter_chunks(self) -> Iterator[tuple[int, int, array]]:
+		"""``(cx, cy, cells)`` for the allocated chunks only."""
+		for (cx, cy), cells in self.chunks.items():
+			yield cx, cy, cells
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			"name": self.name,
+			"width": int(self.width),
+			"height": int(self.height),
+			"encoding": TILE_ENCODING,
+			"compression": TILE_COMPRESSION,
+			"chunk_size": CHUNK_SIZE,
+			"chunks": [
+				{"x": cx * CHUNK_SIZE, "y": cy * CHUNK_SIZE, "data": encode_cells(cells)}
+				for (cx, cy), cells in sorted(self.chunks.items(), key=lambda kv: kv[0][::-1])
+			],
+		}
+
+	@staticmethod
+	def from_dict(data: dict[str, Any]) -> ChunkedTileLayer:
+		encoding = data.get("encoding")
+		if encoding not in (None, "", TILE_ENCODING):
+			raise ValueError(f"Unsupported tile encoding: {encoding}")
+		compression = str(data.get("compression") or "")
+		size = int(data.get("chunk_size", CHUNK_SIZE))
+		layer = ChunkedTileLayer(
+			name=str(data.get("name", "Layer 1")),
+			width=int(data.get("width", 0)),
+			height=int(data.get("height", 0)),
+		)
+		for chunk in data.get("chunks") or []:
+			payload = chunk.get("data") or []
+			if encoding:
+				cells = decode_cells(str(payload), compression)
+			else:
+				cells = array("i", (int(v) for v in payload))
+			x0 = int(chunk.get("x", 0))
+			y0 = int(chunk.get("y", 0))
+			aligned = x0 % size == 0 and y0 % size == 0
+			if size == CHUNK_SIZE and aligned and len(cells) == size * size:
+				layer.chunks[(x0 // size, y0 // size)] = cells
+				continue
+			# Chunks of another size (or misaligned) are re-cut cell by cell
+			for i, value in enumerate(cells):
+				if value >= 0:
+					layer.set(x0 + i % size, y0 + i // size, value)
+		layer._recount()
+		return layer
+
+
+# A layer of either kind; both share get/set, bounds, chunk access and serialization
+AnyTileLayer = TileLayer | ChunkedTileLayer
+
+
+def tile_layer_from_dict(data: dict[str, Any]) -> AnyTileLayer:
+	if "chunks" in data:
+		return ChunkedTileLayer.from_dict(data)
+	return TileLayer.from_dict(data)
+
+
 @dataclass
 class Tilemap:
 	tileset_path: str
 	tile_width: int
 	tile_height: int
-	layers: list[TileLayer]
+	layers: list[AnyTileLayer]
 
 	def to_dict(self) -> dict[str, Any]:
 		return {
@@ -132,9 +610,52 @@ class Tilemap:
 			tileset_path=str(data.get("tileset_path", "")),
 			tile_width=int(data.get("tile_width", 32)),
 			tile_height=int(data.get("tile_height", 32)),
-			layers=[TileLayer.from_dict(ld) for ld in (data.get("layers") or [])],
+			layers=[tile_layer_from_dict(ld) for ld in (data.get("layers") or [])],
+		)
+
+	def bounds(self) -> tuple[int, int, int, int]:
+		"""Cell rect (x0, y0, x1, y1), end-exclusive, covering all layers."""
+		rects = [layer.bounds() for layer in self.layers]
+		rects = [r for r in rects if r[2] > r[0] and r[3] > r[1]]
+		if not rects:
+			return 0, 0, 0, 0
+		return (
+			min(r[0] for r in rects),
+			min(r[1] for r in rects),
+			max(r[2] for r in rects),
+			max(r[3] for r in rects),
 		)
 
+	def chunk_keys(self, cx0: int, cy0: int, cx1: int, cy1: int) -> list[tuple[int, int]]:
+		"""Chunks in the inclusive range that any layer may hold tiles in, row by row.
+
+		Dense layers cover every chunk within their size; sparse layers only those
+		allocated, so empty stretches of a large world are never visited.
+		"""
+		keys: set[tuple[int, int]] = set()
+		for layer in self.layers:
+			if isinstance(layer, ChunkedTileLayer):
+				area = (cx1 - cx0 + 1) * (cy1 - cy0 + 1)
+				if len(layer.chunks) <= area:
+					keys.update(
+						k for k in layer.chunks if cx0 <= k[0] <= cx1 and cy0 <= k[1] <= cy1
+					)
+				else:
+					keys.update(
+						(cx, cy)
+						for cy in range(cy0, cy1 + 1)
+						for cx in range(cx0, cx1 + 1)
+						if (cx, cy) in layer.chunks
+					)
+				continue
+			x0, y0, x1, y1 = layer.bounds()
+			keys.update(
+				(cx, cy)
+				for cy in range(max(cy0, y0 // CHUNK_SIZE), min(cy1, (y1 - 1) // CHUNK_SIZE) + 1)
+				for cx in range(max(cx0, x0 // CHUNK_SIZE), min(cx1, (x1 - 1) // CHUNK_SIZE) + 1)
+			)
+		return sorted(keys, key=lambda k: (k[1], k[0]))
+
 	def tile_source_rect(self, index: int, tileset: Tileset) -> tuple[int, int, int, int]:
 		"""Return source rect (x,y,w,h) for tile index in tileset grid."""
 		if index < 0:
@@ -145,3 +666,403 @@ class Tilemap:
 		return x, y, self.tile_width, self.tile_height
 
 
+# --- Edit diffs ---
+
+
+class TileDiff:
+	"""Cells changed on one layer, packed as parallel arrays: cell index (the layer's
+	``cell_index``), old value and new value.
+
+	Its size follows the number of cells changed, not the size of the layer, and it is
+	applied in one ``write_cells`` call either way.
+	"""
+
+	__slots__ = ("index", "old", "new", "_pos")
+
+	def __init__(self) -> None:
+		self.index = array("q")
+		self.old = array("i")
+		self.new = array("i")
+		# index -> position, built on the first merge so a repainted cell keeps one entry
+		self._pos: dict[int, int] | None = None
+
+	def __len__(self) -> int:
+		return len(self.index)
+
+	@property
+	def nbytes(self) -> int:
+		return sum(len(a) * a.itemsize for a in (self.index, self.old, self.new))
+
+	def add(self, index: int, old: int, new: int) -> None:
+		if old != new:
+			self.index.append(index)
+			self.old.append(old)
+			self.new.append(new)
+
+	def add_row(self, start: int, old: array, new: array) -> None:
+		"""Record the cells that differ between two row slices; ``start`` is the index of
+		their first cell."""
+		if len(old) != len(new):
+			raise ValueError("Row slices must have the same length")
+		if np is not None:
+			before = np.frombuffer(old, dtype=np.int32)
+			after = np.frombuffer(new, dtype=np.int32)
+			changed = np.flatnonzero(before != after)
+			self.index.frombytes((changed + start).astype(np.int64).tobytes())
+			self.old.frombytes(before[changed].tobytes())
+			self.new.frombytes(after[changed].tobytes())
+			return
+		for i, (a, b) in enumerate(zip(old, new, strict=True)):
+			if a != b:
+				self.index.append(start + i)
+				self.old.append(a)
+				self.new.append(b)
+
+	def add_span(self, start: int, count: int, old: int, new: int) -> None:
+		"""Record ``count`` consecutive cells from index ``start``, all going ``old`` -> ``new``."""
+		if old == new or count <= 0:
+			return
+		self.index.extend(range(start, start + count))
+		self.old.extend(array("i", [old]) * count)
+		self.new.extend(array("i", [new]) * count)
+
+	def merge(self, other: TileDiff) -> None:
+		"""Append a later edit: cells already recorded keep their old value and take the
+		new one."""
+		pos = self._pos
+		if pos is None:
+			pos = self._pos = {i: n for n, i in enumerate(self.index)}
+		for i, old, new in zip(other.index, other.old, other.new, strict=True):
+			n = pos.get(i)
+			if n is None:
+				pos[i] = len(self.index)
+				self.index.append(i)
+				self.old.append(old)
+				self.new.append(new)
+			else:
+				self.new[n] = new
+
+	def apply(self, layer: AnyTileLayer, undo: bool = False) -> None:
+		layer.write_cells(self.index, self.old if undo else self.new)
+
+	def bounds(self, layer: AnyTileLayer) -> tuple[int, int, int, int] | None:
+		"""Inclusive cell rect (x0, y0, x1, y1) covering the changed cells."""
+		if not self.index:
+			return None
+		if np is not None:
+			xs, ys = layer.cell_xy(np.frombuffer(self.index, dtype=np.int64))
+			return int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())
+		cells = [layer.cell_xy(i) for i in self.index]
+		xs = [x for x, _y in cells]
+		ys = [y for _x, y in cells]
+		return min(xs), min(ys), max(xs), max(ys)
+
+
+# --- Fills ---
+#
+# Fills work on whole row slices (``read_row``/``write_row``) and mark chunks dirty once
+# per call, so their cost is per row or per span rather than per cell.
+
+
+def _clip(layer: AnyTileLayer, x0: int, y0: int, x1: int, y1: int) -> tuple[int, int, int, int]:
+	# Inclusive rect limited to the layer's size, on the axes that have one
+	if isinstance(layer, TileLayer) or layer.width > 0:
+		x0, x1 = max(x0, 0), min(x1, layer.width - 1)
+	if isinstance(layer, TileLayer) or layer.height > 0:
+		y0, y1 = max(y0, 0), min(y1, layer.height - 1)
+	return x0, y0, x1, y1
+
+
+def fill_rect(
+	layer: AnyTileLayer,
+	x0: int,
+	y0: int,
+	x1: int,
+	y1: int,
+	value: int,
+	diff: TileDiff | None = None,
+) -> None:
+	"""Set every cell of the inclusive rect to ``value`` (-1 erases).
+
+	Changed cells are recorded in ``diff`` when one is given.
+	"""
+	x0, x1 = sorted((x0, x1))
+	y0, y1 = sorted((y0, y1))
+	x0, y0, x1, y1 = _clip(layer, x0, y0, x1, y1)
+	if x1 < x0 or y1 < y0:
+		return
+	row = array("i", [max(-1, int(value))]) * (x1 - x0 + 1)
+	for y in range(y0, y1 + 1):
+		if diff is not None:
+			diff.add_row(layer.cell_index(x0, y), layer.read_row(y, x0, x1 + 1), row)
+		layer.write_row(y, x0, row)
+	layer.mark_dirty(x0, y0, x1, y1)
+
+
+def fill_pattern(
+	layer: AnyTileLayer,
+	x0: int,
+	y0: int,
+	x1: int,
+	y1: int,
+	pattern: array,
+	pattern_width: int,
+	diff: TileDiff | None = None,
+) -> None:
+	"""Tile the inclusive rect with ``pattern`` (row by row, ``pattern_width`` wide),
+	anchored at the rect's top-left corner. Pattern cells of -1 erase.
+
+	Changed cells are recorded in ``diff`` when one is given.
+	"""
+	x0, x1 = sorted((x0, x1))
+	y0, y1 = sorted((y0, y1))
+	pw = int(pattern_width)
+	if pw <= 0 or not pattern or len(pattern) % pw:
+		raise ValueError("Pattern must be a whole number of rows of pattern_width cells")
+	cx0, cy0, cx1, cy1 = _clip(layer, x0, y0, x1, y1)
+	if cx1 < cx0 or cy1 < cy0:
+		return
+	width = cx1 - cx0 + 1
+	# Pattern column the clipped rect starts at, so clipping does not shift the pattern
+	offset = (cx0 - x0) % pw
+	repeats = (offset + width) // pw + 1
+	# One full-width row per pattern row, reused for every rect row it lands on
+	rows = [
+		(array("i", pattern[i : i + pw]) * repeats)[offset : offset + width]
+		for i in range(0, len(pattern), pw)
+	]
+	for y in range(cy0, cy1 + 1):
+		row = rows[(y - y0) % len(rows)]
+		if diff is not None:
+			diff.add_row(layer.cell_index(cx0, y), layer.read_row(y, cx0, cx1 + 1), row)
+		layer.write_row(y, cx0, row)
+	layer.mark_dirty(cx0, cy0, cx1, cy1)
+
+
+# Runs the run walk may split rows into before the fill labels the whole bounds at once
+# instead (NumPy only): past this the rows around the region hold many short runs
+_FLOOD_RUN_BUDGET = 16384
+
+
+def flood_fill_spans(layer: AnyTileLayer, x: int, y: int) -> list[tuple[int, int, int]]:
+	"""Spans ``(y, x0, x1)``, end-exclusive, of the 4-connected region of cells equal to
+	the one at ``(x, y)``, limited to ``layer.bounds()``.
+
+	See ``flood_fill`` for how the region is found.
+	"""
+	ys, x0s, x1s = _flood_runs(layer, x, y)
+	if np is not None and isinstance(ys, np.ndarray):
+		return list(zip(ys.tolist(), x0s.tolist(), x1s.tolist(), strict=True))
+	return list(zip(ys, x0s, x1s, strict=True))
+
+
+def flood_fill(
+	layer: AnyTileLayer, x: int, y: int, value: int, diff: TileDiff | None = None
+) -> int:
+	"""Fill the 4-connected region of cells equal to the one at ``(x, y)``, limited to
+	``layer.bounds()``, with ``value``.
+
+	Works on runs of equal cells: each visited row is split into runs once and the fill
+	moves between overlapping runs of adjacent rows with an explicit stack, so the cost
+	grows with the number of runs rather than cells. A region of many short runs (one-cell
+	corridors are the worst case, one run per cell) is instead labelled over the whole
+	bounds with NumPy in a fixed number of array passes; without NumPy the walk goes on.
+
+	Returns the number of cells written; 0 if the cell already holds ``value``. Changed
+	cells are recorded in ``diff`` when one is given.
+	"""
+	value = max(-1, int(value))
+	target = layer.get(x, y)
+	if target == value:
+		return 0
+	ys, x0s, x1s = _flood_runs(layer, x, y)
+	if not len(ys):
+		return 0
+	if np is not None:
+		return _fill_runs(layer, np.asarray(ys), np.asarray(x0s), np.asarray(x1s), value, diff)
+	if diff is not None:
+		# Every cell of the region held the target value
+		for ry, sx0, sx1 in zip(ys, x0s, x1s, strict=True):
+			diff.add_span(layer.cell_index(sx0, ry), sx1 - sx0, target, value)
+	# One read and write per row, the spans patched into it; row -> [x0, x1, x0, x1, ...]
+	by_row: dict[int, list[int]] = {}
+	for ry, sx0, sx1 in zip(ys, x0s, x1s, strict=True):
+		row_spans = by_row.get(ry)
+		if row_spans is None:
+			by_row[ry] = [sx0, sx1]
+		else:
+			row_spans += (sx0, sx1)
+	x0 = min(x0s)
+	x1 = max(x1s)
+	fill = array("i", [value]) * (x1 - x0)
+	for ry, row_spans in by_row.items():
+		lo = min(row_spans[0::2])
+		hi = max(row_spans[1::2])
+		cells = layer.read_row(ry, lo, hi)
+		for a, b in zip(row_spans[0::2], row_spans[1::2], strict=True):
+			cells[a - lo : b - lo] = fill[: b - a]
+		layer.write_row(ry, lo, cells)
+	layer.mark_dirty(x0, min(by_row), x1 - 1, max(by_row))
+	return sum(x1s) - sum(x0s)
+
+
+def _flood_runs(layer: AnyTileLayer, x: int, y: int) -> tuple[Any, Any, Any]:
+	# Row, start and end (end-exclusive) of each run of the region around (x, y): lists
+	# from the run walk, or NumPy arrays once the walk outgrows _FLOOD_RUN_BUDGET
+	bx0, by0, bx1, by1 = layer.bounds()
+	if not (bx0 <= x < bx1 and by0 <= y < by1):
+		return [], [], []
+	target = layer.get(x, y)
+	# row -> (run starts, run ends, visited flag per run) for cells equal to target
+	runs: dict[int, tuple[list[int], list[int], bytearray]] = {}
+	split = 0
+
+	def row_runs(ry: int) -> tuple[list[int], list[int], bytearray]:
+		nonlocal split
+		found = runs.get(ry)
+		if found is None:
+			starts, ends = _runs(layer.read_row(ry, bx0, bx1), target, bx0)
+			found = runs[ry] = (starts, ends, bytearray(len(starts)))
+			split += len(starts)
+		return found
+
+	starts, ends, visited = row_runs(y)
+	i = bisect_right(starts, x) - 1
+	visited[i] = 1
+	stack = [(y, starts[i], ends[i])]
+	ys: list[int] = []
+	x0s: list[int] = []
+	x1s: list[int] = []
+	budget = _FLOOD_RUN_BUDGET if np is not None else sys.maxsize
+	while stack:
+		ry, sx0, sx1 = stack.pop()
+		# Follow the same run up and down first: such a column of runs only borders
+		# other runs in the rows past its two ends
+		top = bottom = ry
+		for step in (-1, 1):
+			ny = ry + step
+			while by0 <= ny < by1 and split <= budget:
+				starts, ends, visited = runs.get(ny) or row_runs(ny)
+				j = bisect_right(ends, sx0)
+				if j == len(ends) or starts[j] != sx0 or ends[j] != sx1 or visited[j]:
+					break
+				visited[j] = 1
+				ny += step
+			if step < 0:
+				top = ny
+			else:
+				bottom = ny
+		if split > budget:
+			return _label_runs(layer, x, y, target)
+		ys.extend(range(top + 1, bottom))
+		x0s.extend([sx0] * (bottom - top - 1))
+		x1s.extend([sx1] * (bottom - top - 1))
+		for ny in (top, bottom):
+			if not by0 <= ny < by1:
+				continue
+			starts, ends, visited = runs.get(ny) or row_runs(ny)
+			# Runs overlapping [sx0, sx1): ending after sx0 and starting before sx1
+			for j in range(bisect_right(ends, sx0), bisect_left(starts, sx1)):
+				if not visited[j]:
+					visited[j] = 1
+					stack.append((ny, starts[j], ends[j]))
+	return ys, x0s, x1s
+
+
+def _label_runs(layer: AnyTileLayer, x: int, y: int, target: int) -> tuple[Any, Any, Any]:
+	# The region's runs found over the whole bounds at once: every row split into runs,
+	# the overlaps of all adjacent row pairs as edges, then connected runs merged by
+	# hooking each label onto its smallest neighbour and pointer jumping, which takes a
+	# logarithmic number of passes however long and winding the region is
+	bx0, by0, bx1, by1 = layer.bounds()
+	width = bx1 - bx0
+	mask = np.empty((by1 - by0, width), dtype=bool)
+	for r in range(by1 - by0):
+		mask[r] = np.frombuffer(layer.read_row(by0 + r, bx0, bx1), dtype=np.int32) == target
+	edges = np.diff(mask.view(np.int8), axis=1, prepend=0, append=0)
+	del mask
+	rows, starts = np.nonzero(edges == 1)
+	ends = np.nonzero(edges == -1)[1]
+	del edges
+	# Runs ordered row by row as (row, column) keys, so one search spans all row pairs
+	stride = width + 1
+	start_keys = rows * stride + starts
+	below = (rows + 1) * stride
+	# Runs of the next row ending after this run starts and starting before it ends
+	lo = np.searchsorted(rows * stride + ends, below + starts, side="right")
+	count = np.searchsorted(start_keys, below + ends, side="left") - lo
+	del below
+	a = np.repeat(np.arange(len(rows)), count)
+	b = np.arange(len(a)) - np.repeat(np.cumsum(count) - count - lo, count)
+	del lo, count
+	labels = np.arange(len(rows))
+	while len(a):
+		la = labels[a]
+		lb = labels[b]
+		split = la != lb
+		a, b, la, lb = a[split], b[split], la[split], lb[split]
+		if not len(a):
+			break
+		# Labels are roots here; each root with a smaller neighbour root hooks onto one
+		labels[np.maximum(la, lb)] = np.minimum(la, lb)
+		while True:
+			jumped = labels[labels]
+			if np.array_equal(jumped, labels):
+				break
+			labels = jumped
+	seed = np.searchsorted(start_keys, (y - by0) * stride + x - bx0, side="right") - 1
+	region = labels == labels[seed]
+	return rows[region] + by0, starts[region] + bx0, ends[region] + bx0
+
+
+def _fill_runs(
+	layer: AnyTileLayer,
+	ys: Any,
+	x0s: Any,
+	x1s: Any,
+	value: int,
+	diff: TileDiff | None,
+) -> int:
+	# Write value over the runs (NumPy arrays) one row at a time, from a mask of the
+	# runs' bounding rect built with one cumulative sum
+	ry0, ry1 = int(ys.min()), int(ys.max()) + 1
+	rx0, rx1 = int(x0s.min()), int(x1s.max())
+	# +1 where a run starts, -1 past its end; runs of a row never touch, so no clashes
+	steps = np.zeros((ry1 - ry0, rx1 - rx0 + 1), dtype=np.int8)
+	steps[ys - ry0, x0s - rx0] = 1
+	steps[ys - ry0, x1s - rx0] = -1
+	mask = np.cumsum(steps, axis=1, dtype=np.int8)[:, :-1].view(bool)
+	del steps
+	for r in np.flatnonzero(mask.any(axis=1)).tolist():
+		ry = ry0 + r
+		old = layer.read_row(ry, rx0, rx1)
+		cells = np.frombuffer(old, dtype=np.int32).copy()
+		cells[mask[r]] = value
+		new = array("i")
+		new.frombytes(cells.tobytes())
+		if diff is not None:
+			diff.add_row(layer.cell_index(rx0, ry), old, new)
+		layer.write_row(ry, rx0, new)
+	layer.mark_dirty(rx0, ry0, rx1 - 1, ry1 - 1)
+	return int((x1s - x0s).sum())
+
+
+def _runs(row: array, target: int, x0: int) -> tuple[list[int], list[int]]:
+	# Starts and ends (end-exclusive, offset by x0) of the runs of ``target`` in ``row``
+	if np is not None:
+		mask = np.frombuffer(row, dtype=np.int32) == target
+		edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+		return (
+			(np.flatnonzero(edges == 1) + x0).tolist(),
+			(np.flatnonzero(edges == -1) + x0).tolist(),
+		)
+	starts: list[int] = []
+	ends: list[int] = []
+	pos = x0
+	for value, group in groupby(row):
+		length = len(list(group))
+		if value == target:
+			starts.append(pos)
+			ends.append(pos + length)
+		pos += length
+	return starts, ends
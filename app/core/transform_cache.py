@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+
+from app.core.scene import Node, Scene, SceneEvent, Transform
+
+# 2D affine matrix (a, b, c, d, tx, ty): x' = a*x + c*y + tx, y' = b*x + d*y + ty.
+# Same layout as QTransform(m11=a, m12=b, m21=c, m22=d, dx=tx, dy=ty).
+Affine = tuple[float, float, float, float, float, float]
+
+IDENTITY: Affine = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def local_affine(t: Transform) -> Affine:
+	"""Matrix of translate(x, y) * rotate(rotation_deg) * scale(scale_x, scale_y)."""
+	rad = math.radians(t.rotation_deg)
+	cos = math.cos(rad)
+	sin = math.sin(rad)
+	return (cos * t.scale_x, sin * t.scale_x, -sin * t.scale_y, cos * t.scale_y, t.x, t.y)
+
+
+def compose(parent: Affine, child: Affine) -> Affine:
+	"""Matrix applying ``child`` first, then ``parent``."""
+	pa, pb, pc, pd, ptx, pty = parent
+	ca, cb, cc, cd, ctx, cty = child
+	return (
+		pa * ca + pc * cb,
+		pb * ca + pd * cb,
+		pa * cc + pc * cd,
+		pb * cc + pd * cd,
+		pa * ctx + pc * cty + ptx,
+		pb * ctx + pd * cty + pty,
+	)
+
+
+def invert(m: Affine) -> Affine | None:
+	a, b, c, d, tx, ty = m
+	det = a * d - b * c
+	if abs(det) < 1e-12:
+		return None
+	ia, ib, ic, id_ = d / det, -b / det, -c / det, a / det
+	return (ia, ib, ic, id_, -(ia * tx + ic * ty), -(ib * tx + id_ * ty))
+
+
+def map_point(m: Affine, x: float, y: float) -> tuple[float, float]:
+	a, b, c, d, tx, ty = m
+	return a * x + c * y + tx, b * x + d * y + ty
+
+
+class WorldTransformCache:
+	"""World matrices of scene nodes, composed from parent transforms and cached.
+
+	Invalidating a node drops the cached matrices of its whole subtree (stopping at
+	subtrees that are already dirty); matrices are recomputed lazily on the next read.
+	The owner forwards scene events through ``apply_events``.
+	"""
+
+	def __init__(self, scene: Scene | None = None) -> None:
+		self._world: dict[str, Affine] = {}
+		self._scene: Scene | None = None
+		self.recomputed = 0
+		self.reset(scene)
+
+	def reset(self, scene: Scene | None) -> None:
+		self._world.clear()
+		self._scene = scene
+
+	def world(self, node: Node) -> Affine:
+		cached = self._world.get(node.id)
+		if cached is not None:
+			return cached
+		# Walk up to the nearest ancestor with a valid matrix, then compose back down
+		chain = [node]
+		scene = self._scene
+		pid = scene.parent_id(node.id) if scene is not None else None
+		base = IDENTITY
+		while pid is not None:
+			cached = self._world.get(pid)
+			if cached is not None:
+				base = cached
+				break
+			parent = scene.find_node(pid)
+			if parent is None:
+				break
+			chain.append(parent)
+			pid = scene.parent_id(pid)
+		for n in reversed(chain):
+			base = compose(base, local_affine(n.transform))
+			self._world[n.id] = base
+			self.recomputed += 1
+		return base
+
+	def parent_world(self, node: Node) -> Affine:
+		if self._scene is None:
+			return IDENTITY
+		parent = self._scene.find_node(self._scene.parent_id(node.id) or "")
+		return self.world(parent) if parent is not None else IDENTITY
+
+	def invalidate(self, node_id: str) -> None:
+		if node_id not in self._world or self._scene is None:
+			# Dirty nodes only ever have dirty descendants
+			return
+		stack = [node_id]
+		while stack:
+			nid = stack.pop()
+			if self._world.pop(nid, None) is None:
+				continue
+			node = self._scene.find_node(nid)
+			if node is not None:
+				stack.extend(child.id for child in node.children)
+
+	def apply_events(self, events: Iterable[SceneEvent]) -> None:
+		for ev in events:
+			if ev.kind in ("added", "removed", "reparented") and ev.node is not None:
+				# Re-added or moved subtrees may carry matrices from their previous place
+				self._forget(ev.node)
+			elif ev.kind == "transform":
+				self.invalidate(ev.node_id)
+
+	def _forget(self, start: Node) -> None:
+		stack = [start]
+		while stack:
+			node = stack.pop()
+			self._world.pop(node.id, None)
+			stack.extend(node.children)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+try:
+	import numpy as np
+except ImportError:  # optional: without NumPy nodes keep plain Transform objects
+	np = None
+
+from app.core.scene import Transform
+
+if TYPE_CHECKING:
+	from app.core.scene import Node
+
+FIELDS = ("x", "y", "rotation_deg", "scale_x", "scale_y")
+_ROW = {name: i for i, name in enumerate(FIELDS)}
+
+
+def available() -> bool:
+	return np is not None
+
+
+def _column(row: int) -> property:
+	def get(self: TransformView) -> float:
+		return float(self._store._data[row, self._slot])
+
+	def set(self: TransformView, value: float) -> None:
+		self._store._data[row, self._slot] = value
+
+	return property(get, set)
+
+
+class TransformView(Transform):
+	"""``Transform`` whose fields live in one slot of a ``TransformStore``."""
+
+	__slots__ = ("_store", "_slot")
+
+	x = _column(0)  # type: ignore[assignment]
+	y = _column(1)  # type: ignore[assignment]
+	rotation_deg = _column(2)  # type: ignore[assignment]
+	scale_x = _column(3)  # type: ignore[assignment]
+	scale_y = _column(4)  # type: ignore[assignment]
+
+	def __init__(self, store: TransformStore, slot: int) -> None:
+		self._store = store
+		self._slot = slot
+
+
+class TransformStore:
+	"""Scene-wide struct-of-arrays storage of node transforms (requires NumPy).
+
+	Each attached node gets a slot; its ``transform`` is replaced by a ``TransformView``
+	reading and writing that slot, so per-node code keeps working while batch operations
+	(gizmo drags, multi-node inspector offsets) run as single array operations over many
+	slots.
+	"""
+
+	def __init__(self, capacity: int = 256) -> None:
+		if np is None:
+			raise RuntimeError("TransformStore requires NumPy")
+		self._data = np.zeros((len(FIELDS), max(1, capacity)), dtype=np.float64)
+		self._slots: dict[str, int] = {}
+		self._free: list[int] = []
+		self._used = 0
+
+	def __len__(self) -> int:
+		return len(self._slots)
+
+	def __contains__(self, node_id: object) -> bool:
+		return node_id in self._slots
+
+	def attach(self, node: Node) -> None:
+		t = node.transform
+		slot = self._slots.get(node.id)
+		if (
+			slot is not None
+			and isinstance(t, TransformView)
+			and t._store is self
+			and t._slot == slot
+		):
+			return
+		values = (t.x, t.y, t.rotation_deg, t.scale_x, t.scale_y)
+		if slot is None:
+			slot = self._allocate()
+			self._slots[node.id] = slot
+		self._data[:, slot] = values
+		node.transform = TransformView(self, slot)
+
+	def detach(self, node: Node) -> None:
+		"""Give ``node`` back a plain ``Transform`` with its current values and free the slot."""
+		slot = self._slots.pop(node.id, None)
+		if slot is None:
+			return
+		x, y, rot, sx, sy = (float(v) for v in self._data[:, slot])
+		node.transform = Transform(x=x, y=y, rotation_deg=rot, scale_x=sx, scale_y=sy)
+		self._free.append(slot)
+
+	def slots(self, node_ids: Iterable[str]):
+		"""Slot indices of the given nodes (unknown ids are skipped), as an int array."""
+		slots = self._slots
+		return np.fromiter((slots[nid] for nid in node_ids if nid in slots), dtype=np.intp)
+
+	def positions(self, slots):
+		return self._data[0, slots].copy(), self._data[1, slots].copy()
+
+	def set_positions(self, slots, xs, ys) -> None:
+		self._data[0, slots] = xs
+		self._data[1, slots] = ys
+
+	def offset(self, slots, field: str, delta: float) -> None:
+		self._data[_ROW[field], slots] += delta
+
+	def _allocate(self) -> int:
+		if self._free:
+			return self._free.pop()
+		if self._used == self._data.shape[1]:
+			grown = np.zeros((len(FIELDS), self._used * 2), dtype=np.float64)
+			grown[:, : self._used] = self._data
+			self._data = grown
+		slot = self._used
+		self._used += 1
+		return slot
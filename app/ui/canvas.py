@@ -1,9 +1,36 @@
 from __future__ import annotations
 
-from PyQt6.QtCore import QPoint, QRectF, Qt, pyqtSignal
-from PyQt6.QtGui import QBrush, QMouseEvent, QPainter, QPen, QPixmap, QTransform
+import math
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QLineF, QPoint, QPointF, QRect, QRectF, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor, QFont, QMouseEvent, QPainter, QPen, QTransform
 from PyQt6.QtWidgets import QGraphicsScene, QGraphicsView
 
+from app.core.scene import SceneEvent, SpriteRegion
+from app.core.spatial import SpatialHash
+from app.core.transform_cache import WorldTransformCache
+from app.ui.canvas_items import NodeItem
+from app.ui.frame_stats import FrameStats, FrameStatsRecorder
+from app.ui.image_loader import shared_loader
+from app.ui.textures import TextureCache, painter_scale
+from app.ui.tilemap_renderer import TilemapChunkCache
+
+RENDER_MODES = ("immediate", "retained")
+
+# Every N-th grid line is drawn as a major line
+GRID_MAJOR_EVERY = 8
+# Minimal on-screen distance between drawn grid lines
+GRID_MIN_SPACING_PX = 4.0
+
+
+@dataclass
+class _RenderEntry:
+	node: object
+	local_rect: QRectF
+	transform: QTransform
+	order: int = 0
+
 
 class CanvasView(QGraphicsView):
 	selection_changed = pyqtSignal(list)
@@ -23,11 +50,127 @@ class CanvasView(QGraphicsView):
 		self._rubber_active = False
 		self._rubber_start = None
 		self._rubber_end = None
+		self._current_project = None
+		# Textures decode in the background; nodes show a placeholder until they arrive
+		self._textures = TextureCache(loader=shared_loader())
+		self._textures.add_load_listener(self._on_texture_loaded)
+		self._loaded_textures: set[str] = set()
+		# Texture key -> ids of nodes drawn or measured while it was still decoding
+		self._texture_waiters: dict[str, set[str]] = {}
+		self._tilemap_chunks = TilemapChunkCache(self._textures)
+		# Cached local rect/transform per node plus world-space bounds in a spatial index.
+		# Built lazily, then kept in sync incrementally from scene events; the render list
+		# (draw order) is rebuilt only when the scene structure changes.
+		self._index = SpatialHash()
+		self._entries: dict[str, _RenderEntry] = {}
+		self._index_dirty = True
+		self._render_list: list[_RenderEntry] = []
+		self._render_list_dirty = True
+		self._selected_set: set[str] = set()
+		# Node world matrices (parent transforms composed), invalidated per subtree
+		self._world = WorldTransformCache()
+		# Debug counters for the last painted frame
+		self._drawn_count = 0
+		self._culled_count = 0
+		# "immediate": nodes painted in drawForeground from the render list;
+		# "retained": one NodeItem per node in the QGraphicsScene, indexed/culled by Qt
+		self._render_mode = "immediate"
+		self._items: dict[str, NodeItem] = {}
+		self._restack_pending = False
+		# Per-frame paint timings; the overlay (viewport coords) is refreshed by a timer
+		# so it stays current when only small dirty rects are repainted
+		self._stats = FrameStatsRecorder()
+		self._stats_overlay = False
+		self._stats_timer = QTimer(self)
+		self._stats_timer.setInterval(500)
+		self._stats_timer.timeout.connect(self._refresh_stats_overlay)
+
+	@property
+	def texture_cache(self) -> TextureCache:
+		return self._textures
+
+	@property
+	def render_mode(self) -> str:
+		return self._render_mode
+
+	@property
+	def world_transforms(self) -> WorldTransformCache:
+		return self._world
+
+	@property
+	def stats_overlay_enabled(self) -> bool:
+		return self._stats_overlay
+
+	def set_stats_overlay(self, enabled: bool) -> None:
+		self._stats_overlay = enabled
+		if enabled:
+			self._stats_timer.start()
+		else:
+			self._stats_timer.stop()
+		self.viewport().update()
+
+	def frame_stats(self) -> FrameStats:
+		"""Timings and counters of the last painted frame."""
+		return self._stats.last
 
 	def set_scene(self, scene_model) -> None:
+		if self._scene_model is not None:
+			self._scene_model.unsubscribe(self._on_scene_events)
 		self._scene_model = scene_model
+		if scene_model is not None:
+			scene_model.subscribe(self._on_scene_events)
+		self._world.reset(scene_model)
+		self._invalidate_index()
+		self._rebuild_items()
 		self.viewport().update()
 
+	def set_render_mode(self, mode: str) -> None:
+		if mode not in RENDER_MODES:
+			raise ValueError(f"Unknown render mode: {mode}")
+		if mode == self._render_mode:
+			return
+		self._render_mode = mode
+		self._invalidate_index()
+		self._rebuild_items()
+		self.viewport().update()
+
+	def set_project(self, project) -> None:
+		# Textures are cached per project; switching projects drops the old cache
+		self._current_project = project
+		base_dir = getattr(project, 'root', None)
+		self._textures.close()
+		self._textures = TextureCache(
+			base_dir=base_dir, budget_bytes=self._textures.budget_bytes, loader=shared_loader()
+		)
+		self._textures.add_load_listener(self._on_texture_loaded)
+		self._texture_waiters.clear()
+		self._tilemap_chunks = TilemapChunkCache(self._textures)
+		self._invalidate_index()
+		self._rebuild_items()
+		self.viewport().update()
+
+	def paintEvent(self, event):  # type: ignore[override]
+		overlay_rect = self._stats_overlay_rect()
+		# Overlay-only refreshes are not counted as frames
+		record = not (self._stats_overlay and overlay_rect.contains(event.rect()))
+		if record:
+			self._stats.begin_frame()
+			chunks_built = self._tilemap_chunks.chunks_built
+		super().paintEvent(event)
+		if record:
+			total = len(self._items) if self._render_mode == "retained" else len(self._render_list)
+			drawn = self._stats.counter("nodes")
+			self._stats.end_frame(
+				nodes_drawn=drawn,
+				nodes_culled=max(0, total - drawn),
+				tilemap_chunks_built=self._tilemap_chunks.chunks_built - chunks_built,
+				texture_hit_rate=self._textures.stats().hit_rate,
+			)
+		if self._stats_overlay:
+			painter = QPainter(self.viewport())
+			self._draw_stats_overlay(painter, overlay_rect)
+			painter.end()
+
 	def wheelEvent(self, event):  # type: ignore[override]
 		if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
 			delta = event.angleDelta().y()
@@ -84,81 +227,52 @@ class CanvasView(QGraphicsView):
 		super().drawBackground(painter, rect)
 		if not self._grid_enabled:
 			return
-		painter.save()
-		painter.setPen(QPen(Qt.GlobalColor.gray, 0))
+		started = self._stats.start_phase()
 		step = max(4, self._grid_step)
-		left = int(rect.left()) - (int(rect.left()) % step)
-		top = int(rect.top()) - (int(rect.top()) % step)
-		x = left
-		while x < rect.right():
-			painter.drawLine(int(x), int(rect.top()), int(x), int(rect.bottom()))
-			x += step
-		y = top
-		while y < rect.bottom():
-			painter.drawLine(int(rect.left()), int(y), int(rect.right()), int(y))
-			y += step
+		# Screen spacing of minor lines; coarsen by whole major periods until lines are
+		# at least GRID_MIN_SPACING_PX apart so the line count stays bounded at any zoom
+		scale = abs(self.transform().m11()) or 1.0
+		while step * scale < GRID_MIN_SPACING_PX:
+			step *= GRID_MAJOR_EVERY
+		major_step = step * GRID_MAJOR_EVERY
+		spacing = step * scale
+		# Minor lines fade in between GRID_MIN_SPACING_PX and twice that
+		fade = min(1.0, (spacing - GRID_MIN_SPACING_PX) / GRID_MIN_SPACING_PX)
+		# Minor lines are only built while visible; they skip the major positions
+		major = _grid_lines(rect, major_step, 0)
+		minor = _grid_lines(rect, step, GRID_MAJOR_EVERY) if fade > 0.0 else []
+		painter.save()
+		painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+		if minor:
+			color = QColor(Qt.GlobalColor.gray)
+			color.setAlphaF(0.5 * fade)
+			painter.setPen(QPen(color, 0))
+			painter.drawLines(minor)
+		if major:
+			painter.setPen(QPen(Qt.GlobalColor.gray, 0))
+			painter.drawLines(major)
 		painter.restore()
+		self._stats.stop_phase("grid", started)
 
 	def drawForeground(self, painter: QPainter, rect: QRectF) -> None:  # type: ignore[override]
 		super().drawForeground(painter, rect)
-		# Draw nodes: sprites as textures with transform; others as small rects
-		if self._scene_model is not None:
-			painter.save()
-			for node in self._iterate_nodes(self._scene_model.root):
-				pos_x = float(getattr(node.transform, 'x', 0.0))
-				pos_y = float(getattr(node.transform, 'y', 0.0))
-				rot = float(getattr(node.transform, 'rotation_deg', 0.0))
-				sx = float(getattr(node.transform, 'scale_x', 1.0))
-				sy = float(getattr(node.transform, 'scale_y', 1.0))
-				is_sel = node.id in self._selected_ids
-				painter.save()
-				painter.translate(pos_x, pos_y)
-				if rot:
-					painter.rotate(rot)
-				if sx != 1.0 or sy != 1.0:
-					painter.scale(sx, sy)
-				# Tilemap rendering
-				if hasattr(node, 'tilemap') and node.tilemap is not None:
-					self._draw_tilemap_node(painter, node)
-					painter.restore()
-					continue
-				tex_path = getattr(node, 'sprite_path', None)
-				if tex_path:
-					pix = QPixmap(str(tex_path))
-					if not pix.isNull():
-						region = getattr(node, 'sprite_region', None)
-						if (
-							isinstance(region, dict)
-							and all(k in region for k in ("x", "y", "w", "h"))
-						):
-							pix = pix.copy(
-								int(region["x"]),
-								int(region["y"]),
-								int(region["w"]),
-								int(region["h"]),
-							)
-						w = pix.width()
-						h = pix.height()
-						painter.drawPixmap(-w // 2, -h // 2, pix)
-						if is_sel:
-							painter.setPen(QPen(Qt.GlobalColor.cyan, 0))
-							painter.drawRect(-w // 2, -h // 2, w, h)
-						painter.restore()
-						continue
-				# fallback marker
-				size = 6
-				painter.setPen(QPen(Qt.GlobalColor.cyan if is_sel else Qt.GlobalColor.darkCyan, 0))
-				painter.setBrush(QBrush(Qt.GlobalColor.cyan if is_sel else Qt.GlobalColor.darkCyan))
-				painter.drawRect(int(-size / 2), int(-size / 2), size, size)
-				painter.restore()
-			painter.restore()
+		# Draw nodes intersecting the exposed rect: sprites as textures, others as small rects
+		if self._scene_model is not None and self._render_mode == "immediate":
+			self._ensure_index()
+			visible = self._visible_entries(rect)
+			self._drawn_count = len(visible)
+			self._culled_count = len(self._render_list) - len(visible)
+			for entry in visible:
+				self._draw_entry(painter, entry, rect)
 		# Draw rubber band
 		if self._rubber_active and self._rubber_start and self._rubber_end:
+			started = self._stats.start_phase()
 			painter.save()
 			painter.setPen(QPen(Qt.GlobalColor.blue, 0, Qt.PenStyle.DashLine))
 			r = self._make_rect(self._rubber_start, self._rubber_end)
 			painter.drawRect(r)
 			painter.restore()
+			self._stats.stop_phase("rubber_band", started)
 
 	def set_grid(self, enabled: bool, step: int | None = None) -> None:
 		self._grid_enabled = enabled
@@ -167,13 +281,116 @@ class CanvasView(QGraphicsView):
 		self.viewport().update()
 
 	def set_selected_ids(self, ids: list[str]) -> None:
-		self._selected_ids = list(ids)
-		self.viewport().update()
+		previous = self._selected_set
+		self._set_selection(list(ids))
+		if self._render_mode == "immediate" and not self._index_dirty:
+			dirty = self._bounds_of(previous ^ self._selected_set)
+			if dirty is not None:
+				self.invalidate_scene_rect(dirty)
+		elif self._render_mode == "immediate":
+			self.viewport().update()
+
+	def invalidate_scene_rect(self, rect: QRectF) -> None:
+		"""Schedule a repaint of the viewport area covering ``rect`` (scene coords)."""
+		# Pad for cosmetic outlines and antialiasing around node bounds
+		view_rect = self.mapFromScene(rect).boundingRect().adjusted(-2, -2, 2, 2)
+		self.viewport().update(view_rect)
+
+	def _bounds_of(self, node_ids) -> QRectF | None:
+		dirty: QRectF | None = None
+		for nid in node_ids:
+			b = self._index.bounds(nid)
+			if b is not None:
+				r = QRectF(b[0], b[1], b[2] - b[0], b[3] - b[1])
+				dirty = r if dirty is None else dirty.united(r)
+		return dirty
+
+	def _set_selection(self, ids: list[str]) -> None:
+		previous = self._selected_set
+		self._selected_ids = ids
+		self._selected_set = set(ids)
+		if self._items:
+			for nid in previous ^ self._selected_set:
+				item = self._items.get(nid)
+				if item is not None:
+					item.set_selected(nid in self._selected_set)
+
+	def render_counters(self) -> dict[str, int]:
+		"""Nodes drawn and culled during the last paint."""
+		return {"drawn": self._drawn_count, "culled": self._culled_count}
+
+	def _visible_entries(self, rect: QRectF) -> list[_RenderEntry]:
+		hits = self._index.query_rect(_rect_bounds(rect))
+		if len(hits) * 2 > len(self._render_list):
+			return [e for e in self._render_list if e.node.id in hits]
+		entries = [self._entries[nid] for nid in hits]
+		entries.sort(key=lambda e: e.order)
+		return entries
+
+	def _draw_entry(self, painter: QPainter, entry: _RenderEntry, exposed: QRectF) -> None:
+		painter.save()
+		painter.setWorldTransform(entry.transform, True)
+		local_exposed = None
+		if getattr(entry.node, 'tilemap', None) is not None:
+			inv, ok = entry.transform.inverted()
+			local_exposed = inv.mapRect(exposed) if ok else None
+		self._paint_node(painter, entry.node, entry.node.id in self._selected_set, local_exposed)
+		painter.restore()
+
+	def _paint_node(self, painter: QPainter, node, is_sel: bool, exposed: QRectF | None) -> None:
+		# Paint a node in its local coordinates; shared by both render modes
+		stats = self._stats
+		stats.count("nodes")
+		started = stats.start_phase()
+		if getattr(node, 'tilemap', None) is not None:
+			self._draw_tilemap_node(painter, node, exposed)
+			stats.stop_phase("tilemaps", started)
+			return
+		self._paint_sprite(painter, node, is_sel)
+		stats.stop_phase("sprites", started)
+
+	def _paint_sprite(self, painter: QPainter, node, is_sel: bool) -> None:
+		tex_path = getattr(node, 'sprite_path', None)
+		if tex_path:
+			# Zoomed out (view zoom times node scale), a lower-resolution level is drawn
+			pix, rx, ry = self._textures.pixmap_for_scale(tex_path, painter_scale(painter))
+			if pix is not None:
+				# Regions are drawn straight from the shared atlas via a source rect
+				src = _region_rect(getattr(node, 'sprite_region', None))
+				if src is None:
+					src = QRectF(0, 0, pix.width() / rx, pix.height() / ry)
+				w = int(src.width())
+				h = int(src.height())
+				level_src = QRectF(src.x() * rx, src.y() * ry, src.width() * rx, src.height() * ry)
+				painter.drawPixmap(QRectF(-w // 2, -h // 2, w, h), pix, level_src)
+				self._stats.count("pixmaps")
+				if is_sel:
+					painter.setPen(QPen(Qt.GlobalColor.cyan, 0))
+					painter.drawRect(-w // 2, -h // 2, w, h)
+				return
+			# Still decoding: placeholder of the final size
+			self._wait_for_texture(tex_path, node.id)
+			src = _region_rect(getattr(node, 'sprite_region', None))
+			size = (src.width(), src.height()) if src is not None else self._textures.size(tex_path)
+			if size is not None:
+				w, h = int(size[0]), int(size[1])
+				painter.setPen(QPen(Qt.GlobalColor.cyan if is_sel else Qt.GlobalColor.darkGray, 0))
+				painter.setBrush(QBrush(QColor(128, 128, 128, 60)))
+				painter.drawRect(-w // 2, -h // 2, w, h)
+				return
+		# fallback marker
+		size = 6
+		painter.setPen(QPen(Qt.GlobalColor.cyan if is_sel else Qt.GlobalColor.darkCyan, 0))
+		painter.setBrush(QBrush(Qt.GlobalColor.cyan if is_sel else Qt.GlobalColor.darkCyan))
+		painter.drawRect(int(-size / 2), int(-size / 2), size, size)
 
 	def _iterate_nodes(self, start):
-		yield start
-		for child in start.children:
-			yield from self._iterate_nodes(child)
+		# Pre-order, iterative so deep hierarchies do not hit the recursion limit
+		stack = [start]
+		while stack:
+			node = stack.pop()
+			yield node
+			stack.extend(reversed(node.children))
 
 	def _make_rect(self, a, b) -> QRectF:
 		left = min(a.x(), b.x())
@@ -196,27 +413,13 @@ class CanvasView(QGraphicsView):
 			is_click = True
 
 		if not is_click and selection_rect is not None:
-			for node in self._iterate_nodes(self._scene_model.root):
-				local_rect, world_transform = self._node_local_rect_and_transform(node)
-				world_rect = world_transform.mapRect(local_rect)
-				if world_rect.intersects(selection_rect) and node.id not in selected_set:
-					selected_list.append(node.id)
-					selected_set.add(node.id)
+			for nid in self._pick_rect(selection_rect):
+				if nid not in selected_set:
+					selected_list.append(nid)
+					selected_set.add(nid)
 		else:
 			# Single click: pick topmost under cursor
-			pt = self.mapToScene(event.pos())
-			picked: str | None = None
-			# collect nodes to list to iterate in reverse draw order
-			nodes = list(self._iterate_nodes(self._scene_model.root))
-			for node in reversed(nodes):
-				local_rect, world_transform = self._node_local_rect_and_transform(node)
-				inv, ok = world_transform.inverted()
-				if not ok:
-					continue
-				pt_local = inv.map(pt)
-				if local_rect.contains(pt_local):
-					picked = node.id
-					break
+			picked = self._pick_point(self.mapToScene(event.pos()))
 			if picked is not None:
 				if additive and picked in selected_set:
 					selected_list = [nid for nid in selected_list if nid != picked]
@@ -224,84 +427,281 @@ class CanvasView(QGraphicsView):
 				else:
 					selected_list = ([picked] if not additive else selected_list + [picked])
 					selected_set.add(picked)
-		self._selected_ids = selected_list
+		self._set_selection(selected_list)
 		self.selection_changed.emit(list(self._selected_ids))
 
+	def _pick_rect(self, rect: QRectF) -> list[str]:
+		"""Ids of nodes whose bounds intersect ``rect``, in draw order."""
+		if self._render_mode == "retained":
+			items = self._scene.items(
+				rect,
+				Qt.ItemSelectionMode.IntersectsItemShape,
+				Qt.SortOrder.AscendingOrder,
+			)
+			return [item.node.id for item in items if isinstance(item, NodeItem)]
+		self._ensure_index()
+		hits = self._index.query_rect(_rect_bounds(rect))
+		return sorted(hits, key=lambda h: self._entries[h].order)
+
+	def _pick_point(self, pt: QPointF) -> str | None:
+		"""Id of the topmost node under ``pt``."""
+		if self._render_mode == "retained":
+			for item in self._scene.items(
+				pt,
+				Qt.ItemSelectionMode.IntersectsItemShape,
+				Qt.SortOrder.DescendingOrder,
+			):
+				if isinstance(item, NodeItem):
+					return item.node.id
+			return None
+		self._ensure_index()
+		candidates = [self._entries[nid] for nid in self._index.query_point(pt.x(), pt.y())]
+		candidates.sort(key=lambda e: e.order, reverse=True)
+		for entry in candidates:
+			inv, ok = entry.transform.inverted()
+			if not ok:
+				continue
+			if entry.local_rect.contains(inv.map(pt)):
+				return entry.node.id
+		return None
+
+	# Render list / spatial index maintenance
+	def _invalidate_index(self) -> None:
+		self._index_dirty = True
+		self._render_list_dirty = True
+
+	def _ensure_index(self) -> None:
+		if self._scene_model is None:
+			return
+		if self._index_dirty:
+			self._index.clear()
+			self._entries.clear()
+			for node in self._iterate_nodes(self._scene_model.root):
+				self._update_entry(node)
+			self._index_dirty = False
+			self._render_list_dirty = True
+		if self._render_list_dirty:
+			render_list: list[_RenderEntry] = []
+			for order, node in enumerate(self._iterate_nodes(self._scene_model.root)):
+				entry = self._entries.get(node.id) or self._update_entry(node)
+				entry.order = order
+				render_list.append(entry)
+			self._render_list = render_list
+			self._render_list_dirty = False
+
+	def _update_entry(self, node) -> _RenderEntry:
+		local_rect, transform = self._node_local_rect_and_transform(node)
+		entry = self._entries.get(node.id)
+		if entry is None:
+			entry = _RenderEntry(node, local_rect, transform)
+			self._entries[node.id] = entry
+		else:
+			entry.node = node
+			entry.local_rect = local_rect
+			entry.transform = transform
+		self._index.insert(node.id, _rect_bounds(transform.mapRect(local_rect)))
+		return entry
+
+	def _on_scene_events(self, events) -> None:
+		self._world.apply_events(events)
+		self._tilemap_chunks.apply_events(events)
+		if self._render_mode == "retained":
+			# Item updates schedule their own repaint of the old and new item areas
+			self._sync_items(events)
+			return
+		if self._index_dirty:
+			for ev in events:
+				if ev.kind in ("added", "removed", "reparented"):
+					self._render_list_dirty = True
+			self.viewport().update()
+			return
+		# Repaint only the union of the old and new bounds of changed nodes
+		changed: set[str] = set()
+		updated: list[str] = []
+		for ev in events:
+			if ev.kind == "added" and ev.node is not None:
+				self._render_list_dirty = True
+				for node in self._iterate_nodes(ev.node):
+					self._update_entry(node)
+					changed.add(node.id)
+			elif ev.kind == "removed" and ev.node is not None:
+				self._render_list_dirty = True
+				ids = [node.id for node in self._iterate_nodes(ev.node)]
+				dirty = self._bounds_of(ids)
+				if dirty is not None:
+					self.invalidate_scene_rect(dirty)
+				for nid in ids:
+					self._index.remove(nid)
+					self._entries.pop(nid, None)
+			elif ev.kind in ("transform", "changed", "reparented"):
+				entry = self._entries.get(ev.node_id)
+				if entry is None:
+					continue
+				if ev.kind == "reparented":
+					# Draw order follows the hierarchy
+					self._render_list_dirty = True
+				# A transform change moves the whole subtree; other changes only the node
+				if ev.kind != "changed":
+					updated.extend(node.id for node in self._iterate_nodes(entry.node))
+				else:
+					updated.append(ev.node_id)
+		if updated:
+			# One dirty rect for the old bounds of the whole batch, e.g. a dragged selection
+			before = self._bounds_of(updated)
+			if before is not None:
+				self.invalidate_scene_rect(before)
+			for nid in updated:
+				self._update_entry(self._entries[nid].node)
+			changed.update(updated)
+		dirty = self._bounds_of(changed)
+		if dirty is not None:
+			self.invalidate_scene_rect(dirty)
+
+	def _on_texture_loaded(self, key: str) -> None:
+		# Decodes often finish in bursts; handle them together on the next event loop pass
+		self._loaded_textures.add(key)
+		if len(self._loaded_textures) == 1:
+			QTimer.singleShot(0, self._apply_loaded_textures)
+
+	def _apply_loaded_textures(self) -> None:
+		keys = self._loaded_textures
+		self._loaded_textures = set()
+		waiting: set[str] = set()
+		for key in keys:
+			waiting |= self._texture_waiters.pop(key, set())
+		if self._scene_model is None:
+			return
+		ids = [nid for nid in waiting if self._scene_model.find_node(nid) is not None]
+		if ids:
+			self._on_scene_events([SceneEvent("changed", nid) for nid in ids])
+
+	def _wait_for_texture(self, path, node_id: str) -> None:
+		# Remember nodes to repaint once a pending texture has been decoded
+		if self._textures.is_pending(path):
+			key = self._textures.canonical_key(path)
+			self._texture_waiters.setdefault(key, set()).add(node_id)
+
+	# Retained mode items
+	def _rebuild_items(self) -> None:
+		for item in self._items.values():
+			self._scene.removeItem(item)
+		self._items.clear()
+		if self._render_mode != "retained" or self._scene_model is None:
+			return
+		for order, node in enumerate(self._iterate_nodes(self._scene_model.root)):
+			self._add_item(node).setZValue(order)
+
+	def _add_item(self, node) -> NodeItem:
+		item = NodeItem(self, node)
+		item.set_selected(node.id in self._selected_set)
+		self._items[node.id] = item
+		self._scene.addItem(item)
+		return item
+
+	def _sync_items(self, events) -> None:
+		structural = False
+		for ev in events:
+			if ev.kind == "added" and ev.node is not None:
+				for node in self._iterate_nodes(ev.node):
+					self._add_item(node)
+				structural = True
+			elif ev.kind == "removed" and ev.node is not None:
+				for node in self._iterate_nodes(ev.node):
+					item = self._items.pop(node.id, None)
+					if item is not None:
+						self._scene.removeItem(item)
+				structural = True
+			elif ev.kind in ("transform", "reparented"):
+				item = self._items.get(ev.node_id)
+				if item is not None:
+					for node in self._iterate_nodes(item.node):
+						self._items[node.id].sync()
+				structural = structural or ev.kind == "reparented"
+			elif ev.kind == "changed":
+				item = self._items.get(ev.node_id)
+				if item is not None:
+					item.sync()
+		if structural and not self._restack_pending:
+			# Stacking follows draw order; recompute once after a burst of structure changes
+			self._restack_pending = True
+			QTimer.singleShot(0, self._restack_items)
+
+	def _restack_items(self) -> None:
+		self._restack_pending = False
+		if self._render_mode != "retained" or self._scene_model is None:
+			return
+		for order, node in enumerate(self._iterate_nodes(self._scene_model.root)):
+			item = self._items.get(node.id)
+			if item is not None:
+				item.setZValue(order)
+
 	def _node_local_rect_and_transform(self, node):
-		# Compute local rect centered at origin and world transform for a node
-		pos_x = float(getattr(node.transform, 'x', 0.0))
-		pos_y = float(getattr(node.transform, 'y', 0.0))
-		rot = float(getattr(node.transform, 'rotation_deg', 0.0))
-		sx = float(getattr(node.transform, 'scale_x', 1.0))
-		sy = float(getattr(node.transform, 'scale_y', 1.0))
+		# Compute local rect centered at origin and cached world transform for a node
+		transform = QTransform(*self._world.world(node))
+		tilemap = getattr(node, 'tilemap', None)
+		if tilemap is not None and tilemap.layers:
+			tw = int(tilemap.tile_width)
+			th = int(tilemap.tile_height)
+			x0, y0, x1, y1 = tilemap.bounds()
+			return (
+				QRectF(
+					x0 * tw - (tw // 2),
+					y0 * th - (th // 2),
+					max(1, (x1 - x0) * tw),
+					max(1, (y1 - y0) * th),
+				),
+				transform,
+			)
 		tex_path = getattr(node, 'sprite_path', None)
 		if tex_path:
-			pix = QPixmap(str(tex_path))
-			if not pix.isNull():
-				region = getattr(node, 'sprite_region', None)
-				if (
-					isinstance(region, dict)
-					and all(k in region for k in ("x", "y", "w", "h"))
-				):
-					pix = pix.copy(
-						int(region["x"]),
-						int(region["y"]),
-						int(region["w"]),
-						int(region["h"]),
-					)
-				w = max(1, pix.width())
-				h = max(1, pix.height())
-				local_rect = QRectF(-w / 2, -h / 2, w, h)
-				transform = QTransform()
-				transform.translate(pos_x, pos_y)
-				if rot:
-					transform.rotate(rot)
-				if sx != 1.0 or sy != 1.0:
-					transform.scale(sx, sy)
-				return local_rect, transform
+			# Region bounds come from the region itself; only whole textures need a size lookup
+			src = _region_rect(getattr(node, 'sprite_region', None))
+			if src is None:
+				size = self._textures.size(tex_path)
+				if size is not None:
+					src = QRectF(0, 0, size[0], size[1])
+				else:
+					# Bounds are fixed up once the image size is known
+					self._wait_for_texture(tex_path, node.id)
+			if src is not None:
+				w = max(1, int(src.width()))
+				h = max(1, int(src.height()))
+				return QRectF(-w / 2, -h / 2, w, h), transform
 		# fallback small square
 		size = 6.0
-		local_rect = QRectF(-size / 2, -size / 2, size, size)
-		transform = QTransform()
-		transform.translate(pos_x, pos_y)
-		if rot:
-			transform.rotate(rot)
-		if sx != 1.0 or sy != 1.0:
-			transform.scale(sx, sy)
-		return local_rect, transform
-
-	def _draw_tilemap_node(self, painter: QPainter, node) -> None:
-		# Basic single-layer render from tileset image
-		tilemap = node.tilemap
-		if tilemap is None or self._scene_model is None:
-			return
-		# Resolve tileset image path using project assets dir if available
-		from app.core.tilemap import Tileset
+		return QRectF(-size / 2, -size / 2, size, size), transform
 
-		assets_dir = getattr(getattr(self, '_current_project', None), 'assets_dir', None)
+	def _draw_tilemap_node(self, painter: QPainter, node, exposed: QRectF | None = None) -> None:
+		# Tilemaps are drawn from cached pre-rendered chunks, culled to the exposed area
+		if node.tilemap is None or self._scene_model is None:
+			return
+		assets_dir = getattr(self._current_project, 'assets_dir', None)
 		# Fallback: nothing to draw without assets dir
 		if assets_dir is None:
 			return
-		ts_path = (assets_dir / tilemap.tileset_path).resolve()
-		try:
-			ts = Tileset.load_json(ts_path)
-		except Exception:
-			return
-		img_path = ts_path.parent / ts.image_path
-		pix = QPixmap(str(img_path))
-		if pix.isNull():
-			return
-		for layer in tilemap.layers:
-			w = layer.width
-			h = layer.height
-			for yi in range(h):
-				for xi in range(w):
-					idx = layer.data[yi * w + xi] if yi * w + xi < len(layer.data) else -1
-					if idx < 0:
-						continue
-					sx, sy, tw, th = tilemap.tile_source_rect(idx, ts)
-					src = pix.copy(int(sx), int(sy), int(tw), int(th))
-					painter.drawPixmap(int(xi * tw - tw // 2), int(yi * th - th // 2), src)
+		drawn = self._tilemap_chunks.draw(painter, node, assets_dir, exposed)
+		self._stats.count("chunks", drawn)
+		if not drawn:
+			image = self._tilemap_chunks.tileset_image(node, assets_dir)
+			if image is not None:
+				self._wait_for_texture(image, node.id)
+
+	def _stats_overlay_rect(self) -> QRect:
+		return QRect(8, 8, 460, 78)
+
+	def _refresh_stats_overlay(self) -> None:
+		self.viewport().update(self._stats_overlay_rect())
+
+	def _draw_stats_overlay(self, painter: QPainter, rect: QRect) -> None:
+		painter.fillRect(rect, QColor(0, 0, 0, 170))
+		font = QFont("monospace")
+		font.setStyleHint(QFont.StyleHint.Monospace)
+		font.setPointSize(8)
+		painter.setFont(font)
+		painter.setPen(QColor(Qt.GlobalColor.white))
+		text = "\n".join(self._stats.last.lines())
+		flags = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+		painter.drawText(rect.adjusted(6, 4, -6, -4), flags, text)
 
 	def snap_point(self, x: float, y: float, snap: bool) -> tuple[float, float]:
 		if not snap:
@@ -309,4 +709,39 @@ class CanvasView(QGraphicsView):
 		step = max(1, self._grid_step)
 		return round(x / step) * step, round(y / step) * step
 
+	def snap_points(self, xs, ys, snap: bool):
+		"""``snap_point`` over NumPy arrays of coordinates."""
+		if not snap:
+			return xs, ys
+		import numpy as np
+
+		step = max(1, self._grid_step)
+		return np.round(xs / step) * step, np.round(ys / step) * step
+
+
+def _rect_bounds(rect: QRectF) -> tuple[float, float, float, float]:
+	return rect.left(), rect.top(), rect.right(), rect.bottom()
+
+
+def _region_rect(region: SpriteRegion | None) -> QRectF | None:
+	# Source rect of a sprite region inside its texture
+	if region is None:
+		return None
+	return QRectF(region.x, region.y, region.w, region.h)
+
 
+def _grid_lines(rect: QRectF, step: int, skip_every: int) -> list[QLineF]:
+	# Vertical and horizontal lines at multiples of step covering rect, leaving out every
+	# skip_every-th one (0 keeps all)
+	top, bottom = rect.top(), rect.bottom()
+	left, right = rect.left(), rect.right()
+	lines: list[QLineF] = []
+	for i in range(math.floor(left / step), math.floor(right / step) + 1):
+		if not skip_every or i % skip_every:
+			x = float(i * step)
+			lines.append(QLineF(x, top, x, bottom))
+	for i in range(math.floor(top / step), math.floor(bottom / step) + 1):
+		if not skip_every or i % skip_every:
+			y = float(i * step)
+			lines.append(QLineF(left, y, right, y))
+	return lines
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QPainter, QPainterPath
+from PyQt6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+
+
+class NodeItem(QGraphicsItem):
+	"""Graphics item mirroring one scene ``Node`` for the canvas' retained render mode.
+
+	Geometry and transform are pulled from the canvas via ``sync()``; painting is delegated
+	back to the canvas so both render modes draw nodes identically.
+	"""
+
+	def __init__(self, canvas, node) -> None:
+		super().__init__()
+		self._canvas = canvas
+		self.node = node
+		self.is_selected = False
+		self._rect = QRectF()
+		self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+		self.sync()
+
+	def sync(self) -> None:
+		rect, transform = self._canvas._node_local_rect_and_transform(self.node)
+		if rect != self._rect:
+			self.prepareGeometryChange()
+			self._rect = rect
+		self.setTransform(transform)
+		self.update()
+
+	def set_selected(self, selected: bool) -> None:
+		if selected != self.is_selected:
+			self.is_selected = selected
+			self.update()
+
+	def boundingRect(self) -> QRectF:  # type: ignore[override]
+		# One unit of slack for the cosmetic selection outline
+		return self._rect.adjusted(-1, -1, 1, 1)
+
+	def shape(self) -> QPainterPath:  # type: ignore[override]
+		path = QPainterPath()
+		path.addRect(self._rect)
+		return path
+
+	def paint(  # type: ignore[override]
+		self,
+		painter: QPainter,
+		option: QStyleOptionGraphicsItem,
+		widget: QWidget | None = None,
+	) -> None:
+		self._canvas._paint_node(painter, self.node, self.is_selected, option.exposedRect)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from PyQt6.QtCore import QEvent, Qt, QUrl
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtWidgets import (
 	QDockWidget,
 	QFileDialog,
@@ -19,6 +19,7 @@ from PyQt6.QtWidgets import (
 
 from app.core.assets import import_images, is_image_file
 from app.core.project import Project
+from app.ui.image_loader import shared_loader
 
 
 class AssetsDock(QDockWidget):
@@ -55,6 +56,10 @@ class AssetsDock(QDockWidget):
 		self._preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
 		self._preview.setStyleSheet("border: 1px solid #555; background: #222; color: #aaa;")
 		vbox.addWidget(self._preview)
+		# Previews are decoded in the background; only the latest request is shown
+		self._preview_key: str | None = None
+		self._preview_name = ""
+		shared_loader().image_ready.connect(self._on_preview_decoded)
 
 		container.setLayout(vbox)
 		self.setWidget(container)
@@ -152,6 +157,7 @@ class AssetsDock(QDockWidget):
 			self._rebuild()
 
 	def _update_preview(self) -> None:
+		self._preview_key = None
 		if not self._project:
 			self._preview.setText("No project")
 			self._preview.setPixmap(QPixmap())
@@ -175,12 +181,20 @@ class AssetsDock(QDockWidget):
 			self._preview.setPixmap(QPixmap())
 			return
 		thumb = p.parent / ".thumbnails" / f"{p.stem}_thumb.png"
-		pix = QPixmap(str(thumb if thumb.exists() else p))
-		if pix.isNull():
-			self._preview.setText(p.name)
+		self._preview_name = p.name
+		self._preview.setPixmap(QPixmap())
+		self._preview.setText(f"Loading {p.name}…")
+		self._preview_key = shared_loader().request(thumb if thumb.exists() else p)
+
+	def _on_preview_decoded(self, key: str, image: QImage) -> None:
+		if key != self._preview_key:
+			return
+		self._preview_key = None
+		if image.isNull():
+			self._preview.setText(self._preview_name)
 			self._preview.setPixmap(QPixmap())
 			return
-		scaled = pix.scaled(
+		scaled = QPixmap.fromImage(image).scaled(
 			160,
 			160,
 			Qt.AspectRatioMode.KeepAspectRatio,
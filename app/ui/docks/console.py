@@ -9,7 +9,8 @@ class ConsoleDock(QDockWidget):
 		self.setObjectName("ConsoleDock")
 		self._text = QTextEdit(self)
 		self._text.setReadOnly(True)
-		self._text.setPlainText("Console output will appear here")
+		self._text.setPlaceholderText("Console output will appear here")
 		self.setWidget(self._text)
 
-
+	def append_line(self, text: str) -> None:
+		self._text.append(text)
@@ -1,9 +1,332 @@
 from __future__ import annotations
 
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import QDockWidget, QMenu, QTreeWidget, QTreeWidgetItem
+from typing import Any
 
-from app.core.scene import Node, Scene
+from PyQt6.QtCore import (
+	QAbstractItemModel,
+	QItemSelection,
+	QItemSelectionModel,
+	QModelIndex,
+	QObject,
+	Qt,
+	pyqtSignal,
+)
+from PyQt6.QtWidgets import QDockWidget, QMenu, QTreeView
+
+from app.core.scene import Node, Scene, SceneEvent
+
+# Node ids live in the user role, so the display role shows the node name
+_ID_ROLE = Qt.ItemDataRole.UserRole
+
+# Children handed to the view per fetchMore
+FETCH_BATCH = 256
+# Parents expanded to reveal a selection; past this only the first selected node is revealed
+EXPAND_LIMIT = 64
+
+# Default parent of the top-level rows
+_ROOT = QModelIndex()
+
+
+def _position(children: list[Node], node: Node) -> int:
+	# By identity, from the end: new nodes are usually appended
+	for i in range(len(children) - 1, -1, -1):
+		if children[i] is node:
+			return i
+	return -1
+
+
+class SceneTreeModel(QAbstractItemModel):
+	"""Lazy tree model over a scene's hierarchy.
+
+	Children of a node become rows only when the view asks for them, ``FETCH_BATCH`` at a
+	time. The model mirrors just the rows it has exposed (parent, row and node per id), so
+	lookups by id are dictionary hits and scene events only touch exposed rows. The owner
+	forwards scene events through ``apply_events``.
+	"""
+
+	def __init__(self, parent: QObject | None = None) -> None:
+		super().__init__(parent)
+		self._scene: Scene | None = None
+		# parent id (None for the top level) -> ids of its exposed children, in order
+		self._rows: dict[str | None, list[str]] = {}
+		# Parents whose children are all exposed
+		self._complete: set[str | None] = set()
+		self._parent_of: dict[str, str | None] = {}
+		self._node_of: dict[str, Node] = {}
+		# parent id -> {child id: row}, built on demand and dropped when rows shift
+		self._row_of: dict[str | None, dict[str, int]] = {}
+		# Set while a fetch inserts rows: a listener fetching again from a row signal
+		# would nest insertions or insert the same rows twice
+		self._fetching = False
+
+	def set_scene(self, scene: Scene | None) -> None:
+		self.beginResetModel()
+		self._scene = scene
+		self._rows.clear()
+		self._complete.clear()
+		self._parent_of.clear()
+		self._node_of.clear()
+		self._row_of.clear()
+		if scene is not None:
+			self._rows[None] = [scene.root.id]
+			self._complete.add(None)
+			self._parent_of[scene.root.id] = None
+			self._node_of[scene.root.id] = scene.root
+		self.endResetModel()
+
+	# Lookup
+	def node_id(self, index: QModelIndex) -> str | None:
+		if not index.isValid():
+			return None
+		return index.internalPointer().id
+
+	def index_of(self, node_id: str) -> QModelIndex:
+		"""Index of an already exposed node (invalid if the view has not fetched it)."""
+		node = self._node_of.get(node_id)
+		if node is None:
+			return QModelIndex()
+		return self.createIndex(self._row(self._parent_of[node_id], node_id), 0, node)
+
+	def parent_id(self, node_id: str) -> str | None:
+		"""Parent of an exposed node (None for the root and for nodes not exposed)."""
+		return self._parent_of.get(node_id)
+
+	def index_for_id(self, node_id: str) -> QModelIndex:
+		"""Index of any scene node, exposing it and its ancestors first if needed."""
+		if node_id not in self._node_of:
+			self.expose([node_id])
+		return self.index_of(node_id)
+
+	def expose(self, node_ids: list[str]) -> None:
+		"""Make rows of the given nodes and their ancestors, one fetch per parent."""
+		scene = self._scene
+		if scene is None:
+			return
+		# parent id -> highest child position that must become a row
+		needed: dict[str, int] = {}
+		positions: dict[str, dict[str, int]] = {}
+		seen: set[str] = set()
+		for nid in node_ids:
+			cur = nid
+			while cur not in self._node_of and cur not in seen:
+				pid = scene.parent_id(cur)
+				if pid is None:
+					break
+				seen.add(cur)
+				pos = positions.get(pid)
+				if pos is None:
+					children = self._scene_children(pid)
+					pos = positions[pid] = {c.id: i for i, c in enumerate(children)}
+				needed[pid] = max(needed.get(pid, -1), pos[cur])
+				cur = pid
+		# Top-down: a parent gets its rows once it is a row itself
+		while needed:
+			ready = [pid for pid in needed if pid in self._node_of]
+			if not ready:
+				break
+			for pid in ready:
+				self._fetch(pid, needed.pop(pid) + 1 - len(self._rows.get(pid, ())))
+
+	def _row(self, parent_id: str | None, node_id: str) -> int:
+		rows = self._row_of.get(parent_id)
+		if rows is None:
+			rows = {nid: i for i, nid in enumerate(self._rows.get(parent_id, ()))}
+			self._row_of[parent_id] = rows
+		return rows.get(node_id, -1)
+
+	def _parent_index(self, parent_id: str | None) -> QModelIndex:
+		return self.index_of(parent_id) if parent_id is not None else QModelIndex()
+
+	def _scene_children(self, parent_id: str | None) -> list[Node]:
+		if self._scene is None:
+			return []
+		if parent_id is None:
+			return [self._scene.root]
+		node = self._scene.find_node(parent_id)
+		return node.children if node is not None else []
+
+	# Fetching
+	def _fetch(self, parent_id: str | None, count: int) -> None:
+		if self._fetching:
+			return
+		exposed = self._rows.setdefault(parent_id, [])
+		children = self._scene_children(parent_id)
+		start = len(exposed)
+		end = min(len(children), start + count)
+		if end > start:
+			self._fetching = True
+			try:
+				self.beginInsertRows(self._parent_index(parent_id), start, end - 1)
+				rows = self._row_of.get(parent_id)
+				for row in range(start, end):
+					child = children[row]
+					exposed.append(child.id)
+					self._parent_of[child.id] = parent_id
+					self._node_of[child.id] = child
+					if rows is not None:
+						rows[child.id] = row
+				self.endInsertRows()
+			finally:
+				self._fetching = False
+		if end >= len(children):
+			self._complete.add(parent_id)
+
+	# Scene changes
+	def apply_events(self, events: list[SceneEvent]) -> None:
+		removed: list[str] = []
+		for ev in events:
+			if ev.kind == "removed":
+				# Consecutive removals (a batched delete) are applied together
+				removed.append(ev.node_id)
+				continue
+			if removed:
+				self._remove(removed)
+				removed = []
+			if ev.kind == "added" and ev.node is not None:
+				self._insert(ev.parent_id, ev.node)
+			elif ev.kind == "reparented" and ev.node is not None:
+				self._remove([ev.node_id])
+				self._insert(ev.parent_id, ev.node)
+			elif ev.kind == "renamed" and ev.node_id in self._node_of:
+				index = self.index_of(ev.node_id)
+				self.dataChanged.emit(index, index)
+		if removed:
+			self._remove(removed)
+
+	def _insert(self, parent_id: str | None, node: Node) -> None:
+		if parent_id is None or parent_id not in self._node_of:
+			return
+		exposed = self._rows.get(parent_id)
+		if exposed is None:
+			# Never fetched: rows appear on expansion, only the expand arrow may change
+			index = self.index_of(parent_id)
+			self.dataChanged.emit(index, index)
+			return
+		row = _position(self._scene_children(parent_id), node)
+		if row < 0:
+			return
+		if parent_id not in self._complete and row >= len(exposed):
+			# Still in the unfetched tail
+			return
+		row = min(row, len(exposed))
+		self.beginInsertRows(self.index_of(parent_id), row, row)
+		exposed.insert(row, node.id)
+		self._parent_of[node.id] = parent_id
+		self._node_of[node.id] = node
+		rows = self._row_of.get(parent_id)
+		if rows is not None and row == len(exposed) - 1:
+			# Appended: no other row moved
+			rows[node.id] = row
+		else:
+			self._row_of.pop(parent_id, None)
+		self.endInsertRows()
+
+	def _remove(self, node_ids: list[str]) -> None:
+		# Rows per parent, removed bottom-up in contiguous ranges, so the row numbers
+		# looked up before the first removal stay valid. Nodes inside another removed
+		# subtree go with it
+		targets = set(node_ids)
+		by_parent: dict[str | None, list[int]] = {}
+		for nid in targets:
+			if nid not in self._parent_of:
+				continue
+			parent_id = self._parent_of[nid]
+			ancestor = parent_id
+			while ancestor is not None and ancestor not in targets:
+				ancestor = self._parent_of.get(ancestor)
+			if ancestor is None:
+				by_parent.setdefault(parent_id, []).append(self._row(parent_id, nid))
+		for parent_id, rows in by_parent.items():
+			exposed = self._rows[parent_id]
+			rows = sorted(set(rows), reverse=True)
+			end = 0
+			while end < len(rows):
+				start = end
+				while end + 1 < len(rows) and rows[end + 1] == rows[end] - 1:
+					end += 1
+				first, last = rows[end], rows[start]
+				self.beginRemoveRows(self._parent_index(parent_id), first, last)
+				for nid in exposed[first : last + 1]:
+					self._forget(nid)
+				del exposed[first : last + 1]
+				self._row_of.pop(parent_id, None)
+				self.endRemoveRows()
+				end += 1
+
+	def _forget(self, node_id: str) -> None:
+		# Drop an exposed subtree from the mirror
+		stack = [node_id]
+		while stack:
+			nid = stack.pop()
+			self._parent_of.pop(nid, None)
+			self._node_of.pop(nid, None)
+			self._row_of.pop(nid, None)
+			self._complete.discard(nid)
+			stack.extend(self._rows.pop(nid, ()))
+
+	# QAbstractItemModel
+	def index(  # type: ignore[override]
+		self, row: int, column: int, parent: QModelIndex = _ROOT
+	) -> QModelIndex:
+		exposed = self._rows.get(self.node_id(parent))
+		if column != 0 or exposed is None or not 0 <= row < len(exposed):
+			return QModelIndex()
+		return self.createIndex(row, 0, self._node_of[exposed[row]])
+
+	def parent(self, index: QModelIndex | None = None) -> Any:  # type: ignore[override]
+		if index is None:
+			return super().parent()
+		if not index.isValid():
+			return QModelIndex()
+		# Called for every persistent index on each row change, so kept to dict lookups
+		parent_id = self._parent_of.get(index.internalPointer().id)
+		if parent_id is None:
+			return QModelIndex()
+		grand_id = self._parent_of[parent_id]
+		rows = self._row_of.get(grand_id)
+		row = rows[parent_id] if rows is not None else self._row(grand_id, parent_id)
+		return self.createIndex(row, 0, self._node_of[parent_id])
+
+	def rowCount(self, parent: QModelIndex = _ROOT) -> int:  # type: ignore[override]
+		if parent.column() > 0:
+			return 0
+		return len(self._rows.get(self.node_id(parent), ()))
+
+	def columnCount(self, parent: QModelIndex = _ROOT) -> int:  # type: ignore[override]
+		return 1
+
+	def hasChildren(self, parent: QModelIndex = _ROOT) -> bool:  # type: ignore[override]
+		if not parent.isValid():
+			return self._scene is not None
+		return bool(parent.internalPointer().children)
+
+	def canFetchMore(self, parent: QModelIndex) -> bool:  # type: ignore[override]
+		parent_id = self.node_id(parent)
+		if parent_id in self._complete:
+			return False
+		return len(self._scene_children(parent_id)) > len(self._rows.get(parent_id, ()))
+
+	def fetchMore(self, parent: QModelIndex) -> None:  # type: ignore[override]
+		self._fetch(self.node_id(parent), FETCH_BATCH)
+
+	def data(  # type: ignore[override]
+		self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
+	) -> Any:
+		if not index.isValid():
+			return None
+		node = index.internalPointer()
+		if role == Qt.ItemDataRole.DisplayRole:
+			return node.name
+		if role == _ID_ROLE:
+			return node.id
+		return None
+
+	def headerData(  # type: ignore[override]
+		self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole
+	) -> Any:
+		if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+			return "Name"
+		return None
 
 
 class HierarchyDock(QDockWidget):
@@ -11,32 +334,40 @@ class HierarchyDock(QDockWidget):
 	def __init__(self, parent=None) -> None:
 		super().__init__("Hierarchy", parent)
 		self.setObjectName("HierarchyDock")
-		self._tree = QTreeWidget(self)
-		self._tree.setHeaderLabels(["Name"]) 
+		self._model = SceneTreeModel(self)
+		self._tree = QTreeView(self)
+		self._tree.setModel(self._model)
+		self._tree.setUniformRowHeights(True)
 		self.setWidget(self._tree)
 		self._tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
 		self._tree.customContextMenuRequested.connect(self._on_context_menu)
-		self._tree.itemSelectionChanged.connect(self._on_tree_selection_changed)
+		self._tree.selectionModel().selectionChanged.connect(self._on_tree_selection_changed)
 		self._scene: Scene | None = None
 
 	def set_scene(self, scene: Scene) -> None:
+		if self._scene is not None:
+			self._scene.unsubscribe(self._on_scene_events)
 		self._scene = scene
+		scene.subscribe(self._on_scene_events)
 		self._rebuild()
 
 	def _rebuild(self) -> None:
-		self._tree.clear()
-		if not self._scene:
-			return
-		root_item = self._node_to_item(self._scene.root)
-		self._tree.addTopLevelItem(root_item)
-		self._tree.expandAll()
+		self._model.set_scene(self._scene)
+		if self._scene is not None:
+			self._tree.expand(self._model.index_of(self._scene.root.id))
 
-	def _node_to_item(self, node: Node) -> QTreeWidgetItem:
-		item = QTreeWidgetItem([node.name])
-		item.setData(0, 0, node.id)  # store id for later
-		for child in node.children:
-			item.addChild(self._node_to_item(child))
-		return item
+	def _on_scene_events(self, events: list[SceneEvent]) -> None:
+		# Selection signals are held back and sent once, since removing selected rows
+		# changes the selection row by row
+		selection = self._tree.selectionModel()
+		selected = self.get_selected_ids()
+		selection.blockSignals(True)
+		try:
+			self._model.apply_events(events)
+		finally:
+			selection.blockSignals(False)
+		if self.get_selected_ids() != selected:
+			self._on_tree_selection_changed()
 
 	def _on_context_menu(self, pos) -> None:
 		if not self._scene:
@@ -44,12 +375,12 @@ class HierarchyDock(QDockWidget):
 		from app.core.commands import AddNodeCommand, RemoveNodeCommand
 
 		global_pos = self._tree.viewport().mapToGlobal(pos)
-		item = self._tree.itemAt(pos)
-		node_id = item.data(0, 0) if item else self._scene.root.id
+		index = self._tree.indexAt(pos)
+		node_id = self._model.node_id(index) or self._scene.root.id
 		menu = QMenu(self)
 		act_add = menu.addAction("Add Child")
 		act_remove = None
-		if item and node_id != self._scene.root.id:
+		if index.isValid() and node_id != self._scene.root.id:
 			act_remove = menu.addAction("Remove")
 		chosen = menu.exec(global_pos)
 		if not chosen:
@@ -59,39 +390,56 @@ class HierarchyDock(QDockWidget):
 		mw: QMainWindow | None = self.window()  # type: ignore[assignment]
 		if chosen == act_add and mw is not None:
 			mw.undo_stack.push(AddNodeCommand(self._scene, node_id, "Node"))  # type: ignore[arg-type]
-			self._rebuild()
 		elif act_remove and chosen == act_remove and mw is not None:
 			mw.undo_stack.push(RemoveNodeCommand(self._scene, node_id))  # type: ignore[arg-type]
-			self._rebuild()
 
-	def _on_tree_selection_changed(self) -> None:
-		ids: list[str] = []
-		for item in self._tree.selectedItems():
-			ids.append(item.data(0, 0))
-		self.selection_changed.emit(ids)
+	def _on_tree_selection_changed(self, *_args) -> None:
+		self.selection_changed.emit(self.get_selected_ids())
 
 	def set_selected_ids(self, ids: list[str]) -> None:
-		# Update selection in tree to match ids
-		self._tree.blockSignals(True)
-		self._tree.clearSelection()
-		if not ids:
-			self._tree.blockSignals(False)
-			return
-		stack = [self._tree.topLevelItem(i) for i in range(self._tree.topLevelItemCount())]
-		while stack:
-			item = stack.pop()
-			if not item:
-				continue
-			if item.data(0, 0) in ids:
-				item.setSelected(True)
-			for i in range(item.childCount()):
-				stack.append(item.child(i))
-		self._tree.blockSignals(False)
+		# Rows are grouped per parent and contiguous runs become one selection range
+		model = self._model
+		tree = self._tree
+		selection_model = tree.selectionModel()
+		selection_model.blockSignals(True)
+		# Cleared first: every selected row is a persistent index that row inserts must update
+		selection_model.clear()
+		model.expose(ids)
+		rows: dict[str | None, list[int]] = {}
+		for nid in ids:
+			index = model.index_of(nid)
+			if index.isValid():
+				rows.setdefault(model.parent_id(nid), []).append(index.row())
+		# Make the selected rows visible; for large selections only the first one
+		shown = list(rows) if len(rows) <= EXPAND_LIMIT else [model.parent_id(ids[0])]
+		tree.scheduleDelayedItemsLayout()
+		for parent_id in shown:
+			while parent_id is not None and not tree.isExpanded(model.index_of(parent_id)):
+				tree.expand(model.index_of(parent_id))
+				parent_id = model.parent_id(parent_id)
+		# Expanded rows fetch their children during layout, cheaper before anything is selected
+		tree.executeDelayedItemsLayout()
+		selection = QItemSelection()
+		for parent_id, parent_rows in rows.items():
+			parent = model.index_of(parent_id) if parent_id is not None else QModelIndex()
+			parent_rows.sort()
+			start = prev = parent_rows[0]
+			for row in parent_rows[1:] + [-1]:
+				if row == prev + 1 or row == prev:
+					prev = row
+					continue
+				selection.select(model.index(start, 0, parent), model.index(prev, 0, parent))
+				start = prev = row
+		selection_model.select(selection, QItemSelectionModel.SelectionFlag.Select)
+		selection_model.blockSignals(False)
+		tree.viewport().update()
 
 	def get_selected_ids(self) -> list[str]:
-		return [i.data(0, 0) for i in self._tree.selectedItems()]
+		# selectedRows() checks every row against every range; with one column the
+		# ranges' own indexes are the rows
+		model = self._model
+		indexes = self._tree.selectionModel().selection().indexes()
+		return list(dict.fromkeys(model.node_id(i) for i in indexes))
 
 	def refresh(self) -> None:
 		self._rebuild()
-
-
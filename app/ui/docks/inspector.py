@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from PyQt6.QtCore import QSignalBlocker, pyqtSignal
+from PyQt6.QtGui import QUndoCommand
 from PyQt6.QtWidgets import (
 	QDockWidget,
 	QDoubleSpinBox,
@@ -9,8 +10,12 @@ from PyQt6.QtWidgets import (
 	QWidget,
 )
 
-from app.core.commands import SetNodeNameCommand, SetTransformFieldCommand
-from app.core.scene import Scene
+from app.core.commands import (
+	OffsetTransformFieldCommand,
+	SetNodeNameCommand,
+	SetTransformFieldCommand,
+)
+from app.core.scene import Scene, SceneEvent
 
 
 class InspectorDock(QDockWidget):
@@ -21,6 +26,8 @@ class InspectorDock(QDockWidget):
 		self.setObjectName("InspectorDock")
 		self._scene: Scene | None = None
 		self._selected_ids: list[str] = []
+		# Set while our own command is pushed: its events must not rewrite the field being typed in
+		self._pushing = False
 
 		self._container = QWidget(self)
 		self._form = QFormLayout(self._container)
@@ -72,7 +79,10 @@ class InspectorDock(QDockWidget):
 		self.setWidget(self._container)
 
 	def set_scene(self, scene: Scene) -> None:
+		if self._scene is not None:
+			self._scene.unsubscribe(self._on_scene_events)
 		self._scene = scene
+		scene.subscribe(self._on_scene_events)
 		self._refresh()
 
 	def set_selected_ids(self, ids: list[str]) -> None:
@@ -127,15 +137,29 @@ class InspectorDock(QDockWidget):
 		self._last_field_values["scale_x"] = float(first.transform.scale_x)
 		self._last_field_values["scale_y"] = float(first.transform.scale_y)
 
+	def _on_scene_events(self, events: list[SceneEvent]) -> None:
+		# Поля зависят только от выделенных узлов — остальные изменения пропускаем
+		if not self._scene or not self._selected_ids or self._pushing:
+			return
+		selected = set(self._selected_ids)
+		for ev in events:
+			if ev.kind == "removed":
+				self._selected_ids = [
+					nid for nid in self._selected_ids if self._scene.find_node(nid) is not None
+				]
+				self._refresh()
+				return
+			if ev.kind in ("transform", "renamed", "changed") and ev.node_id in selected:
+				self._refresh()
+				return
+
 	def _on_name_changed(self) -> None:
 		if not self._scene or not self._selected_ids:
 			return
 		new_name = self._name_edit.text().strip()
 		if not new_name:
 			return
-		self.parent().undo_stack.push(  # type: ignore[attr-defined]
-			SetNodeNameCommand(self._scene, self._selected_ids[0], new_name)
-		)
+		self._push(SetNodeNameCommand(self._scene, self._selected_ids[0], new_name))
 
 	def _on_field_changed(self, field: str, value: float) -> None:
 		if not self._scene or not self._selected_ids:
@@ -143,28 +167,22 @@ class InspectorDock(QDockWidget):
 		if len(self._selected_ids) == 1:
 			# Обычное поведение — абсолютное присваивание
 			node_id = self._selected_ids[0]
-			self.parent().undo_stack.push(  # type: ignore[attr-defined]
-				SetTransformFieldCommand(self._scene, node_id, field, float(value))
-			)
+			self._push(SetTransformFieldCommand(self._scene, node_id, field, float(value)))
 		else:
 			# Мультивыбор — применяем относительную дельту ко всем объектам
 			delta = float(value) - float(self._last_field_values.get(field, 0.0))
 			if abs(delta) < 1e-9:
 				return
-			for node_id in self._selected_ids:
-				node = self._scene.find_node(node_id)
-				if not node:
-					continue
-				current = getattr(node.transform, field)
-				new_val = float(current) + delta
-				self.parent().undo_stack.push(  # type: ignore[attr-defined]
-					SetTransformFieldCommand(self._scene, node_id, field, new_val)
-				)
+			self._push(
+				OffsetTransformFieldCommand(self._scene, list(self._selected_ids), field, delta)
+			)
 			# Обновляем базовое значение на показанное в UI
 			self._last_field_values[field] = float(value)
-		try:
-			self.parent()._canvas.viewport().update()  # type: ignore[attr-defined]
-		except Exception:
-			pass
-
+		# Канвас сам перерисовывает изменённые области по событиям сцены
 
+	def _push(self, command: QUndoCommand) -> None:
+		self._pushing = True
+		try:
+			self.parent().undo_stack.push(command)  # type: ignore[attr-defined]
+		finally:
+			self._pushing = False
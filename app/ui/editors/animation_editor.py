@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QPainter, QPixmap
+from PyQt6.QtGui import QImage, QPainter, QPixmap
 from PyQt6.QtWidgets import (
 	QDialog,
 	QDialogButtonBox,
@@ -17,6 +17,8 @@ from PyQt6.QtWidgets import (
 	QVBoxLayout,
 )
 
+from app.ui.image_loader import image_size, shared_loader
+
 
 class AnimationEditor(QDialog):
 	"""Мини-редактор анимации спрайтов.
@@ -34,10 +36,15 @@ class AnimationEditor(QDialog):
 	) -> None:
 		super().__init__(parent)
 		self.setWindowTitle("Animation Editor")
-		self._pix = QPixmap(image_path)
+		# Изображение декодируется в фоне; до его прихода размеры берутся из заголовка
+		self._pix = QPixmap()
+		img_w, img_h = image_size(image_path) or (0, 0)
+		loader = shared_loader()
+		self._image_key = loader.request(image_path)
+		loader.image_ready.connect(self._on_image_decoded)
 		self._frames: list[dict[str, int]] = (
 			frames[:] if frames else [
-				{"x": 0, "y": 0, "w": self._pix.width(), "h": self._pix.height()}
+				{"x": 0, "y": 0, "w": img_w, "h": img_h}
 			]
 		)
 		self._current_index = 0
@@ -65,10 +72,10 @@ class AnimationEditor(QDialog):
 		self._sy = QSpinBox(self)
 		self._sw = QSpinBox(self)
 		self._sh = QSpinBox(self)
-		self._sx.setRange(0, max(0, self._pix.width()))
-		self._sy.setRange(0, max(0, self._pix.height()))
-		self._sw.setRange(1, max(1, self._pix.width()))
-		self._sh.setRange(1, max(1, self._pix.height()))
+		self._sx.setRange(0, max(0, img_w))
+		self._sy.setRange(0, max(0, img_h))
+		self._sw.setRange(1, max(1, img_w))
+		self._sh.setRange(1, max(1, img_h))
 		form.addWidget(QLabel("X:"), 0, 0)
 		form.addWidget(self._sx, 0, 1)
 		form.addWidget(QLabel("Y:"), 1, 0)
@@ -177,6 +184,12 @@ class AnimationEditor(QDialog):
 		self._list.setCurrentRow(self._current_index)
 		self._update_preview()
 
+	def _on_image_decoded(self, key: str, image: QImage) -> None:
+		if key != self._image_key:
+			return
+		self._pix = QPixmap.fromImage(image)
+		self._update_preview()
+
 	def _current_frame_pixmap(self) -> QPixmap:
 		if not self._frames:
 			return QPixmap()
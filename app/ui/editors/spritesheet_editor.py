@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from PyQt6.QtCore import QRect, Qt
-from PyQt6.QtGui import QPainter, QPen, QPixmap
+from PyQt6.QtGui import QImage, QPainter, QPen, QPixmap
 from PyQt6.QtWidgets import (
 	QDialog,
 	QDialogButtonBox,
@@ -11,16 +11,23 @@ from PyQt6.QtWidgets import (
 	QVBoxLayout,
 )
 
+from app.ui.image_loader import image_size, shared_loader
+
 
 class SpritesheetEditor(QDialog):
 	def __init__(self, image_path: str, parent=None) -> None:
 		super().__init__(parent)
 		self.setWindowTitle("Spritesheet Editor")
-		self._pix = QPixmap(image_path)
+		# The sheet is decoded in the background; until then its header size drives the UI
+		self._pix = QPixmap()
+		self._img_w, self._img_h = image_size(image_path) or (0, 0)
+		loader = shared_loader()
+		self._image_key = loader.request(image_path)
+		loader.image_ready.connect(self._on_image_decoded)
 		self._x = 0
 		self._y = 0
-		self._w = self._pix.width()
-		self._h = self._pix.height()
+		self._w = self._img_w
+		self._h = self._img_h
 
 		layout = QVBoxLayout(self)
 		self._preview = QLabel(self)
@@ -29,17 +36,17 @@ class SpritesheetEditor(QDialog):
 
 		row = QHBoxLayout()
 		self._sx = QSpinBox(self)
-		self._sx.setRange(0, max(0, self._pix.width() - 1))
+		self._sx.setRange(0, max(0, self._img_w - 1))
 		self._sx.valueChanged.connect(self._update)
 		self._sy = QSpinBox(self)
-		self._sy.setRange(0, max(0, self._pix.height() - 1))
+		self._sy.setRange(0, max(0, self._img_h - 1))
 		self._sy.valueChanged.connect(self._update)
 		self._sw = QSpinBox(self)
-		self._sw.setRange(1, self._pix.width())
+		self._sw.setRange(1, self._img_w)
 		self._sw.setValue(self._w)
 		self._sw.valueChanged.connect(self._update)
 		self._sh = QSpinBox(self)
-		self._sh.setRange(1, self._pix.height())
+		self._sh.setRange(1, self._img_h)
 		self._sh.setValue(self._h)
 		self._sh.valueChanged.connect(self._update)
 		row.addWidget(QLabel("X:"))
@@ -73,20 +80,23 @@ class SpritesheetEditor(QDialog):
 		# Compute uniform scale to fit while keeping aspect
 		view_w = max(1, self._preview.width())
 		view_h = max(1, self._preview.height())
-		img_w = max(1, self._pix.width())
-		img_h = max(1, self._pix.height())
+		img_w = max(1, self._img_w)
+		img_h = max(1, self._img_h)
 		scale = min(view_w / img_w, view_h / img_h)
 		scaled_w = int(img_w * scale)
 		scaled_h = int(img_h * scale)
 		offset_x = (view_w - scaled_w) // 2
 		offset_y = (view_h - scaled_h) // 2
-		scaled_pix = self._pix.scaled(
-			scaled_w,
-			scaled_h,
-			Qt.AspectRatioMode.IgnoreAspectRatio,
-			Qt.TransformationMode.SmoothTransformation,
-		)
-		p.drawPixmap(offset_x, offset_y, scaled_pix)
+		if self._pix.isNull():
+			p.fillRect(offset_x, offset_y, scaled_w, scaled_h, Qt.GlobalColor.darkGray)
+		else:
+			scaled_pix = self._pix.scaled(
+				scaled_w,
+				scaled_h,
+				Qt.AspectRatioMode.IgnoreAspectRatio,
+				Qt.TransformationMode.SmoothTransformation,
+			)
+			p.drawPixmap(offset_x, offset_y, scaled_pix)
 		p.setPen(QPen(Qt.GlobalColor.red, 2))
 		rect = QRect(
 			int(offset_x + self._x * scale),
@@ -98,6 +108,12 @@ class SpritesheetEditor(QDialog):
 		p.end()
 		self._preview.setPixmap(canvas)
 
+	def _on_image_decoded(self, key: str, image: QImage) -> None:
+		if key != self._image_key:
+			return
+		self._pix = QPixmap.fromImage(image)
+		self._update()
+
 	def get_region(self) -> dict:
 		return {"x": int(self._x), "y": int(self._y), "w": int(self._w), "h": int(self._h)}
 
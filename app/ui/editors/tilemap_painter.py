@@ -3,13 +3,33 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Literal
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QMouseEvent, QPainter, QPixmap
-from PyQt6.QtWidgets import QDialog, QDialogButtonBox, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
+from PyQt6.QtCore import QRect, QSize, Qt
+from PyQt6.QtGui import QImage, QMouseEvent, QPainter, QPaintEvent, QPixmap, QUndoStack
+from PyQt6.QtWidgets import (
+	QDialog,
+	QDialogButtonBox,
+	QHBoxLayout,
+	QPushButton,
+	QToolButton,
+	QVBoxLayout,
+	QWidget,
+)
 
+from app.core.commands import ReplaceTileLayerCommand, TileEditCommand, create_undo_stack
 from app.core.project import Project
 from app.core.scene import TilemapNode
-from app.core.tilemap import TileLayer, Tilemap, Tileset, create_tileset_metadata
+from app.core.tilemap import (
+	CHUNK_SIZE,
+	ChunkedTileLayer,
+	TileDiff,
+	TileLayer,
+	Tilemap,
+	Tileset,
+	create_tileset_metadata,
+	fill_rect,
+	flood_fill,
+)
+from app.ui.image_loader import shared_loader
 
 Tool = Literal["pencil", "rect", "fill"]
 
@@ -22,14 +42,18 @@ class TilemapPainterDialog(QDialog):
 		self._image_path = Path(image_path)
 		self._tileset_path = create_tileset_metadata(project.assets_dir, Path(image_path), 32, 32)
 		self._tileset = Tileset.load_json(self._tileset_path)
-		self._pix = QPixmap(str(self._tileset_path.parent / self._tileset.image_path))
+		# Tiles appear once the tileset image has been decoded in the background
+		self._pix = QPixmap()
+		loader = shared_loader()
+		self._image_key = loader.request(self._tileset_path.parent / self._tileset.image_path)
+		loader.image_ready.connect(self._on_image_decoded)
 		self._tool: Tool = "pencil"
-		self._layer = TileLayer(name="Layer 1", width=16, height=12, data=[-1] * (16 * 12))
+		layer = TileLayer(name="Layer 1", width=16, height=12, data=[-1] * (16 * 12))
 		self._tilemap = Tilemap(
 			tileset_path=str(self._tileset_path.relative_to(project.assets_dir)),
 			tile_width=self._tileset.tile_width,
 			tile_height=self._tileset.tile_height,
-			layers=[self._layer],
+			layers=[layer],
 		)
 
 		main = QVBoxLayout(self)
@@ -48,9 +72,24 @@ class TilemapPainterDialog(QDialog):
 		toolbar.addWidget(self._rect_btn)
 		toolbar.addWidget(self._fill_btn)
 		self._pencil_btn.setChecked(True)
+		# Tile edits get their own history; they are not scene edits until saved
+		self._undo_stack = create_undo_stack(self)
+		undo_action = self._undo_stack.createUndoAction(self, "Undo")
+		undo_action.setShortcut("Ctrl+Z")
+		redo_action = self._undo_stack.createRedoAction(self, "Redo")
+		redo_action.setShortcut("Ctrl+Y")
+		for action in (undo_action, redo_action):
+			self.addAction(action)
+			button = QToolButton(self)
+			button.setDefaultAction(action)
+			toolbar.addWidget(button)
+		# Sparse layers store only the chunks that hold tiles (saved as chunks too)
+		self._sparse_btn = QPushButton("Make Sparse", self)
+		self._sparse_btn.clicked.connect(self._make_sparse)
+		toolbar.addWidget(self._sparse_btn)
 		main.addLayout(toolbar)
 
-		self._canvas = _TileCanvas(self)
+		self._canvas = _TileCanvas(self._undo_stack, self)
 		self._canvas.configure(self._pix, self._tilemap)
 		main.addWidget(self._canvas)
 
@@ -61,10 +100,34 @@ class TilemapPainterDialog(QDialog):
 		btns.rejected.connect(self.reject)
 		main.addWidget(btns)
 
+	def _on_image_decoded(self, key: str, image: QImage) -> None:
+		if key != self._image_key:
+			return
+		self._pix = QPixmap.fromImage(image)
+		self._canvas.configure(self._pix, self._tilemap)
+
 	def _set_tool(self, tool: Tool) -> None:
 		self._tool = tool
 		self._canvas.set_tool(tool)
 
+	def _make_sparse(self) -> None:
+		layer = self._tilemap.layers[0]
+		if not isinstance(layer, TileLayer):
+			return
+		self._undo_stack.push(
+			ReplaceTileLayerCommand(
+				self._tilemap,
+				0,
+				ChunkedTileLayer.from_layer(layer),
+				"Make Layer Sparse",
+				on_change=self._on_layer_replaced,
+			)
+		)
+
+	def _on_layer_replaced(self) -> None:
+		self._sparse_btn.setEnabled(isinstance(self._tilemap.layers[0], TileLayer))
+		self._canvas.configure(self._pix, self._tilemap)
+
 	def _on_save(self) -> None:
 		# Persist tilemap json in scenes folder and add node to current scene via main window
 		scene_dir = self._project.scenes_dir
@@ -80,71 +143,173 @@ class TilemapPainterDialog(QDialog):
 			node = TilemapNode(name="Tilemap")
 			node.tilemap = self._tilemap
 			mw._scene.add_child(mw._scene.root.id, node)  # type: ignore[attr-defined]
-			mw.hierarchy_dock.refresh()  # type: ignore[attr-defined]
-			mw._canvas.viewport().update()  # type: ignore[attr-defined]
 		except Exception:
 			pass
 		self.accept()
 
 
-class _TileCanvas(QLabel):  # type: ignore[misc]
-	def __init__(self, parent=None) -> None:
+class _TileCanvas(QWidget):
+	"""Tile grid preview painted from a persistent backing image.
+
+	Edits only record the cell rects they touched and schedule an update; the backing
+	image is brought up to date once per paint, redrawing just those cells. Qt merges the
+	updates of all mouse events that arrive before the next paint, so a fast stroke costs
+	one repaint per frame.
+	"""
+
+	def __init__(self, undo_stack: QUndoStack, parent=None) -> None:
 		super().__init__(parent)
+		self._undo_stack = undo_stack
 		self.setMinimumSize(640, 480)
 		self.setMouseTracking(True)
+		self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
 		self._pix = QPixmap()
 		self._tilemap: Tilemap | None = None
 		self._tool: Tool = "pencil"
+		self._tile = 0  # use first tile of tileset for now (stub)
+		self._rect_start: tuple[int, int] | None = None
+		# Pencil events of one drag share a stroke number and merge into one undo step
+		self._stroke = 0
+		self._backing = QImage()
+		# Inclusive cell rects changed since the backing image was last updated
+		self._dirty: list[tuple[int, int, int, int]] = []
+		self._full_redraw = True
+		self.cells_drawn = 0
 
 	def configure(self, pix: QPixmap, tilemap: Tilemap) -> None:
 		self._pix = pix
 		self._tilemap = tilemap
-		self._redraw()
+		self._full_redraw = True
+		self.update()
 
 	def set_tool(self, tool: Tool) -> None:
 		self._tool = tool
 
 	def mousePressEvent(self, ev: QMouseEvent) -> None:
-		self._paint_at(ev)
+		cell = self._cell_at(ev)
+		if cell is None or self._tilemap is None:
+			return
+		if self._tool == "rect":
+			# Filled on release, from the press cell to the release cell
+			self._rect_start = cell
+		elif self._tool == "fill":
+			diff = TileDiff()
+			flood_fill(self._tilemap.layers[0], cell[0], cell[1], self._tile, diff)
+			self._push(diff, "Fill Tiles")
+		else:
+			self._stroke += 1
+			self._paint_at(ev)
 
 	def mouseMoveEvent(self, ev: QMouseEvent) -> None:
-		if ev.buttons() & Qt.MouseButton.LeftButton:
+		if self._tool == "pencil" and ev.buttons() & Qt.MouseButton.LeftButton:
 			self._paint_at(ev)
 
-	def _paint_at(self, ev: QMouseEvent) -> None:
-		if not self._tilemap:
+	def mouseReleaseEvent(self, ev: QMouseEvent) -> None:
+		start, self._rect_start = self._rect_start, None
+		cell = self._cell_at(ev)
+		if self._tool != "rect" or start is None or cell is None or self._tilemap is None:
 			return
+		diff = TileDiff()
+		fill_rect(self._tilemap.layers[0], *start, *cell, self._tile, diff)
+		self._push(diff, "Fill Rect")
+
+	def _cell_at(self, ev: QMouseEvent) -> tuple[int, int] | None:
+		if not self._tilemap:
+			return None
 		pt = ev.pos()
 		# map to tile coordinate assuming 1:1 preview scale for simplicity
 		tw, th = self._tilemap.tile_width, self._tilemap.tile_height
 		xi = max(0, min(self._tilemap.layers[0].width - 1, pt.x() // tw))
 		yi = max(0, min(self._tilemap.layers[0].height - 1, pt.y() // th))
-		idx = 0  # use first tile of tileset for now (stub)
-		self._tilemap.layers[0].data[yi * self._tilemap.layers[0].width + xi] = idx
-		self._redraw()
+		return xi, yi
 
-	def _redraw(self) -> None:
-		if not self._tilemap:
+	def _paint_at(self, ev: QMouseEvent) -> None:
+		cell = self._cell_at(ev)
+		if cell is None or self._tilemap is None:
+			return
+		layer = self._tilemap.layers[0]
+		old = layer.get(cell[0], cell[1])
+		# Moves within the same cell change nothing and schedule nothing
+		if old == self._tile:
+			return
+		layer.set(cell[0], cell[1], self._tile)
+		diff = TileDiff()
+		diff.add(layer.cell_index(cell[0], cell[1]), old, self._tile)
+		self._push(diff, "Paint Tiles", self._stroke)
+
+	def _push(self, diff: TileDiff, text: str, stroke: int | None = None) -> None:
+		# The edit is already on the layer; the command only keeps its diff
+		if not diff or self._tilemap is None:
+			return
+		self._on_tiles_changed(diff)
+		layer = self._tilemap.layers[0]
+		self._undo_stack.push(
+			TileEditCommand(layer, diff, text, stroke=stroke, on_change=self._on_tiles_changed)
+		)
+
+	def _on_tiles_changed(self, diff: TileDiff) -> None:
+		if self._tilemap is None:
 			return
-		canvas = QPixmap(self.width(), self.height())
-		canvas.fill(Qt.GlobalColor.black)
-		p = QPainter(canvas)
-		for layer in self._tilemap.layers:
-			for yi in range(layer.height):
-				for xi in range(layer.width):
-					idx = layer.data[yi * layer.width + xi]
-					if idx < 0:
-						continue
-					x = xi * self._tilemap.tile_width
-					y = yi * self._tilemap.tile_height
-					p.fillRect(
-						x,
-						y,
-						self._tilemap.tile_width,
-						self._tilemap.tile_height,
-						Qt.GlobalColor.darkGray,
-					)
+		rect = diff.bounds(self._tilemap.layers[0])
+		if rect is not None:
+			self._invalidate(*rect)
+
+	def _invalidate(self, x0: int, y0: int, x1: int, y1: int) -> None:
+		if self._tilemap is None:
+			return
+		self._dirty.append((x0, y0, x1, y1))
+		tw, th = self._tilemap.tile_width, self._tilemap.tile_height
+		self.update(QRect(x0 * tw, y0 * th, (x1 - x0 + 1) * tw, (y1 - y0 + 1) * th))
+
+	def paintEvent(self, ev: QPaintEvent) -> None:  # type: ignore[override]
+		self._sync_backing()
+		p = QPainter(self)
+		rect = ev.rect()
+		p.fillRect(rect, Qt.GlobalColor.black)
+		if not self._backing.isNull():
+			p.drawImage(rect, self._backing, rect)
 		p.end()
-		self.setPixmap(canvas)
 
+	def _sync_backing(self) -> None:
+		tilemap = self._tilemap
+		if tilemap is None:
+			self._backing = QImage()
+			self._dirty.clear()
+			return
+		tw, th = tilemap.tile_width, tilemap.tile_height
+		_x0, _y0, cols, rows = tilemap.bounds()
+		size = QSize(max(1, cols * tw), max(1, rows * th))
+		if self._full_redraw or self._backing.size() != size:
+			self._full_redraw = False
+			self._dirty.clear()
+			self._backing = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+			self._backing.fill(Qt.GlobalColor.black)
+			p = QPainter(self._backing)
+			for layer in tilemap.layers:
+				for cx, cy, cells in layer.iter_chunks():
+					x0 = cx * CHUNK_SIZE
+					y0 = cy * CHUNK_SIZE
+					for i, idx in enumerate(cells):
+						if idx >= 0:
+							self._draw_cell(p, x0 + i % CHUNK_SIZE, y0 + i // CHUNK_SIZE)
+			p.end()
+			return
+		if not self._dirty:
+			return
+		p = QPainter(self._backing)
+		for x0, y0, x1, y1 in self._dirty:
+			p.fillRect(
+				x0 * tw, y0 * th, (x1 - x0 + 1) * tw, (y1 - y0 + 1) * th, Qt.GlobalColor.black
+			)
+			for layer in tilemap.layers:
+				for y in range(y0, y1 + 1):
+					for i, idx in enumerate(layer.read_row(y, x0, x1 + 1)):
+						if idx >= 0:
+							self._draw_cell(p, x0 + i, y)
+		p.end()
+		self._dirty.clear()
 
+	def _draw_cell(self, p: QPainter, x: int, y: int) -> None:
+		tw, th = self._tilemap.tile_width, self._tilemap.tile_height  # type: ignore[union-attr]
+		p.fillRect(x * tw, y * th, tw, th, Qt.GlobalColor.darkGray)
+		self.cells_drawn += 1
@@ -3,10 +3,11 @@ from __future__ import annotations
 from pathlib import Path
 
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QPen, QPixmap
+from PyQt6.QtGui import QImage, QPainter, QPen, QPixmap
 from PyQt6.QtWidgets import QDialog, QDialogButtonBox, QLabel, QVBoxLayout
 
 from app.core.tilemap import Tileset
+from app.ui.image_loader import shared_loader
 
 
 class TilesetEditor(QDialog):
@@ -15,7 +16,11 @@ class TilesetEditor(QDialog):
 		self.setWindowTitle("Tileset Editor")
 		self._path = tileset_path
 		self._tileset = Tileset.load_json(tileset_path)
-		self._pix = QPixmap(str(tileset_path.parent / self._tileset.image_path))
+		self._pix = QPixmap()
+		self._loading = True
+		loader = shared_loader()
+		self._image_key = loader.request(tileset_path.parent / self._tileset.image_path)
+		loader.image_ready.connect(self._on_image_decoded)
 
 		main = QVBoxLayout(self)
 		self._preview = QLabel(self)
@@ -30,9 +35,16 @@ class TilesetEditor(QDialog):
 
 		self._update_preview()
 
+	def _on_image_decoded(self, key: str, image: QImage) -> None:
+		if key != self._image_key:
+			return
+		self._loading = False
+		self._pix = QPixmap.fromImage(image)
+		self._update_preview()
+
 	def _update_preview(self) -> None:
 		if self._pix.isNull():
-			self._preview.setText("Image not found")
+			self._preview.setText("Loading…" if self._loading else "Image not found")
 			return
 		canvas = QPixmap(self._preview.size())
 		canvas.fill(Qt.GlobalColor.black)
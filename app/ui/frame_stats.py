@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+PHASES = ("grid", "sprites", "tilemaps", "rubber_band")
+
+
+@dataclass
+class FrameStats:
+	"""Timings and counters of one painted canvas frame."""
+
+	fps: float = 0.0
+	frame_ms: float = 0.0
+	phase_ms: dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+	nodes_drawn: int = 0
+	nodes_culled: int = 0
+	pixmaps_drawn: int = 0
+	tilemap_chunks_drawn: int = 0
+	tilemap_chunks_built: int = 0
+	texture_hit_rate: float = 0.0
+	frames: int = 0
+
+	def lines(self) -> list[str]:
+		phases = "  ".join(f"{name} {ms:.2f}" for name, ms in self.phase_ms.items())
+		return [
+			f"{self.fps:.1f} fps  frame {self.frame_ms:.2f} ms",
+			f"ms: {phases}",
+			f"nodes {self.nodes_drawn} drawn / {self.nodes_culled} culled"
+			f"  pixmaps {self.pixmaps_drawn}",
+			f"chunks {self.tilemap_chunks_drawn} drawn / {self.tilemap_chunks_built} built"
+			f"  textures {self.texture_hit_rate * 100:.0f}% hits",
+		]
+
+	def summary(self) -> str:
+		return " | ".join(self.lines())
+
+
+class FrameStatsRecorder:
+	"""Collects per-phase paint time of the current frame and keeps the last finished one.
+
+	Phases are timed with ``start_phase``/``stop_phase`` pairs; time of repeated pairs
+	within one frame is summed. FPS is the number of frames finished during the last
+	``fps_window`` seconds.
+	"""
+
+	def __init__(self, fps_window: float = 1.0) -> None:
+		self._fps_window = float(fps_window)
+		self._frame_times: deque[float] = deque()
+		self._frame_start = 0.0
+		self._phase_ms: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+		self._counters: dict[str, int] = {}
+		self._frames = 0
+		self.last = FrameStats()
+
+	def begin_frame(self) -> None:
+		self._frame_start = time.perf_counter()
+		for name in self._phase_ms:
+			self._phase_ms[name] = 0.0
+		self._counters.clear()
+
+	def start_phase(self) -> float:
+		return time.perf_counter()
+
+	def stop_phase(self, name: str, started: float) -> None:
+		elapsed_ms = (time.perf_counter() - started) * 1000.0
+		self._phase_ms[name] = self._phase_ms.get(name, 0.0) + elapsed_ms
+
+	def count(self, name: str, n: int = 1) -> None:
+		self._counters[name] = self._counters.get(name, 0) + n
+
+	def counter(self, name: str) -> int:
+		return self._counters.get(name, 0)
+
+	def end_frame(self, **values) -> FrameStats:
+		now = time.perf_counter()
+		self._frames += 1
+		self._frame_times.append(now)
+		while self._frame_times and now - self._frame_times[0] > self._fps_window:
+			self._frame_times.popleft()
+		stats = FrameStats(
+			fps=len(self._frame_times) / self._fps_window,
+			frame_ms=(now - self._frame_start) * 1000.0,
+			phase_ms=dict(self._phase_ms),
+			pixmaps_drawn=self._counters.get("pixmaps", 0),
+			tilemap_chunks_drawn=self._counters.get("chunks", 0),
+			frames=self._frames,
+		)
+		for key, value in values.items():
+			setattr(stats, key, value)
+		self.last = stats
+		return stats
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+
+
+def image_key(path: str | Path) -> str:
+	"""Canonical path used to identify an image in loader requests and signals."""
+	return os.path.normcase(os.path.realpath(Path(path).expanduser()))
+
+
+def image_size(path: str | Path) -> tuple[int, int] | None:
+	"""Image dimensions read from the file header only, without decoding pixels."""
+	size = QImageReader(str(path)).size()
+	if not size.isValid():
+		return None
+	return size.width(), size.height()
+
+
+class _Signals(QObject):
+	decoded = pyqtSignal(str, QImage)
+
+
+class _DecodeTask(QRunnable):
+	def __init__(self, key: str, signals: _Signals) -> None:
+		super().__init__()
+		self._key = key
+		self._signals = signals
+
+	def run(self) -> None:  # type: ignore[override]
+		reader = QImageReader(self._key)
+		reader.setAutoTransform(True)
+		image = reader.read()
+		# Delivered to the loader's thread through a queued connection
+		self._signals.decoded.emit(self._key, image)
+
+
+class ImageLoader(QObject):
+	"""Decodes image files to ``QImage`` on a thread pool.
+
+	Concurrent requests for the same file share one decode. ``image_ready`` is emitted on
+	the GUI thread with the canonical key (see ``image_key``) and the decoded image; the
+	image is null if the file could not be read. QPixmap conversion is left to receivers,
+	since pixmaps may only be created on the GUI thread.
+	"""
+
+	image_ready = pyqtSignal(str, QImage)
+
+	def __init__(self, parent: QObject | None = None, pool: QThreadPool | None = None) -> None:
+		super().__init__(parent)
+		self._pool = pool if pool is not None else QThreadPool.globalInstance()
+		self._pending: set[str] = set()
+		self._signals = _Signals(self)
+		self._signals.decoded.connect(self._on_decoded)
+
+	def request(self, path: str | Path) -> str:
+		"""Queue decoding of ``path`` unless it is already in flight; returns its key."""
+		key = image_key(path)
+		if key not in self._pending:
+			self._pending.add(key)
+			self._pool.start(_DecodeTask(key, self._signals))
+		return key
+
+	def is_pending(self, path: str | Path) -> bool:
+		return image_key(path) in self._pending
+
+	def pending_count(self) -> int:
+		return len(self._pending)
+
+	def _on_decoded(self, key: str, image: QImage) -> None:
+		self._pending.discard(key)
+		self.image_ready.emit(key, image)
+
+
+_shared: ImageLoader | None = None
+
+
+def shared_loader() -> ImageLoader:
+	"""Process-wide loader, so the canvas, docks and editors share in-flight decodes."""
+	global _shared
+	if _shared is None:
+		_shared = ImageLoader()
+	return _shared
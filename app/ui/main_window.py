@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
+import time
 from pathlib import Path
 
-from PyQt6.QtCore import QByteArray, QSettings, Qt
+from PyQt6.QtCore import QByteArray, QSettings, Qt, QTimer
 from PyQt6.QtGui import QAction, QActionGroup
 from PyQt6.QtWidgets import QApplication, QDialog, QDockWidget, QMainWindow, QTabWidget
 
@@ -13,7 +14,15 @@ from app.core.commands import (
 	SetStatusMessageCommand,
 	create_undo_stack,
 )
-from app.core.project import create_new_project, load_scene, open_project, save_scene, scene_path
+from app.core.project import (
+	create_new_project,
+	existing_scene_path,
+	load_scene,
+	open_project,
+	open_scene_journal,
+	save_project,
+	save_scene,
+)
 from app.core.settings import add_recent_project, load_settings, save_settings
 from app.ui.canvas import CanvasView
 from app.ui.dialogs.new_project import NewProjectDialog
@@ -23,6 +32,9 @@ from app.ui.docks.hierarchy import HierarchyDock
 from app.ui.docks.inspector import InspectorDock
 from app.ui.docks.tilesets import TilesetsDock
 
+# How often pending scene edits are appended to the journal
+JOURNAL_FLUSH_MS = 1000
+
 
 class MainWindow(QMainWindow):
 	def __init__(self) -> None:
@@ -67,6 +79,14 @@ class MainWindow(QMainWindow):
 		self._grid_menu.addAction(self._action_grid_step_16)
 		self._grid_menu.addAction(self._action_grid_step_32)
 		self._grid_menu.addAction(self._action_grid_step_64)
+		self._action_retained_render = QAction("Retained Rendering", self)
+		self._action_retained_render.setCheckable(True)
+		view_menu.addAction(self._action_retained_render)
+		self._action_frame_stats = QAction("Show Frame Stats", self)
+		self._action_frame_stats.setCheckable(True)
+		view_menu.addAction(self._action_frame_stats)
+		self._action_log_frame_stats = QAction("Log Frame Stats to Console", self)
+		view_menu.addAction(self._action_log_frame_stats)
 		menu_bar.addMenu("Help")
 
 
@@ -116,12 +136,24 @@ class MainWindow(QMainWindow):
 
 		# Undo stack
 		self.undo_stack = create_undo_stack(self)
+		# Edits are appended to the scene journal; the scene file is rewritten in full
+		# only when the journal grows large or the autosave interval has passed
+		self._journal = None
+		self._last_full_save = time.monotonic()
+		self._autosave_seconds = max(1, load_settings().autosave_minutes) * 60
+		self._journal_timer = QTimer(self)
+		self._journal_timer.setInterval(JOURNAL_FLUSH_MS)
+		self._journal_timer.timeout.connect(self._save_changes)
+		self._journal_timer.start()
+		self.undo_stack.indexChanged.connect(lambda _index: self._save_changes())
 		self._add_edit_actions()
 		self._add_file_actions()
 
 		# Create an empty scene and show in hierarchy
 		from app.core.scene import Scene
 		self._scene = Scene(name="Untitled")
+		# Array-backed transforms for batch moves when NumPy is installed
+		self._scene.enable_transform_store()
 		self.hierarchy_dock.set_scene(self._scene)
 		self._canvas.set_scene(self._scene)
 		self.hierarchy_dock.selection_changed.connect(self._canvas.set_selected_ids)
@@ -202,6 +234,13 @@ class MainWindow(QMainWindow):
 		self._action_grid_step_16.triggered.connect(lambda: self._on_grid_step(16))
 		self._action_grid_step_32.triggered.connect(lambda: self._on_grid_step(32))
 		self._action_grid_step_64.triggered.connect(lambda: self._on_grid_step(64))
+		# Canvas render mode
+		retained = settings.canvas_render_mode == "retained"
+		self._canvas.set_render_mode("retained" if retained else "immediate")
+		self._action_retained_render.setChecked(retained)
+		self._action_retained_render.toggled.connect(self._on_retained_render_toggled)
+		self._action_frame_stats.toggled.connect(self._canvas.set_stats_overlay)
+		self._action_log_frame_stats.triggered.connect(self._log_frame_stats)
 		# Demo command to test Undo/Redo
 		demo = QAction("Set status to 'Hello'", self)
 		demo.triggered.connect(self._demo_set_status)
@@ -210,11 +249,7 @@ class MainWindow(QMainWindow):
 	def closeEvent(self, event):  # type: ignore[override]
 		# Persist window layout and current scene
 		self._save_dock_layout()
-		try:
-			if self._project is not None and self._scene is not None:
-				save_scene(self._project, self._scene)
-		except Exception:
-			pass
+		self._save_changes()
 		super().closeEvent(event)
 
 	def _restore_dock_layout(self) -> None:
@@ -263,6 +298,12 @@ class MainWindow(QMainWindow):
 		self.file_menu.addAction(new_project_action)
 		self.file_menu.addAction(open_project_action)
 		self.file_menu.addSeparator()
+		self._action_binary_scenes = QAction("Save Scenes in Binary Format", self)
+		self._action_binary_scenes.setCheckable(True)
+		self._action_binary_scenes.setEnabled(False)
+		self._action_binary_scenes.toggled.connect(self._on_binary_scenes_toggled)
+		self.file_menu.addAction(self._action_binary_scenes)
+		self.file_menu.addSeparator()
 		self._recent_menu = self.file_menu.addMenu("Recent Projects")
 		self._rebuild_recent_menu()
 
@@ -303,6 +344,16 @@ class MainWindow(QMainWindow):
 		settings.snap_to_grid = enabled
 		save_settings(settings)
 
+	def _on_retained_render_toggled(self, enabled: bool) -> None:
+		mode = "retained" if enabled else "immediate"
+		settings = load_settings()
+		settings.canvas_render_mode = mode
+		save_settings(settings)
+		self._canvas.set_render_mode(mode)
+
+	def _log_frame_stats(self) -> None:
+		self.console_dock.append_line(self._canvas.frame_stats().summary())
+
 	def _set_grid_step_checked(self, step: int) -> None:
 		mapping = {
 			16: self._action_grid_step_16,
@@ -313,18 +364,20 @@ class MainWindow(QMainWindow):
 			action.setChecked(s == step)
 
 	def _set_current_project(self, project) -> None:
-		# Save current scene for previous project
-		prev_has_project = getattr(self, "_project", None) is not None
-		prev_has_scene = getattr(self, "_scene", None) is not None
-		if prev_has_project and prev_has_scene:
-			try:
-				save_scene(self._project, self._scene)
-			except Exception:
-				pass
+		# Persist pending edits of the previous project's scene
+		self._save_changes()
+		if self._journal is not None:
+			self._journal.close()
+			self._journal = None
 		# Switch project context
 		self._project = project
+		self._action_binary_scenes.setEnabled(True)
+		self._action_binary_scenes.blockSignals(True)
+		self._action_binary_scenes.setChecked(project.meta.scene_format == "binary")
+		self._action_binary_scenes.blockSignals(False)
 		self.assets_dock.set_project(project)
 		self.tilesets_dock.set_project(project)
+		self._canvas.set_project(project)
 		# Load existing scene or create default
 		self._load_or_create_scene_for_project(project)
 
@@ -332,8 +385,7 @@ class MainWindow(QMainWindow):
 		from app.core.scene import Scene
 
 		default_name = "main"
-		path = scene_path(project, default_name)
-		if path.exists():
+		if existing_scene_path(project, default_name) is not None:
 			scene = load_scene(project, default_name)
 		else:
 			scene = Scene(name=default_name)
@@ -342,29 +394,62 @@ class MainWindow(QMainWindow):
 				save_scene(project, scene)
 			except Exception:
 				pass
+		scene.enable_transform_store()
 		self._scene = scene
+		self._move_gizmo.scene = scene
 		self.hierarchy_dock.set_scene(self._scene)
 		self._canvas.set_scene(self._scene)
 		self.inspector_dock.set_scene(self._scene)
+		self._journal = open_scene_journal(project, scene)
+		self._last_full_save = time.monotonic()
+
+	def _save_changes(self) -> None:
+		"""Append pending scene edits to the journal, compacting it into the scene file when due."""
+		journal = self._journal
+		if journal is None:
+			return
+		try:
+			journal.flush()
+			overdue = time.monotonic() - self._last_full_save >= self._autosave_seconds
+			if journal.needs_compaction() or (overdue and journal.size):
+				self._save_scene_full()
+		except Exception as e:
+			self.statusBar().showMessage(f"Failed to save: {e}")
+
+	def _save_scene_full(self) -> Path:
+		path = save_scene(self._project, self._scene)
+		if self._journal is not None:
+			self._journal.truncate()
+		self._last_full_save = time.monotonic()
+		return path
+
+	def _on_binary_scenes_toggled(self, enabled: bool) -> None:
+		if self._project is None:
+			return
+		self._project.meta.scene_format = "binary" if enabled else "json"
+		try:
+			save_project(self._project)
+			if self._scene is not None:
+				path = self._save_scene_full()
+				self.statusBar().showMessage(f"Scene saved: {path.name}")
+		except Exception as e:
+			self.statusBar().showMessage(f"Failed to save: {e}")
 
 	def _create_sprite_from_asset(self, image_path: str, region: dict | None = None) -> None:
 		# Create a sprite node via command for Undo/Redo
 		from app.core.commands import CreateSpriteCommand
-
-		self.undo_stack.push(CreateSpriteCommand(self._scene, self._scene.root.id, image_path))
-		# If region provided, set on last created node (simple approach)
-		if region:
-			# naive: attach to last child of root
-			if self._scene.root.children:
-				self._scene.root.children[-1].sprite_region = region
-		self.hierarchy_dock.refresh()
-		self._canvas.viewport().update()
-		# Save scene immediately for persistence
-		try:
-			if self._project is not None:
-				save_scene(self._project, self._scene)
-		except Exception:
-			pass
+		from app.core.scene import SpriteRegion
+
+		self.undo_stack.push(
+			CreateSpriteCommand(
+				self._scene,
+				self._scene.root.id,
+				image_path,
+				region=SpriteRegion.from_dict(region),
+			)
+		)
+		# Only the new node is written, as a journal record
+		self._save_changes()
 
 	def _action_new_project(self) -> None:
 		dlg = NewProjectDialog(self)
@@ -422,8 +507,6 @@ class MainWindow(QMainWindow):
 		if not ids:
 			return
 		self.undo_stack.push(DeleteNodesCommand(self._scene, ids))
-		self.hierarchy_dock.refresh()
-		self._canvas.viewport().update()
 
 	def _action_copy_selection(self) -> None:
 		from PyQt6.QtWidgets import QApplication
@@ -451,7 +534,5 @@ class MainWindow(QMainWindow):
 		parent_ids = self.hierarchy_dock.get_selected_ids()
 		parent_id = parent_ids[0] if parent_ids else self._scene.root.id
 		self.undo_stack.push(PasteNodesCommand(self._scene, parent_id, items))
-		self.hierarchy_dock.refresh()
-		self._canvas.viewport().update()
 
 
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPainter, QPixmap
+
+from app.ui.image_loader import ImageLoader, image_size
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class TextureCacheStats:
+	hits: int = 0
+	misses: int = 0
+	evictions: int = 0
+	loads: int = 0
+	bytes_used: int = 0
+	entries: int = 0
+
+	@property
+	def hit_rate(self) -> float:
+		total = self.hits + self.misses
+		return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+	pixmap: QPixmap | None
+	nbytes: int
+	signature: tuple[int, int] | None  # (mtime_ns, size) of the file when loaded
+	checked_at: float
+	pending: bool = False  # decode in flight on the loader
+	size: tuple[int, int] | None = None  # header size while pending
+	mips: list[QPixmap] = field(default_factory=list)  # half, quarter, ... resolution levels
+
+
+class TextureCache:
+	"""LRU cache of decoded textures shared by everything drawn on the canvas.
+
+	Entries are keyed by canonical file path and evicted least-recently-used first once
+	``budget_bytes`` is exceeded. File signatures (mtime/size) are re-checked at most once
+	per ``revalidate_interval`` seconds, so repeated lookups within a frame never touch disk.
+
+	With a ``loader`` misses are decoded in the background: ``pixmap()`` returns None until
+	the image arrives (``size()`` already reports the header size), then the listeners
+	added with ``add_load_listener`` are called with the texture key.
+	"""
+
+	def __init__(
+		self,
+		base_dir: Path | None = None,
+		budget_bytes: int = DEFAULT_BUDGET_BYTES,
+		revalidate_interval: float = 1.0,
+		loader: ImageLoader | None = None,
+	) -> None:
+		self._base_dir = base_dir
+		self._budget = max(0, int(budget_bytes))
+		self._revalidate_interval = float(revalidate_interval)
+		self._entries: OrderedDict[str, _Entry] = OrderedDict()
+		self._keys: dict[str, str] = {}
+		self._stats = TextureCacheStats()
+		self._loader = loader
+		self._load_listeners: list[Callable[[str], None]] = []
+		if loader is not None:
+			loader.image_ready.connect(self._on_image_ready)
+
+	@property
+	def budget_bytes(self) -> int:
+		return self._budget
+
+	def set_budget(self, budget_bytes: int) -> None:
+		self._budget = max(0, int(budget_bytes))
+		self._evict()
+
+	def close(self) -> None:
+		"""Detach from the loader; the cache no longer receives decoded images."""
+		if self._loader is not None:
+			self._loader.image_ready.disconnect(self._on_image_ready)
+			self._loader = None
+
+	def add_load_listener(self, callback: Callable[[str], None]) -> None:
+		self._load_listeners.append(callback)
+
+	def pending_count(self) -> int:
+		return sum(1 for entry in self._entries.values() if entry.pending)
+
+	def is_pending(self, path: str | Path) -> bool:
+		"""True while ``path`` is being decoded in the background."""
+		entry = self._entries.get(self.canonical_key(path))
+		return entry is not None and entry.pending
+
+	def canonical_key(self, path: str | Path) -> str:
+		raw = str(path)
+		key = self._keys.get(raw)
+		if key is None:
+			p = Path(raw).expanduser()
+			if not p.is_absolute() and self._base_dir is not None:
+				p = self._base_dir / p
+			key = os.path.normcase(os.path.realpath(p))
+			self._keys[raw] = key
+		return key
+
+	def pixmap(self, path: str | Path) -> QPixmap | None:
+		"""Return decoded pixmap for ``path`` or None if the file is missing/unreadable."""
+		key = self.canonical_key(path)
+		entry = self._entries.get(key)
+		now = time.monotonic()
+		if entry is not None:
+			if entry.pending:
+				return None
+			if now - entry.checked_at < self._revalidate_interval:
+				self._entries.move_to_end(key)
+				self._stats.hits += 1
+				return entry.pixmap
+			entry.checked_at = now
+			if self._signature(key) == entry.signature:
+				self._entries.move_to_end(key)
+				self._stats.hits += 1
+				return entry.pixmap
+			self._drop(key)
+		self._stats.misses += 1
+		return self._load(key, now).pixmap
+
+	def size(self, path: str | Path) -> tuple[int, int] | None:
+		pix = self.pixmap(path)
+		if pix is None:
+			entry = self._entries.get(self.canonical_key(path))
+			return entry.size if entry is not None else None
+		return pix.width(), pix.height()
+
+	def pixmap_for_scale(
+		self, path: str | Path, scale: float
+	) -> tuple[QPixmap | None, float, float]:
+		"""Pixmap for drawing ``path`` at ``scale`` device pixels per texel.
+
+		Below half scale a cached lower-resolution level is returned, built on first use.
+		Also returns the level's size relative to the full image per axis, to map source rects.
+		"""
+		pix = self.pixmap(path)
+		if pix is None:
+			return None, 1.0, 1.0
+		level = mip_level(scale, pix.width(), pix.height())
+		if level == 0:
+			return pix, 1.0, 1.0
+		key = self.canonical_key(path)
+		entry = self._entries[key]
+		while len(entry.mips) < level:
+			mip = half_size(entry.mips[-1] if entry.mips else pix)
+			entry.mips.append(mip)
+			nbytes = _pixmap_bytes(mip)
+			entry.nbytes += nbytes
+			self._stats.bytes_used += nbytes
+		mip = entry.mips[level - 1]
+		self._evict(keep=key)
+		return mip, mip.width() / pix.width(), mip.height() / pix.height()
+
+	def invalidate(self, path: str | Path | None = None) -> None:
+		if path is None:
+			self._entries.clear()
+			self._stats.bytes_used = 0
+			self._stats.entries = 0
+			return
+		key = self.canonical_key(path)
+		if key in self._entries:
+			self._drop(key)
+
+	def stats(self) -> TextureCacheStats:
+		s = self._stats
+		return TextureCacheStats(
+			hits=s.hits,
+			misses=s.misses,
+			evictions=s.evictions,
+			loads=s.loads,
+			bytes_used=s.bytes_used,
+			entries=len(self._entries),
+		)
+
+	def reset_stats(self) -> None:
+		self._stats = TextureCacheStats(bytes_used=self._stats.bytes_used)
+
+	def _signature(self, key: str) -> tuple[int, int] | None:
+		try:
+			st = os.stat(key)
+		except OSError:
+			return None
+		return st.st_mtime_ns, st.st_size
+
+	def _load(self, key: str, now: float) -> _Entry:
+		signature = self._signature(key)
+		pix: QPixmap | None = None
+		if signature is not None and self._loader is not None:
+			entry = _Entry(
+				pixmap=None, nbytes=0, signature=signature, checked_at=now,
+				pending=True, size=image_size(key),
+			)
+			self._entries[key] = entry
+			self._loader.request(key)
+			return entry
+		if signature is not None:
+			self._stats.loads += 1
+			loaded = QPixmap(key)
+			if not loaded.isNull():
+				pix = loaded
+		nbytes = _pixmap_bytes(pix)
+		entry = _Entry(pixmap=pix, nbytes=nbytes, signature=signature, checked_at=now)
+		self._entries[key] = entry
+		self._stats.bytes_used += nbytes
+		self._evict(keep=key)
+		return entry
+
+	def _on_image_ready(self, key: str, image: QImage) -> None:
+		entry = self._entries.get(key)
+		if entry is None or not entry.pending:
+			# Invalidated or evicted while decoding
+			return
+		self._stats.loads += 1
+		pix = QPixmap.fromImage(image) if not image.isNull() else None
+		entry.pixmap = pix
+		entry.pending = False
+		entry.nbytes = _pixmap_bytes(pix)
+		self._stats.bytes_used += entry.nbytes
+		self._evict(keep=key)
+		for callback in list(self._load_listeners):
+			callback(key)
+
+	def _drop(self, key: str) -> None:
+		entry = self._entries.pop(key)
+		self._stats.bytes_used -= entry.nbytes
+
+	def _evict(self, keep: str | None = None) -> None:
+		while self._stats.bytes_used > self._budget and self._entries:
+			key = next(iter(self._entries))
+			if key == keep:
+				# Never evict the texture that was just requested; it will go next time.
+				if len(self._entries) == 1:
+					break
+				self._entries.move_to_end(key)
+				continue
+			self._drop(key)
+			self._stats.evictions += 1
+
+
+def painter_scale(painter: QPainter) -> float:
+	"""Largest axis scale of the painter's world transform (device pixels per unit)."""
+	t = painter.worldTransform()
+	return max(math.hypot(t.m11(), t.m12()), math.hypot(t.m21(), t.m22()))
+
+
+def mip_level(scale: float, width: int, height: int) -> int:
+	"""Mip level to sample when an image is drawn at ``scale``: 0 is full resolution.
+
+	The level is the finest one that is still at least as large as its on-screen size.
+	"""
+	if scale >= 0.5 or width <= 1 and height <= 1:
+		return 0
+	level = int(math.floor(math.log2(1.0 / max(scale, 1e-6))))
+	return max(0, min(level, int(math.log2(max(width, height)))))
+
+
+def half_size(pix: QPixmap) -> QPixmap:
+	return pix.scaled(
+		max(1, (pix.width() + 1) // 2),
+		max(1, (pix.height() + 1) // 2),
+		Qt.AspectRatioMode.IgnoreAspectRatio,
+		Qt.TransformationMode.SmoothTransformation,
+	)
+
+
+def _pixmap_bytes(pix: QPixmap | None) -> int:
+	if pix is None:
+		return 0
+	return pix.width() * pix.height() * max(1, pix.depth()) // 8
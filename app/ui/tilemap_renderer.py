@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QPainter, QPixmap
+
+from app.core.scene import SceneEvent
+from app.core.tilemap import CHUNK_SIZE, Tilemap, Tileset
+from app.ui.textures import TextureCache, half_size, mip_level, painter_scale
+
+DEFAULT_CHUNK_BUDGET_BYTES = 128 * 1024 * 1024
+
+
+class TilemapChunkCache:
+	"""Pre-rendered CHUNK_SIZE x CHUNK_SIZE tile blocks for tilemap nodes.
+
+	All layers of a chunk are composited into one pixmap. A chunk is re-rendered only
+	when the revision of one of its layers changes (see ``TileLayer.chunk_revision``) or
+	the tileset image is reloaded; least recently drawn chunks are dropped past the budget.
+	Like texture signatures, a tileset file is re-checked on disk at most once per
+	``revalidate_interval`` seconds, not on every paint.
+	Zoomed out, chunks are drawn from cached lower-resolution levels of the chunk pixmap.
+	The owner forwards scene events through ``apply_events`` so chunks of removed or
+	replaced nodes are released right away.
+	"""
+
+	def __init__(
+		self,
+		textures: TextureCache,
+		budget_bytes: int = DEFAULT_CHUNK_BUDGET_BYTES,
+		revalidate_interval: float = 1.0,
+	) -> None:
+		self._textures = textures
+		self._budget = int(budget_bytes)
+		self._revalidate_interval = float(revalidate_interval)
+		self._bytes = 0
+		# (node_id, cx, cy) -> (signature, [full pixmap, half, quarter, ...])
+		self._chunks: OrderedDict[tuple[str, int, int], tuple[tuple, list[QPixmap]]] = OrderedDict()
+		self._node_keys: dict[str, set[tuple[str, int, int]]] = {}
+		# Tileset path -> (file signature, tileset, monotonic time of the last check);
+		# missing or unreadable files are kept as None until they change
+		self._tilesets: dict[str, tuple[tuple[int, int] | None, Tileset | None, float]] = {}
+		self.chunks_drawn = 0
+		self.chunks_built = 0
+
+	def invalidate(self, node_id: str | None = None) -> None:
+		if node_id is None:
+			keys: Iterable[tuple[str, int, int]] = list(self._chunks)
+		else:
+			keys = list(self._node_keys.get(node_id, ()))
+		for key in keys:
+			self._drop(key)
+
+	def apply_events(self, events: Iterable[SceneEvent]) -> None:
+		for ev in events:
+			if ev.kind == "removed" and ev.node is not None:
+				stack = [ev.node]
+				while stack:
+					node = stack.pop()
+					self.invalidate(node.id)
+					stack.extend(node.children)
+			elif ev.kind == "changed":
+				# The node's tilemap may have been replaced by a new object
+				self.invalidate(ev.node_id)
+
+	def draw(self, painter: QPainter, node, assets_dir: Path, exposed: QRectF | None) -> int:
+		"""Draw the chunks of ``node.tilemap`` overlapping ``exposed`` (node-local coords).
+
+		Returns the number of chunks drawn.
+		"""
+		tilemap: Tilemap | None = getattr(node, 'tilemap', None)
+		if tilemap is None or not tilemap.layers:
+			return 0
+		ts_path = assets_dir / tilemap.tileset_path
+		tileset = self._tileset(ts_path)
+		if tileset is None:
+			return 0
+		pix = self._textures.pixmap(ts_path.parent / tileset.image_path)
+		if pix is None:
+			return 0
+		tw = int(tilemap.tile_width)
+		th = int(tilemap.tile_height)
+		if tw <= 0 or th <= 0:
+			return 0
+		x0, y0, x1, y1 = tilemap.bounds()
+		if x1 <= x0 or y1 <= y0:
+			return 0
+		chunk_w = CHUNK_SIZE * tw
+		chunk_h = CHUNK_SIZE * th
+		# Tiles are centred on their grid point, so the map origin sits half a tile up-left
+		ox = -(tw // 2)
+		oy = -(th // 2)
+		cx0 = x0 // CHUNK_SIZE
+		cy0 = y0 // CHUNK_SIZE
+		cx1 = (x1 - 1) // CHUNK_SIZE
+		cy1 = (y1 - 1) // CHUNK_SIZE
+		if exposed is not None:
+			cx0 = max(cx0, int((exposed.left() - ox) // chunk_w))
+			cy0 = max(cy0, int((exposed.top() - oy) // chunk_h))
+			cx1 = min(cx1, int((exposed.right() - ox) // chunk_w))
+			cy1 = min(cy1, int((exposed.bottom() - oy) // chunk_h))
+		if cx1 < cx0 or cy1 < cy0:
+			return 0
+		level = mip_level(painter_scale(painter), chunk_w, chunk_h)
+		drawn = 0
+		# Sparse layers only yield their allocated chunks
+		for cx, cy in tilemap.chunk_keys(cx0, cy0, cx1, cy1):
+			chunk = self._chunk(node.id, tilemap, tileset, pix, cx, cy, level)
+			if chunk.isNull():
+				continue
+			if level == 0:
+				painter.drawPixmap(ox + cx * chunk_w, oy + cy * chunk_h, chunk)
+			else:
+				target = QRectF(ox + cx * chunk_w, oy + cy * chunk_h, chunk_w, chunk_h)
+				painter.drawPixmap(target, chunk, QRectF(chunk.rect()))
+			drawn += 1
+		self.chunks_drawn += drawn
+		return drawn
+
+	def tileset_image(self, node, assets_dir: Path) -> Path | None:
+		"""Path of the tileset image ``node`` is drawn from, if its tileset loads."""
+		tilemap: Tilemap | None = getattr(node, 'tilemap', None)
+		if tilemap is None:
+			return None
+		ts_path = assets_dir / tilemap.tileset_path
+		tileset = self._tileset(ts_path)
+		return ts_path.parent / tileset.image_path if tileset is not None else None
+
+	def _tileset(self, path: Path) -> Tileset | None:
+		key = str(path)
+		now = time.monotonic()
+		cached = self._tilesets.get(key)
+		if cached is not None and now - cached[2] < self._revalidate_interval:
+			return cached[1]
+		try:
+			st = os.stat(path)
+		except OSError:
+			self._tilesets[key] = (None, None, now)
+			return None
+		signature = (st.st_mtime_ns, st.st_size)
+		if cached is not None and cached[0] == signature:
+			self._tilesets[key] = (signature, cached[1], now)
+			return cached[1]
+		try:
+			tileset: Tileset | None = Tileset.load_json(path)
+		except Exception:
+			tileset = None
+		self._tilesets[key] = (signature, tileset, now)
+		return tileset
+
+	def _chunk(
+		self,
+		node_id: str,
+		tilemap: Tilemap,
+		tileset: Tileset,
+		pix: QPixmap,
+		cx: int,
+		cy: int,
+		level: int = 0,
+	) -> QPixmap:
+		signature = (
+			pix.cacheKey(),
+			tilemap.tile_width,
+			tilemap.tile_height,
+			tuple((id(layer), layer.chunk_revision(cx, cy)) for layer in tilemap.layers),
+		)
+		key = (node_id, cx, cy)
+		cached = self._chunks.get(key)
+		if cached is not None and cached[0] == signature:
+			self._chunks.move_to_end(key)
+			levels = cached[1]
+		else:
+			if cached is not None:
+				self._drop(key)
+			levels = [self._render_chunk(tilemap, tileset, pix, cx, cy)]
+			self._chunks[key] = (signature, levels)
+			self._node_keys.setdefault(node_id, set()).add(key)
+			self._bytes += _nbytes(levels[0])
+			self.chunks_built += 1
+		if levels[0].isNull():
+			return levels[0]
+		while len(levels) <= level:
+			levels.append(half_size(levels[-1]))
+			self._bytes += _nbytes(levels[-1])
+		chunk = levels[level]
+		while self._bytes > self._budget and len(self._chunks) > 1:
+			oldest = next(iter(self._chunks))
+			if oldest == key:
+				break
+			self._drop(oldest)
+		return chunk
+
+	def _render_chunk(
+		self, tilemap: Tilemap, tileset: Tileset, pix: QPixmap, cx: int, cy: int
+	) -> QPixmap:
+		tw = int(tilemap.tile_width)
+		th = int(tilemap.tile_height)
+		chunk: QPixmap | None = None
+		painter: QPainter | None = None
+		for layer in tilemap.layers:
+			cells = layer.chunk(cx, cy)
+			if cells is None:
+				continue
+			for i, idx in enumerate(cells):
+				if idx < 0:
+					continue
+				if painter is None:
+					chunk = QPixmap(CHUNK_SIZE * tw, CHUNK_SIZE * th)
+					chunk.fill(Qt.GlobalColor.transparent)
+					painter = QPainter(chunk)
+				sx, sy, sw, sh = tilemap.tile_source_rect(idx, tileset)
+				painter.drawPixmap(
+					QRectF((i % CHUNK_SIZE) * tw, (i // CHUNK_SIZE) * th, sw, sh),
+					pix,
+					QRectF(sx, sy, sw, sh),
+				)
+		if painter is not None:
+			painter.end()
+		# Empty chunks are cached as null pixmaps so they are not re-scanned every frame
+		return chunk if chunk is not None else QPixmap()
+
+	def _drop(self, key: tuple[str, int, int]) -> None:
+		_sig, levels = self._chunks.pop(key)
+		self._bytes -= sum(_nbytes(chunk) for chunk in levels)
+		keys = self._node_keys.get(key[0])
+		if keys is not None:
+			keys.discard(key)
+			if not keys:
+				del self._node_keys[key[0]]
+
+
+def _nbytes(pix: QPixmap) -> int:
+	return pix.width() * pix.height() * 4
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
 from PyQt6.QtCore import QPointF
 from PyQt6.QtGui import QMouseEvent
 
 from app.core.scene import Scene
+from app.core.transform_cache import Affine, invert, map_point
 
 
 @dataclass
 class MoveState:
 	start_pos: QPointF
 	original_positions: dict[str, tuple[float, float]]
+	# Parent world matrix (and its inverse) per moved node: drag deltas and snapping are
+	# in world space, node positions are stored relative to the parent
+	parent_worlds: dict[str, Affine] = field(default_factory=dict)
+	parent_inverses: dict[str, Affine | None] = field(default_factory=dict)
+	# With a scene transform store: the same data as arrays over the moved slots,
+	# (ids, slots, ox, oy, parents (6, n), inverses (6, n))
+	batch: tuple[Any, ...] | None = None
 
 
 class MoveGizmo:
@@ -24,10 +33,32 @@ class MoveGizmo:
 
 	def begin(self, event: QMouseEvent, selected_ids: Iterable[str]) -> None:
 		pt = self.canvas.mapToScene(event.pos())
+		world = self.canvas.world_transforms
+		ids = self._top_level(list(selected_ids))
 		self.state = MoveState(
 			start_pos=pt,
-			original_positions={sid: self._get_node_pos(sid) for sid in selected_ids},
+			original_positions={sid: self._get_node_pos(sid) for sid in ids},
 		)
+		for sid in ids:
+			node = self.scene.find_node(sid)
+			parent = world.parent_world(node) if node else None
+			if parent is None:
+				continue
+			self.state.parent_worlds[sid] = parent
+			self.state.parent_inverses[sid] = invert(parent)
+		store = self.scene.transforms
+		if store is not None:
+			import numpy as np
+
+			moved = [sid for sid in ids if sid in self.state.parent_worlds and sid in store]
+			identity = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+			slots = store.slots(moved)
+			ox, oy = store.positions(slots)
+			parents = np.array([self.state.parent_worlds[sid] for sid in moved]).reshape(-1, 6).T
+			inverses = np.array(
+				[self.state.parent_inverses[sid] or identity for sid in moved]
+			).reshape(-1, 6).T
+			self.state.batch = (moved, slots, ox, oy, parents, inverses)
 
 	def update(self, event: QMouseEvent) -> None:
 		if not self.state:
@@ -36,23 +67,56 @@ class MoveGizmo:
 		dx = pt.x() - self.state.start_pos.x()
 		dy = pt.y() - self.state.start_pos.y()
 		snap = self.get_snap_enabled()
+		if self.state.batch is not None:
+			moved = self._update_batch(dx, dy, snap)
+		else:
+			moved = self._update_nodes(dx, dy, snap)
+		# The canvas repaints only the areas the moved nodes left and entered
+		self.scene.notify_transform_changed(moved)
+
+	def end(self) -> None:
+		self.state = None
+
+	def _update_batch(self, dx: float, dy: float, snap: bool) -> list[str]:
+		# One array pass over all moved slots: parent-local -> world, offset, snap, back
+		moved, slots, ox, oy, parents, inverses = self.state.batch
+		a, b, c, d, tx, ty = parents
+		wx, wy = self.canvas.snap_points(a * ox + c * oy + tx + dx, b * ox + d * oy + ty + dy, snap)
+		a, b, c, d, tx, ty = inverses
+		self.scene.transforms.set_positions(slots, a * wx + c * wy + tx, b * wx + d * wy + ty)
+		return moved
+
+	def _update_nodes(self, dx: float, dy: float, snap: bool) -> list[str]:
+		moved: list[str] = []
 		for sid, (ox, oy) in self.state.original_positions.items():
 			node = self.scene.find_node(sid)
-			if not node:
+			parent = self.state.parent_worlds.get(sid)
+			if not node or parent is None:
 				continue
-			x, y = ox + dx, oy + dy
-			sx, sy = self.canvas.snap_point(x, y, snap)
+			wx, wy = map_point(parent, ox, oy)
+			sx, sy = self.canvas.snap_point(wx + dx, wy + dy, snap)
+			inv = self.state.parent_inverses.get(sid)
+			if inv is not None:
+				sx, sy = map_point(inv, sx, sy)
 			node.transform.x = sx
 			node.transform.y = sy
-		self.canvas.viewport().update()
+			moved.append(sid)
+		return moved
 
-	def end(self) -> None:
-		self.state = None
+	def _top_level(self, ids: list[str]) -> list[str]:
+		# Children move with their parent, so drop nodes that have a selected ancestor
+		id_set = set(ids)
+		result: list[str] = []
+		for nid in ids:
+			cur = self.scene.parent_id(nid)
+			while cur is not None and cur not in id_set:
+				cur = self.scene.parent_id(cur)
+			if cur is None:
+				result.append(nid)
+		return result
 
 	def _get_node_pos(self, node_id: str) -> tuple[float, float]:
 		node = self.scene.find_node(node_id)
 		if not node:
 			return 0.0, 0.0
 		return float(node.transform.x), float(node.transform.y)
-
-
@@ -0,0 +1,108 @@
+"""Bytes per scene node: slotted Node/Transform vs the previous dict-backed layout.
+
+Nodes are loaded through ``Node.from_dict`` from JSON text, like a saved scene, so
+asset path strings arrive as separate objects per node (interning matters here).
+
+Usage: python benchmarks/bench_node_memory.py [node_count]
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.scene import Node  # noqa: E402
+
+
+# Layout of Node/Transform before slots, SpriteRegion and path interning
+@dataclass
+class _DictTransform:
+	x: float = 0.0
+	y: float = 0.0
+	rotation_deg: float = 0.0
+	scale_x: float = 1.0
+	scale_y: float = 1.0
+
+
+@dataclass
+class _DictNode:
+	name: str
+	id: str = field(default_factory=lambda: str(uuid.uuid4()))
+	transform: _DictTransform = field(default_factory=_DictTransform)
+	sprite_path: str | None = None
+	sprite_region: dict | None = None
+	children: list[_DictNode] = field(default_factory=list)
+
+	@staticmethod
+	def from_dict(data: dict[str, Any]) -> _DictNode:
+		t = data.get("transform", {})
+		node = _DictNode(
+			name=str(data.get("name", "Node")),
+			id=str(data.get("id", str(uuid.uuid4()))),
+			transform=_DictTransform(
+				x=float(t.get("x", 0.0)),
+				y=float(t.get("y", 0.0)),
+				rotation_deg=float(t.get("rotation_deg", 0.0)),
+				scale_x=float(t.get("scale_x", 1.0)),
+				scale_y=float(t.get("scale_y", 1.0)),
+			),
+		)
+		node.sprite_path = data.get("sprite_path") or None
+		node.sprite_region = data.get("sprite_region") or None
+		return node
+
+
+def _scene_json(count: int) -> str:
+	nodes = []
+	for i in range(count):
+		nodes.append({
+			"id": str(uuid.uuid4()),
+			"name": f"Sprite {i}",
+			"transform": {
+				"x": i * 1.5,
+				"y": i * 0.5,
+				"rotation_deg": 0.0,
+				"scale_x": 1.0,
+				"scale_y": 1.0,
+			},
+			"sprite_path": f"assets/sheet_{i % 16}.png",
+			"sprite_region": {"x": (i % 8) * 32, "y": (i // 8 % 8) * 32, "w": 32, "h": 32},
+			"children": [],
+		})
+	return json.dumps(nodes)
+
+
+def _measure(factory, text: str) -> tuple[int, list]:
+	gc.collect()
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	items = json.loads(text)
+	nodes = [factory(d) for d in items]
+	# Drop the parsed JSON so only what the nodes keep alive is counted
+	del items
+	gc.collect()
+	used = tracemalloc.get_traced_memory()[0] - before
+	tracemalloc.stop()
+	return used, nodes
+
+
+def main() -> None:
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+	text = _scene_json(count)
+	for label, factory in (("dict-backed", _DictNode.from_dict), ("slotted", Node.from_dict)):
+		used, nodes = _measure(factory, text)
+		mib = used / 1024 / 1024
+		print(f"{label:12s} {count} nodes: {mib:8.1f} MiB, {used / count:6.0f} bytes/node")
+		del nodes
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,84 @@
+"""Save/load time and peak memory of a generated scene: streaming IO vs dict-tree JSON,
+and the binary ``.dscene`` format.
+
+"dict-tree" is the previous path: ``json.dumps(scene.to_dict(), indent=2)`` written with
+one ``write_text`` call. Both writers must produce byte-identical files.
+
+Usage: python benchmarks/bench_scene_io.py [node_count]
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.scene import Node, Scene, SpriteRegion  # noqa: E402
+from app.core.scene_binary import read_scene_binary, write_scene_binary  # noqa: E402
+from app.core.scene_io import read_scene_json, write_scene_json  # noqa: E402
+
+
+def _build_scene(count: int) -> Scene:
+	rng = random.Random(42)
+	scene = Scene(name="bench")
+	groups = [scene.root]
+	for i in range(count):
+		node = Node(name=f"Node {i}")
+		node.transform.x = rng.uniform(-5000, 5000)
+		node.transform.y = rng.uniform(-5000, 5000)
+		if i % 3:
+			node.sprite_path = f"assets/sheet_{i % 16}.png"
+			node.sprite_region = SpriteRegion((i % 8) * 32, 0, 32, 32)
+		parent = rng.choice(groups)
+		scene.add_child(parent.id, node)
+		if i % 10 == 0:
+			groups.append(node)
+	return scene
+
+
+def _run(label: str, fn) -> None:
+	# Timed without tracing (tracemalloc slows allocation-heavy code several times over),
+	# then run again under tracemalloc for the peak
+	started = time.perf_counter()
+	fn()
+	elapsed = time.perf_counter() - started
+	tracemalloc.start()
+	fn()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	print(f"{label:16s} {elapsed:7.2f} s   peak {peak / 1024 / 1024:8.1f} MiB")
+
+
+def main() -> None:
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+	scene = _build_scene(count)
+	with tempfile.TemporaryDirectory() as tmp:
+		old_path = Path(tmp) / "dict_tree.json"
+		new_path = Path(tmp) / "streamed.json"
+		print(f"{count} nodes")
+		_run(
+			"save dict-tree",
+			lambda: old_path.write_text(json.dumps(scene.to_dict(), indent=2), encoding="utf-8"),
+		)
+		_run("save streaming", lambda: write_scene_json(scene, new_path))
+		same = old_path.read_bytes() == new_path.read_bytes()
+		print(f"identical output: {same}, {new_path.stat().st_size / 1024 / 1024:.1f} MiB")
+		_run(
+			"load dict-tree",
+			lambda: Scene.from_dict(json.loads(old_path.read_text(encoding="utf-8"))),
+		)
+		_run("load streaming", lambda: read_scene_json(new_path))
+		bin_path = Path(tmp) / "scene.dscene"
+		_run("save binary", lambda: write_scene_binary(scene, bin_path))
+		print(f"binary size: {bin_path.stat().st_size / 1024 / 1024:.1f} MiB")
+		_run("load binary", lambda: read_scene_binary(bin_path))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,100 @@
+"""Worst-case tile fills on a square layer: rect and pattern fills over the whole layer,
+and flood fills of an open layer, a serpentine corridor and a comb of one-cell columns.
+
+The comb is the worst case for a span fill: every row splits into width/2 runs, all of
+them connected, so the run walk hands over to labelling the whole layer. The per-cell
+``set`` loop is the cost of filling cell by cell.
+
+Usage: python benchmarks/bench_tile_fill.py [size]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import tilemap  # noqa: E402
+from app.core.tilemap import (  # noqa: E402
+	ChunkedTileLayer,
+	TileLayer,
+	fill_pattern,
+	fill_rect,
+	flood_fill,
+)
+
+
+def _empty(size: int) -> TileLayer:
+	return TileLayer(name="bench", width=size, height=size, data=array("i", [-1]) * (size * size))
+
+
+def _serpentine(size: int) -> TileLayer:
+	# Wall on every odd row, open at alternating ends: one corridor through the whole layer
+	layer = _empty(size)
+	for y in range(1, size, 2):
+		gap = size - 1 if y % 4 == 1 else 0
+		fill_rect(layer, 0, y, size - 1, y, 0)
+		layer.set(gap, y, -1)
+	return layer
+
+
+def _comb(size: int) -> TileLayer:
+	# Wall on every odd column, open at alternating ends
+	layer = _empty(size)
+	wall = array("i", [-1, 0]) * (size // 2) + array("i", [-1]) * (size % 2)
+	for y in range(size):
+		layer.write_row(y, 0, wall)
+	for x in range(1, size, 2):
+		layer.set(x, size - 1 if x % 4 == 1 else 0, -1)
+	return layer
+
+
+def _run(label: str, layer_fn, fill_fn) -> None:
+	layer = layer_fn()
+	started = time.perf_counter()
+	result = fill_fn(layer)
+	elapsed = time.perf_counter() - started
+	cells = f"   {result} cells" if isinstance(result, int) else ""
+	print(f"{label:24s} {elapsed:7.3f} s{cells}")
+
+
+def _set_cells(layer: TileLayer) -> None:
+	for y in range(layer.height):
+		for x in range(layer.width):
+			layer.set(x, y, 1)
+
+
+def main() -> None:
+	size = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+	last = size - 1
+	pattern = array("i", [1, 2, 3, 4, 5, 6, 7, 8, 9])
+	print(f"{size}x{size} cells, NumPy: {tilemap.np is not None}")
+	_run("rect, per-cell set", lambda: _empty(size), _set_cells)
+	_run("rect", lambda: _empty(size), lambda ly: fill_rect(ly, 0, 0, last, last, 1))
+	_run(
+		"pattern 3x3",
+		lambda: _empty(size),
+		lambda ly: fill_pattern(ly, 0, 0, last, last, pattern, 3),
+	)
+	_run("flood open", lambda: _empty(size), lambda ly: flood_fill(ly, 0, 0, 1))
+	_run("flood serpentine", lambda: _serpentine(size), lambda ly: flood_fill(ly, 0, 0, 1))
+	_run("flood comb", lambda: _comb(size), lambda ly: flood_fill(ly, 0, 0, 1))
+	_run(
+		"rect, chunked",
+		lambda: ChunkedTileLayer(name="bench", width=size, height=size),
+		lambda ly: fill_rect(ly, 0, 0, last, last, 1),
+	)
+
+	def chunked_open() -> ChunkedTileLayer:
+		layer = ChunkedTileLayer(name="bench", width=size, height=size)
+		fill_rect(layer, 0, 0, last, last, 0)
+		return layer
+
+	_run("flood open, chunked", chunked_open, lambda ly: flood_fill(ly, 0, 0, 1))
+
+
+if __name__ == "__main__":
+	main()
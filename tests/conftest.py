@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# Widget tests run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+	from PyQt6.QtWidgets import QApplication
+
+	app = QApplication.instance() or QApplication([])
+	yield app
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.scene import Node, Scene, Transform
+from app.ui import frame_stats
+from app.ui.canvas import CanvasView
+from app.ui.frame_stats import PHASES, FrameStats, FrameStatsRecorder
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+	now = [10.0]
+	monkeypatch.setattr(frame_stats, "time", SimpleNamespace(perf_counter=lambda: now[0]))
+	return now
+
+
+def test_phases_are_summed_within_a_frame(clock: list[float]) -> None:
+	rec = FrameStatsRecorder()
+	rec.begin_frame()
+	for _ in range(2):
+		started = rec.start_phase()
+		clock[0] += 0.002
+		rec.stop_phase("sprites", started)
+	started = rec.start_phase()
+	clock[0] += 0.001
+	rec.stop_phase("grid", started)
+	clock[0] += 0.001
+	stats = rec.end_frame()
+	assert stats.phase_ms["sprites"] == pytest.approx(4.0)
+	assert stats.phase_ms["grid"] == pytest.approx(1.0)
+	assert stats.phase_ms["tilemaps"] == 0.0
+	assert stats.frame_ms == pytest.approx(6.0)
+	assert rec.last is stats
+
+	# The next frame starts from zero
+	rec.begin_frame()
+	stats = rec.end_frame()
+	assert set(stats.phase_ms) == set(PHASES)
+	assert all(ms == 0.0 for ms in stats.phase_ms.values())
+
+
+def test_counters_reset_per_frame_and_map_to_fields(clock: list[float]) -> None:
+	rec = FrameStatsRecorder()
+	rec.begin_frame()
+	rec.count("pixmaps")
+	rec.count("pixmaps", 4)
+	rec.count("chunks", 3)
+	assert rec.counter("pixmaps") == 5
+	stats = rec.end_frame(nodes_drawn=7, texture_hit_rate=0.5)
+	assert (stats.pixmaps_drawn, stats.tilemap_chunks_drawn) == (5, 3)
+	assert (stats.nodes_drawn, stats.texture_hit_rate) == (7, 0.5)
+	rec.begin_frame()
+	assert rec.counter("pixmaps") == 0
+	assert rec.end_frame().frames == 2
+
+
+def test_fps_counts_frames_in_window(clock: list[float]) -> None:
+	rec = FrameStatsRecorder(fps_window=1.0)
+	for _ in range(30):
+		rec.begin_frame()
+		clock[0] += 0.05
+		stats = rec.end_frame()
+	# 1.5 s of frames at 20 per second; only the last second counts
+	assert stats.fps == pytest.approx(20.0, abs=1.0)
+	assert stats.frames == 30
+
+
+def test_lines_show_every_value() -> None:
+	stats = FrameStats(
+		fps=59.9, frame_ms=1.234, nodes_drawn=3, nodes_culled=2, texture_hit_rate=0.75
+	)
+	text = stats.summary()
+	assert "59.9 fps" in text
+	assert "frame 1.23 ms" in text
+	assert "nodes 3 drawn / 2 culled" in text
+	assert "75% hits" in text
+	assert all(name in text for name in PHASES)
+
+
+@pytest.fixture
+def canvas(qapp):
+	view = CanvasView()
+	view.resize(400, 300)
+	scene = Scene(name="Test")
+	for i in range(3):
+		scene.add_child(scene.root.id, Node(name=f"near{i}", id=f"near{i}"))
+	for i in range(2):
+		scene.add_child(
+			scene.root.id, Node(name=f"far{i}", id=f"far{i}", transform=Transform(x=1e6 + i))
+		)
+	view.set_scene(scene)
+	view.show()
+	view.centerOn(0.0, 0.0)
+	yield view
+	view.close()
+	view.deleteLater()
+
+
+def test_canvas_records_painted_frames(canvas: CanvasView) -> None:
+	canvas.viewport().grab()
+	stats = canvas.frame_stats()
+	before = stats.frames
+	assert before >= 1
+	# Root and the near nodes are drawn, the far ones culled
+	assert (stats.nodes_drawn, stats.nodes_culled) == (4, 2)
+	assert stats.phase_ms["grid"] >= 0.0
+	assert canvas.render_counters() == {"drawn": stats.nodes_drawn, "culled": stats.nodes_culled}
+
+	canvas.viewport().grab()
+	assert canvas.frame_stats().frames == before + 1
+
+
+def test_overlay_refreshes_are_not_frames(canvas: CanvasView) -> None:
+	canvas.set_stats_overlay(True)
+	assert canvas.stats_overlay_enabled
+	assert canvas._stats_timer.isActive()
+	canvas.viewport().grab()
+	frames = canvas.frame_stats().frames
+	canvas.viewport().grab(canvas._stats_overlay_rect())
+	assert canvas.frame_stats().frames == frames
+	canvas.viewport().grab()
+	assert canvas.frame_stats().frames == frames + 1
+	canvas.set_stats_overlay(False)
+	assert not canvas._stats_timer.isActive()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from PyQt6.QtCore import QModelIndex, qInstallMessageHandler
+from PyQt6.QtTest import QAbstractItemModelTester
+
+from app.core.scene import Node, Scene
+from app.ui.docks.hierarchy import FETCH_BATCH, SceneTreeModel
+
+
+@pytest.fixture
+def qt_warnings(qapp) -> Iterator[list[str]]:
+	messages: list[str] = []
+	previous = qInstallMessageHandler(lambda _mode, _context, message: messages.append(message))
+	yield messages
+	qInstallMessageHandler(previous)
+
+
+def _scene(children: int = 3) -> Scene:
+	root = Node(name="Root", id="root")
+	for i in range(children):
+		node = Node(name=f"n{i}", id=f"n{i}")
+		for j in range(3):
+			node.add_child(Node(name=f"n{i}.{j}", id=f"n{i}.{j}"))
+		root.add_child(node)
+	return Scene(name="Test", root=root)
+
+
+def _model(scene: Scene) -> SceneTreeModel:
+	model = SceneTreeModel()
+	model.set_scene(scene)
+	scene.subscribe(model.apply_events)
+	return model
+
+
+def _expand(model: SceneTreeModel, index: QModelIndex | None = None) -> None:
+	index = index or QModelIndex()
+	while model.canFetchMore(index):
+		model.fetchMore(index)
+	for row in range(model.rowCount(index)):
+		_expand(model, model.index(row, 0, index))
+
+
+def _assert_mirrors(model: SceneTreeModel, scene: Scene) -> None:
+	# Exposed rows are a prefix of each parent's children, and every index maps back
+	def walk(index: QModelIndex, children: list[Node]) -> None:
+		count = model.rowCount(index)
+		assert count <= len(children)
+		for row in range(count):
+			child = model.index(row, 0, index)
+			assert model.node_id(child) == children[row].id
+			assert model.parent(child) == index
+			assert model.index_of(children[row].id) == child
+			walk(child, children[row].children)
+
+	walk(QModelIndex(), [scene.root])
+	exposed = set(model._node_of)
+	assert exposed <= {n.id for n in scene.iter_nodes()}
+	assert set(model._parent_of) == exposed
+
+
+def test_children_are_fetched_in_batches(qapp) -> None:
+	scene = _scene(children=FETCH_BATCH * 2 + 10)
+	model = _model(scene)
+	root = model.index(0, 0)
+	assert model.rowCount(root) == 0
+	assert model.hasChildren(root)
+	for expected in (FETCH_BATCH, FETCH_BATCH * 2, FETCH_BATCH * 2 + 10):
+		assert model.canFetchMore(root)
+		model.fetchMore(root)
+		assert model.rowCount(root) == expected
+	assert not model.canFetchMore(root)
+	# Grandchildren stay unfetched until asked for
+	assert model.rowCount(model.index(0, 0, root)) == 0
+	_assert_mirrors(model, scene)
+
+
+def test_index_for_id_exposes_only_the_path(qapp) -> None:
+	scene = _scene(children=FETCH_BATCH + 5)
+	model = _model(scene)
+	deep = f"n{FETCH_BATCH + 2}.1"
+	index = model.index_for_id(deep)
+	assert model.node_id(index) == deep
+	assert model.rowCount(model.index(0, 0)) == FETCH_BATCH + 3
+	assert model.parent_id(deep) == f"n{FETCH_BATCH + 2}"
+	assert "n0.0" not in model._node_of
+	_assert_mirrors(model, scene)
+
+
+def test_insert_into_exposed_and_unfetched_parents(qapp) -> None:
+	scene = _scene()
+	model = _model(scene)
+	model.fetchMore(model.index(0, 0))
+	# n0 is a row but its children were never fetched: no rows appear yet
+	scene.add_child("n0", Node(name="late", id="late"))
+	assert "late" not in model._node_of
+	# The root's children are all exposed: the new node becomes a row at once
+	scene.add_child("root", Node(name="new", id="new"))
+	assert model.node_id(model.index(3, 0, model.index(0, 0))) == "new"
+	scene.reparent_node("new", "root", index=1)
+	assert model.node_id(model.index(1, 0, model.index(0, 0))) == "new"
+	_expand(model)
+	assert model.index_of("late").isValid()
+	_assert_mirrors(model, scene)
+
+
+def test_insert_into_partly_fetched_tail_waits_for_fetch(qapp) -> None:
+	scene = _scene(children=FETCH_BATCH + 5)
+	model = _model(scene)
+	root = model.index(0, 0)
+	model.fetchMore(root)
+	scene.add_child("root", Node(name="tail", id="tail"))
+	assert model.rowCount(root) == FETCH_BATCH
+	model.fetchMore(root)
+	assert model.rowCount(root) == FETCH_BATCH + 6
+	_assert_mirrors(model, scene)
+
+
+def test_batched_removals(qapp) -> None:
+	scene = _scene(children=6)
+	model = _model(scene)
+	_expand(model)
+	with scene.batch():
+		for nid in ("n1", "n2", "n4", "n5.0"):
+			scene.remove_node(nid)
+	root = model.index(0, 0)
+	assert [model.node_id(model.index(r, 0, root)) for r in range(model.rowCount(root))] == [
+		"n0",
+		"n3",
+		"n5",
+	]
+	assert "n1.0" not in model._node_of
+	_assert_mirrors(model, scene)
+
+
+def test_nested_removals_in_one_batch(qapp) -> None:
+	# A node, its parent and a deeper descendant removed together: only the top-most
+	# row is removed and the whole subtree is forgotten
+	scene = _scene()
+	scene.add_child("n1.1", Node(name="d", id="d"))
+	model = _model(scene)
+	_expand(model)
+	with scene.batch():
+		scene.remove_node("d")
+		scene.remove_node("n1.1")
+		scene.remove_node("n1")
+	root = model.index(0, 0)
+	assert model.rowCount(root) == 2
+	assert not {"n1", "n1.0", "n1.1", "d"} & set(model._node_of)
+	assert "n1" not in model._rows
+	_assert_mirrors(model, scene)
+
+
+def test_rename_emits_data_changed(qapp) -> None:
+	scene = _scene()
+	model = _model(scene)
+	_expand(model)
+	changed: list[str] = []
+	model.dataChanged.connect(lambda top, _bottom, _roles=None: changed.append(model.node_id(top)))
+	scene.rename_node("n2.0", "renamed")
+	assert changed == ["n2.0"]
+	assert model.data(model.index_of("n2.0")) == "renamed"
+
+
+def test_model_passes_qt_model_tester(qt_warnings: list[str]) -> None:
+	# The tester re-checks the whole model after every change, fetching as it goes
+	scene = _scene(children=FETCH_BATCH + 5)
+	scene.add_child("n1.1", Node(name="d", id="d"))
+	model = _model(scene)
+	tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+	model.index_for_id(f"n{FETCH_BATCH + 2}.1")
+	_expand(model)
+	scene.add_child("root", Node(name="new", id="new"))
+	scene.reparent_node("new", "n0", index=0)
+	scene.rename_node("n3", "renamed")
+	with scene.batch():
+		for nid in ("d", "n1.1", "n1", "n2", "n4.0"):
+			scene.remove_node(nid)
+	_assert_mirrors(model, scene)
+	assert qt_warnings == []
+	del tester
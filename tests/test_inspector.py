@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QMainWindow
+
+from app.core.commands import create_undo_stack
+from app.core.scene import Node, Scene
+from app.ui.docks.inspector import InspectorDock
+
+
+class _Window(QMainWindow):
+	def __init__(self) -> None:
+		super().__init__()
+		self.undo_stack = create_undo_stack(self)
+		self.inspector = InspectorDock(self)
+		self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.inspector)
+
+
+@pytest.fixture
+def window(qapp):
+	window = _Window()
+	window.show()
+	yield window
+	window.close()
+
+
+def _type(spinbox, text: str) -> None:
+	spinbox.setFocus()
+	spinbox.selectAll()
+	QTest.keyClicks(spinbox, text)
+
+
+def test_typing_multi_character_value(window) -> None:
+	scene = Scene(name="Test")
+	node = Node(name="a", id="a")
+	scene.add_child(scene.root.id, node)
+	dock = window.inspector
+	dock.set_scene(scene)
+	dock.set_selected_ids(["a"])
+	_type(dock._pos_x, "12.5")
+	assert dock._pos_x.value() == 12.5
+	assert node.transform.x == 12.5
+	_type(dock._scale_y, "-3.25")
+	assert node.transform.scale_y == -3.25
+
+
+def test_multi_selection_offsets_every_node(window) -> None:
+	scene = Scene(name="Test")
+	a = Node(name="a", id="a")
+	b = Node(name="b", id="b")
+	b.transform.x = 10.0
+	scene.add_child(scene.root.id, a)
+	scene.add_child(scene.root.id, b)
+	dock = window.inspector
+	dock.set_scene(scene)
+	dock.set_selected_ids(["a", "b"])
+	_type(dock._pos_x, "12.5")
+	assert a.transform.x == 12.5
+	assert b.transform.x == 22.5
+
+
+def test_external_changes_refresh_fields(window) -> None:
+	scene = Scene(name="Test")
+	node = Node(name="a", id="a")
+	scene.add_child(scene.root.id, node)
+	dock = window.inspector
+	dock.set_scene(scene)
+	dock.set_selected_ids(["a"])
+	_type(dock._pos_x, "7")
+	window.undo_stack.undo()
+	assert node.transform.x == 0.0
+	assert dock._pos_x.value() == 0.0
+	node.transform.y = 4.0
+	scene.notify_transform_changed(["a"])
+	assert dock._pos_y.value() == 4.0
+	scene.rename_node("a", "renamed")
+	assert dock._name_edit.text() == "renamed"
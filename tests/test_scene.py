@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from app.core.scene import Node, Scene
+
+
+def _assert_indexed(scene: Scene) -> None:
+	expected_nodes: dict[str, Node] = {}
+	expected_parents: dict[str, str | None] = {scene.root.id: None}
+	for node in scene.iter_nodes():
+		expected_nodes[node.id] = node
+		for child in node.children:
+			expected_parents[child.id] = node.id
+	assert scene._nodes == expected_nodes
+	assert scene._parents == expected_parents
+	for node_id, node in expected_nodes.items():
+		assert scene.find_node(node_id) is node
+		assert scene.parent_id(node_id) == expected_parents[node_id]
+
+
+def _tree() -> Scene:
+	root = Node(name="Root", id="root")
+	a = Node(name="a", id="a")
+	a.add_child(Node(name="a1", id="a1"))
+	a.add_child(Node(name="a2", id="a2"))
+	root.add_child(a)
+	root.add_child(Node(name="b", id="b"))
+	return Scene(name="Test", root=root)
+
+
+def test_index_built_from_root() -> None:
+	scene = _tree()
+	_assert_indexed(scene)
+	assert scene.parent_id("a2") == "a"
+	assert scene.find_node("missing") is None
+
+
+def test_add_registers_subtree() -> None:
+	scene = _tree()
+	sub = Node(name="c", id="c")
+	sub.add_child(Node(name="c1", id="c1"))
+	assert scene.add_child("b", sub)
+	assert not scene.add_child("missing", Node(name="x", id="x"))
+	_assert_indexed(scene)
+	assert scene.parent_id("c1") == "c"
+	assert scene.find_node("x") is None
+
+
+def test_remove_unregisters_subtree() -> None:
+	scene = _tree()
+	assert scene.remove_node("a")
+	_assert_indexed(scene)
+	assert scene.find_node("a1") is None
+	assert scene.parent_id("a1") is None
+	assert not scene.remove_node("a")
+	assert not scene.remove_node(scene.root.id)
+
+
+def test_reparent_updates_parent_only_for_moved_node() -> None:
+	scene = _tree()
+	assert scene.reparent_node("a", "b", 0)
+	_assert_indexed(scene)
+	assert scene.parent_id("a") == "b"
+	assert scene.parent_id("a1") == "a"
+	assert scene.find_node("a1", start=scene.find_node("b")) is not None
+	# A node cannot move under its own descendant
+	assert not scene.reparent_node("b", "a1")
+	_assert_indexed(scene)
+
+
+def test_find_restricted_to_subtree() -> None:
+	scene = _tree()
+	a = scene.find_node("a")
+	assert scene.find_node("a2", start=a) is scene.find_node("a2")
+	assert scene.find_node("b", start=a) is None
+
+
+def test_events_describe_changes() -> None:
+	scene = _tree()
+	received = []
+	scene.subscribe(received.extend)
+	with scene.batch():
+		scene.add_child("a", Node(name="n", id="n"))
+		scene.reparent_node("n", "b")
+		scene.remove_node("n")
+	assert [(ev.kind, ev.node_id, ev.parent_id) for ev in received] == [
+		("added", "n", "a"),
+		("reparented", "n", "b"),
+		("removed", "n", "b"),
+	]
+	assert received[1].old_parent_id == "a"
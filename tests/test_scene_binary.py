@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from pathlib import Path
+
+import pytest
+
+from app.core.scene import Node, Scene, SpriteRegion, TilemapNode, Transform
+from app.core.scene_binary import (
+	MAGIC,
+	VERSION,
+	SceneFile,
+	binary_to_json,
+	is_scene_binary,
+	json_to_binary,
+	read_scene_binary,
+	write_scene_binary,
+)
+from app.core.scene_io import read_scene_json
+from app.core.tilemap import CHUNK_SIZE, ChunkedTileLayer, TileLayer, Tilemap
+
+
+def _tilemap_scene() -> Scene:
+	scene = Scene(name="Tiles")
+	dense = TileLayer(name="Dense", width=20, height=3, data=array("i", range(60)))
+	bounded = ChunkedTileLayer(name="Bounded", width=64, height=64)
+	bounded.set(0, 0, 1)
+	bounded.set(63, 63, 2)
+	unbounded = ChunkedTileLayer(name="Unbounded")
+	unbounded.set(-1, -1, 7)
+	unbounded.set(1000, -5000, 8)
+	node = TilemapNode(
+		name="Map",
+		id="map",
+		tilemap=Tilemap("tiles.tileset.json", 16, 8, [dense, bounded, unbounded]),
+	)
+	scene.add_child(scene.root.id, node)
+	scene.add_child(scene.root.id, TilemapNode(name="No map", id="nomap"))
+	return scene
+
+
+def _round_trip(scene: Scene, tmp_path: Path) -> Scene:
+	path = tmp_path / "scene.dscene"
+	write_scene_binary(scene, path)
+	assert is_scene_binary(path)
+	return read_scene_binary(path)
+
+
+def test_tile_layers_round_trip(tmp_path: Path) -> None:
+	scene = _tilemap_scene()
+	loaded = _round_trip(scene, tmp_path)
+	assert loaded.to_dict() == scene.to_dict()
+	dense, bounded, unbounded = loaded.find_node("map").tilemap.layers
+	assert isinstance(dense, TileLayer)
+	assert list(dense.data) == list(range(60))
+	assert isinstance(bounded, ChunkedTileLayer)
+	assert set(bounded.chunks) == {(0, 0), (63 // CHUNK_SIZE, 63 // CHUNK_SIZE)}
+	assert bounded.get(63, 63) == 2
+	assert unbounded.width == 0
+	assert unbounded.get(-1, -1) == 7
+	assert unbounded.get(1000, -5000) == 8
+	assert unbounded.bounds() == scene.find_node("map").tilemap.layers[2].bounds()
+	assert loaded.find_node("nomap").tilemap is None
+
+
+def test_nodes_and_unicode_strings_round_trip(tmp_path: Path) -> None:
+	scene = Scene(name="Сцена 🎮")
+	parent = Node(name="名前", id="p", transform=Transform(1.0, 2.0, 45.0, -1.0, 0.5))
+	parent.sprite_path = "спрайты/герой.png"
+	parent.sprite_region = SpriteRegion(1, 2, 3, 4)
+	parent.add_child(Node(name="lone \udc80 surrogate", id="c"))
+	scene.add_child(scene.root.id, parent)
+	loaded = _round_trip(scene, tmp_path)
+	assert loaded.to_dict() == scene.to_dict()
+	assert loaded.name == "Сцена 🎮"
+	assert loaded.parent_id("c") == "p"
+	assert loaded.find_node("c").name == "lone \udc80 surrogate"
+
+
+def test_empty_scene_round_trip(tmp_path: Path) -> None:
+	scene = Scene(name="")
+	loaded = _round_trip(scene, tmp_path)
+	assert loaded.to_dict() == scene.to_dict()
+	assert loaded.root.children == []
+	with SceneFile(tmp_path / "scene.dscene") as f:
+		assert f.node_count == 1
+		assert f.version == VERSION
+
+
+def test_json_conversion(tmp_path: Path) -> None:
+	scene = _tilemap_scene()
+	# JSON loads a tilemap node without a tilemap back as a plain node
+	scene.remove_node("nomap")
+	json_path = tmp_path / "scene.json"
+	scene.save_json(json_path)
+	json_to_binary(json_path, tmp_path / "scene.dscene")
+	binary_to_json(tmp_path / "scene.dscene", tmp_path / "back.json")
+	assert read_scene_json(tmp_path / "back.json").to_dict() == scene.to_dict()
+
+
+def test_rejects_bad_magic(tmp_path: Path) -> None:
+	path = tmp_path / "scene.dscene"
+	write_scene_binary(_tilemap_scene(), path)
+	data = bytearray(path.read_bytes())
+	data[: len(MAGIC)] = b"JUNK"
+	path.write_bytes(bytes(data))
+	assert not is_scene_binary(path)
+	with pytest.raises(ValueError, match="Not a binary scene"):
+		read_scene_binary(path)
+
+
+def test_rejects_newer_version(tmp_path: Path) -> None:
+	path = tmp_path / "scene.dscene"
+	write_scene_binary(_tilemap_scene(), path)
+	data = bytearray(path.read_bytes())
+	struct.pack_into("<H", data, len(MAGIC), VERSION + 1)
+	path.write_bytes(bytes(data))
+	with pytest.raises(ValueError, match="Unsupported binary scene version"):
+		read_scene_binary(path)
+
+
+def test_rejects_truncated_header(tmp_path: Path) -> None:
+	path = tmp_path / "scene.dscene"
+	path.write_bytes(MAGIC)
+	with pytest.raises(ValueError, match="Not a binary scene"):
+		read_scene_binary(path)
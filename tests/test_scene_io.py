@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from pathlib import Path
+
+from app.core.scene import Node, Scene, SpriteRegion, TilemapNode, Transform
+from app.core.scene_io import iter_scene_json, loads_iterative, read_scene_json, write_scene_json
+from app.core.tilemap import ChunkedTileLayer, TileLayer, Tilemap
+
+
+def _scene() -> Scene:
+	scene = Scene(name="Level é")
+	group = Node(name="Group", id="group", transform=Transform(x=1.5, y=-2.0, rotation_deg=30.0))
+	sprite = Node(name="Sprite", id="sprite", sprite_path="sheet.png")
+	sprite.sprite_region = SpriteRegion(x=32, y=64, w=16, h=8)
+	group.add_child(sprite)
+	group.add_child(Node(name="Empty group", id="empty"))
+	sparse = ChunkedTileLayer(name="Sparse")
+	sparse.set(-40, 7, 3)
+	tiles = TilemapNode(
+		name="Tiles",
+		id="tiles",
+		tilemap=Tilemap(
+			tileset_path="tiles.tileset.json",
+			tile_width=16,
+			tile_height=16,
+			layers=[
+				TileLayer(name="Ground", width=3, height=2, data=array("i", [0, 1, 2, -1, -1, 5])),
+				sparse,
+			],
+		),
+	)
+	tiles.add_child(Node(name="Marker", id="marker"))
+	scene.add_child(scene.root.id, group)
+	scene.add_child(scene.root.id, tiles)
+	return scene
+
+
+def test_streamed_json_matches_json_dumps(tmp_path: Path) -> None:
+	scene = _scene()
+	expected = json.dumps(scene.to_dict(), indent=2)
+	assert "".join(iter_scene_json(scene)) == expected
+	path = tmp_path / "scene.json"
+	write_scene_json(scene, path)
+	assert path.read_text(encoding="utf-8") == expected
+	assert not path.with_name("scene.json.tmp").exists()
+
+
+def test_round_trip_keeps_nodes(tmp_path: Path) -> None:
+	original = _scene()
+	path = tmp_path / "scene.json"
+	write_scene_json(original, path)
+	scene = read_scene_json(path)
+	assert scene.name == "Level é"
+	assert [node.id for node in scene.iter_nodes()][1:] == [
+		"group", "sprite", "empty", "tiles", "marker",
+	]
+	assert scene.parent_id("sprite") == "group"
+	assert scene.parent_id("marker") == "tiles"
+	assert scene.find_node("group").transform == Transform(x=1.5, y=-2.0, rotation_deg=30.0)
+	sprite = scene.find_node("sprite")
+	assert sprite.sprite_path == "sheet.png"
+	assert sprite.sprite_region == SpriteRegion(x=32, y=64, w=16, h=8)
+	tiles = scene.find_node("tiles")
+	assert isinstance(tiles, TilemapNode)
+	ground, sparse = tiles.tilemap.layers
+	assert isinstance(ground, TileLayer)
+	assert list(ground.data) == [0, 1, 2, -1, -1, 5]
+	assert isinstance(sparse, ChunkedTileLayer)
+	assert sparse.get(-40, 7) == 3
+	assert len(sparse.chunks) == 1
+	assert scene.to_dict() == original.to_dict()
+
+
+def test_deep_tree_round_trip(tmp_path: Path) -> None:
+	depth = sys.getrecursionlimit() * 3
+	scene = Scene(name="Deep")
+	parent = scene.root
+	for i in range(depth):
+		child = Node(name=f"n{i}", id=f"n{i}")
+		parent.add_child(child)
+		parent = child
+	scene.reindex()
+	path = tmp_path / "deep.json"
+	write_scene_json(scene, path)
+	loaded = read_scene_json(path)
+	assert loaded.parent_id(f"n{depth - 1}") == f"n{depth - 2}"
+	assert sum(1 for _ in loaded.iter_nodes()) == depth + 1
+
+
+def test_loads_iterative_matches_json_loads() -> None:
+	text = json.dumps(
+		{"a": [1, -2.5e3, True, None, {"b": "☃ \"q\""}], "c": {}, "d": [], "e": 0.1}
+	)
+	assert loads_iterative(text) == json.loads(text)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from app.core.spatial import SpatialHash
+
+
+def test_query_after_move() -> None:
+	index = SpatialHash(cell_size=64)
+	index.insert("a", (0, 0, 10, 10))
+	index.insert("b", (100, 100, 120, 120))
+	assert index.query_point(5, 5) == {"a"}
+	assert index.query_rect((-10, -10, 200, 200)) == {"a", "b"}
+
+	index.insert("a", (500, 500, 510, 510))
+	assert index.query_point(5, 5) == set()
+	assert index.query_point(505, 505) == {"a"}
+	assert index.query_rect((0, 0, 150, 150)) == {"b"}
+	assert index.bounds("a") == (500, 500, 510, 510)
+
+
+def test_query_after_remove() -> None:
+	index = SpatialHash(cell_size=64)
+	index.insert("a", (0, 0, 10, 10))
+	index.insert("b", (5, 5, 15, 15))
+	index.remove("a")
+	assert "a" not in index
+	assert len(index) == 1
+	assert index.query_point(2, 2) == set()
+	assert index.query_point(8, 8) == {"b"}
+	index.remove_many(["b", "missing"])
+	assert len(index) == 0
+	assert index.query_rect((-100, -100, 100, 100)) == set()
+	# Empty buckets are dropped with their last item
+	assert not index._cells
+
+
+def test_large_items_move_between_grid_and_flat_list() -> None:
+	index = SpatialHash(cell_size=1)
+	index.insert("big", (0, 0, 1000, 1000))
+	assert index.query_point(999, 999) == {"big"}
+	index.insert("big", (0, 0, 2, 2))
+	assert index.query_point(999, 999) == set()
+	assert index.query_point(1, 1) == {"big"}
+	assert not index._large
+	index.remove("big")
+	assert index.query_rect((0, 0, 3, 3)) == set()
+
+
+def test_rect_query_matches_brute_force() -> None:
+	index = SpatialHash(cell_size=32)
+	bounds = {}
+	for i in range(200):
+		x = (i * 37) % 500 - 250
+		y = (i * 91) % 500 - 250
+		b = (x, y, x + 5 + i % 40, y + 5 + i % 25)
+		bounds[i] = b
+		index.insert(i, b)
+	for i in range(0, 200, 3):
+		index.remove(i)
+		del bounds[i]
+	for i in range(1, 200, 5):
+		if i in bounds:
+			x, y, _, _ = bounds[i]
+			bounds[i] = (y, x, y + 10, x + 10)
+			index.insert(i, bounds[i])
+	for query in [(-300, -300, 300, 300), (0, 0, 50, 50), (-100, 20, -60, 80)]:
+		left, top, right, bottom = query
+		expected = {
+			i
+			for i, b in bounds.items()
+			if b[0] < right and left < b[2] and b[1] < bottom and top < b[3]
+		}
+		assert index.query_rect(query) == expected
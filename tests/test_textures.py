@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from app.ui.textures import TextureCache, mip_level
+
+# 16x16 ARGB pixmaps: 1 KiB each
+TEX_BYTES = 16 * 16 * 4
+
+
+def _image(path: Path, size: int = 16) -> Path:
+	image = QImage(size, size, QImage.Format.Format_ARGB32)
+	image.fill(0xFF336699)
+	assert image.save(str(path))
+	return path
+
+
+class _Loader(QObject):
+	"""Stands in for ImageLoader: records requests, decodes only when told to."""
+
+	image_ready = pyqtSignal(str, QImage)
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.requested: list[str] = []
+
+	def request(self, path: str | Path) -> str:
+		self.requested.append(str(path))
+		return str(path)
+
+	def finish(self, key: str) -> None:
+		self.image_ready.emit(key, QImage(key))
+
+
+@pytest.fixture
+def images(qapp, tmp_path: Path) -> list[Path]:
+	return [_image(tmp_path / f"{name}.png") for name in "abcd"]
+
+
+def test_least_recently_used_is_evicted_first(images: list[Path]) -> None:
+	a, b, c, d = images
+	cache = TextureCache(budget_bytes=3 * TEX_BYTES)
+	for path in (a, b, c):
+		assert cache.pixmap(path) is not None
+	assert cache.stats().bytes_used == 3 * TEX_BYTES
+	# Touch a, so b is now the oldest
+	cache.pixmap(a)
+	cache.pixmap(d)
+	stats = cache.stats()
+	assert stats.evictions == 1
+	assert stats.entries == 3
+	assert stats.bytes_used <= cache.budget_bytes
+	assert set(cache._entries) == {cache.canonical_key(p) for p in (a, c, d)}
+
+	# Shrinking the budget drops the oldest entries until it fits
+	cache.set_budget(TEX_BYTES)
+	assert list(cache._entries) == [cache.canonical_key(d)]
+
+
+def test_requested_texture_survives_a_tiny_budget(images: list[Path]) -> None:
+	cache = TextureCache(budget_bytes=10)
+	assert cache.pixmap(images[0]) is not None
+	assert cache.pixmap(images[1]) is not None
+	assert cache.stats().entries == 1
+	assert cache.stats().evictions == 1
+
+
+def test_changed_file_is_reloaded_after_interval(images: list[Path]) -> None:
+	path = images[0]
+	cache = TextureCache(revalidate_interval=3600.0)
+	assert cache.pixmap(path).width() == 16
+	_image(path, size=32)
+	# Within the interval the file is not looked at again
+	assert cache.pixmap(path).width() == 16
+	assert cache.stats().hits == 1
+
+	cache._revalidate_interval = 0.0
+	assert cache.pixmap(path).width() == 32
+	stats = cache.stats()
+	assert stats.loads == 2
+	assert stats.bytes_used == 32 * 32 * 4
+
+	# An unchanged file stays a hit after the check
+	assert cache.pixmap(path).width() == 32
+	assert cache.stats().loads == 2
+
+
+def test_invalidate_drops_entries(images: list[Path]) -> None:
+	a, b = images[:2]
+	cache = TextureCache()
+	cache.pixmap(a)
+	cache.pixmap(b)
+	cache.invalidate(a)
+	assert cache.stats().entries == 1
+	assert cache.stats().bytes_used == TEX_BYTES
+	cache.pixmap(a)
+	assert cache.stats().loads == 3
+	cache.invalidate()
+	assert cache.stats().entries == 0
+	assert cache.stats().bytes_used == 0
+
+
+def test_missing_file_is_a_cached_none(tmp_path: Path, qapp) -> None:
+	cache = TextureCache(revalidate_interval=3600.0)
+	assert cache.pixmap(tmp_path / "missing.png") is None
+	assert cache.pixmap(tmp_path / "missing.png") is None
+	assert cache.stats().loads == 0
+
+
+@pytest.mark.parametrize(
+	("scale", "size", "level"),
+	[
+		(1.0, 64, 0),
+		(0.5, 64, 0),
+		(0.49, 64, 1),
+		(0.25, 64, 2),
+		(0.2, 64, 2),
+		(0.125, 64, 3),
+		# Never coarser than a single texel
+		(0.001, 4, 2),
+		(0.001, 1, 0),
+	],
+)
+def test_mip_level(scale: float, size: int, level: int) -> None:
+	assert mip_level(scale, size, size) == level
+
+
+def test_pixmap_for_scale_caches_levels(qapp, tmp_path: Path) -> None:
+	path = _image(tmp_path / "big.png", size=64)
+	cache = TextureCache()
+	pix, rx, ry = cache.pixmap_for_scale(path, 1.0)
+	assert (pix.width(), rx, ry) == (64, 1.0, 1.0)
+	full_bytes = cache.stats().bytes_used
+
+	pix, rx, ry = cache.pixmap_for_scale(path, 0.25)
+	assert (pix.width(), pix.height(), rx, ry) == (16, 16, 0.25, 0.25)
+	# Both the half and quarter levels are kept and counted against the budget
+	assert cache.stats().bytes_used == full_bytes + (32 * 32 + 16 * 16) * 4
+	again, _rx, _ry = cache.pixmap_for_scale(path, 0.25)
+	assert again.cacheKey() == pix.cacheKey()
+
+
+def test_pending_entries_resolve_when_decoded(qapp, tmp_path: Path) -> None:
+	path = _image(tmp_path / "async.png", size=32)
+	loader = _Loader()
+	cache = TextureCache(loader=loader)
+	loaded: list[str] = []
+	cache.add_load_listener(loaded.append)
+
+	assert cache.pixmap(path) is None
+	assert cache.pixmap(path) is None
+	key = cache.canonical_key(path)
+	assert loader.requested == [key]
+	assert cache.is_pending(path)
+	assert cache.pending_count() == 1
+	# The header size is known before the pixels are
+	assert cache.size(path) == (32, 32)
+	assert cache.stats().bytes_used == 0
+
+	loader.finish(key)
+	assert loaded == [key]
+	assert not cache.is_pending(path)
+	assert cache.pixmap(path).width() == 32
+	assert cache.stats().bytes_used == 32 * 32 * 4
+
+
+def test_decode_of_invalidated_entry_is_ignored(qapp, tmp_path: Path) -> None:
+	path = _image(tmp_path / "async.png")
+	loader = _Loader()
+	cache = TextureCache(loader=loader)
+	loaded: list[str] = []
+	cache.add_load_listener(loaded.append)
+	cache.pixmap(path)
+	cache.invalidate(path)
+	loader.finish(cache.canonical_key(path))
+	assert loaded == []
+	assert cache.stats().entries == 0
+	assert cache.stats().bytes_used == 0
+
+	cache.close()
+	cache.pixmap(path)
+	assert loader.requested == [cache.canonical_key(path)]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import random
+from array import array
+from collections import deque
+
+import pytest
+
+from app.core import tilemap
+from app.core.tilemap import (
+	CHUNK_SIZE,
+	ChunkedTileLayer,
+	TileDiff,
+	TileLayer,
+	fill_pattern,
+	fill_rect,
+	flood_fill,
+	flood_fill_spans,
+)
+
+W, H = 41, 37
+
+
+@pytest.fixture(params=["numpy", "labelled", "pure"], autouse=True)
+def run_finder(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+	# Both ways of splitting rows into runs, and the whole-bounds labelling that takes
+	# over from the run walk on large regions
+	if request.param == "pure":
+		monkeypatch.setattr(tilemap, "np", None)
+	elif tilemap.np is None:
+		pytest.skip("NumPy not installed")
+	elif request.param == "labelled":
+		monkeypatch.setattr(tilemap, "_FLOOD_RUN_BUDGET", 0)
+
+
+def _layers(seed: int) -> list[tilemap.AnyTileLayer]:
+	"""The same random walls on a dense, a bounded sparse and an unbounded sparse layer
+	(the last shifted to straddle negative chunk borders)."""
+	rng = random.Random(seed)
+	cells = [[rng.choice((-1, -1, -1, 0, 1)) for _x in range(W)] for _y in range(H)]
+	dense = TileLayer(name="Dense", width=W, height=H, data=[v for row in cells for v in row])
+	bounded = ChunkedTileLayer(name="Bounded", width=W, height=H)
+	unbounded = ChunkedTileLayer(name="Unbounded")
+	for y, row in enumerate(cells):
+		for x, v in enumerate(row):
+			bounded.set(x, y, v)
+			unbounded.set(x - CHUNK_SIZE - 3, y - CHUNK_SIZE - 5, v)
+	# Keep the sparse layer's extent equal to the others' after the shift
+	unbounded.set(-CHUNK_SIZE - 3, -CHUNK_SIZE - 5, 2)
+	unbounded.set(W - CHUNK_SIZE - 4, H - CHUNK_SIZE - 6, 2)
+	return [dense, bounded, unbounded]
+
+
+def _snapshot(
+	layer: tilemap.AnyTileLayer, rect: tuple[int, int, int, int] | None = None
+) -> dict[tuple[int, int], int]:
+	# Erasing can shrink a sparse layer's bounds, so callers may pin the rect
+	x0, y0, x1, y1 = rect or layer.bounds()
+	return {(x, y): layer.get(x, y) for y in range(y0, y1) for x in range(x0, x1)}
+
+
+def _bfs(layer: tilemap.AnyTileLayer, x: int, y: int) -> set[tuple[int, int]]:
+	x0, y0, x1, y1 = layer.bounds()
+	target = layer.get(x, y)
+	seen = {(x, y)}
+	queue = deque(seen)
+	while queue:
+		cx, cy = queue.popleft()
+		for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+			if x0 <= nx < x1 and y0 <= ny < y1 and (nx, ny) not in seen:
+				if layer.get(nx, ny) == target:
+					seen.add((nx, ny))
+					queue.append((nx, ny))
+	return seen
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_flood_fill_matches_bfs(seed: int) -> None:
+	for layer in _layers(seed):
+		rect = layer.bounds()
+		rng = random.Random(seed)
+		for _ in range(4):
+			x0, y0, x1, y1 = layer.bounds()
+			x, y = rng.randrange(x0, x1), rng.randrange(y0, y1)
+			region = _bfs(layer, x, y)
+			cells = [(sx, sy) for sy, a, b in flood_fill_spans(layer, x, y) for sx in range(a, b)]
+			assert len(cells) == len(set(cells)), "spans overlap"
+			assert set(cells) == region
+
+			before = _snapshot(layer, rect)
+			value = (layer.get(x, y) + 2) % 4 - 1
+			diff = TileDiff()
+			flood_fill(layer, x, y, value, diff)
+			after = _snapshot(layer, rect)
+			changed = {xy for xy in before if before[xy] != after[xy]}
+			assert changed == region
+			assert all(after[xy] == value for xy in region)
+
+			# The diff holds exactly the region, each cell once, with its old and new value
+			cells_xy = [layer.cell_xy(i) for i in diff.index]
+			assert len(cells_xy) == len(region)
+			assert set(cells_xy) == region
+			assert all(old == before[xy] for xy, old in zip(cells_xy, diff.old, strict=True))
+			assert set(diff.new) == {value}
+			diff.apply(layer, undo=True)
+			assert _snapshot(layer, rect) == before
+			diff.apply(layer)
+			assert _snapshot(layer, rect) == after
+
+
+def test_flood_fill_follows_winding_comb() -> None:
+	# One-cell columns joined at alternating ends: one region, one run per cell
+	size = 33
+	layer = TileLayer(name="Comb", width=size, height=size, data=array("i", [-1]) * size * size)
+	for x in range(1, size, 2):
+		fill_rect(layer, x, 0, x, size - 1, 0)
+		layer.set(x, size - 1 if x % 4 == 1 else 0, -1)
+	region = _bfs(layer, 0, 0)
+	assert len(region) == size * size - (size // 2) * (size - 1)
+	diff = TileDiff()
+	assert flood_fill(layer, 0, 0, 5, diff) == len(region)
+	assert {(x, y) for (x, y), v in _snapshot(layer).items() if v == 5} == region
+	assert len(diff) == len(region)
+
+
+def test_fill_with_same_tile_is_noop() -> None:
+	for layer in _layers(1):
+		x0, y0, _x1, _y1 = layer.bounds()
+		before = _snapshot(layer)
+		revisions = dict(layer._chunk_revs)
+		diff = TileDiff()
+		assert flood_fill(layer, x0, y0, layer.get(x0, y0), diff) == 0
+		assert len(diff) == 0
+		assert _snapshot(layer) == before
+		assert layer._chunk_revs == revisions
+
+
+def test_flood_fill_outside_bounds_does_nothing() -> None:
+	layer = TileLayer(name="Dense", width=4, height=4, data=array("i", [-1]) * 16)
+	assert flood_fill(layer, 4, 0, 1) == 0
+	assert flood_fill(ChunkedTileLayer(name="Empty"), 0, 0, 1) == 0
+
+
+def test_flood_fill_erases_and_frees_chunks() -> None:
+	layer = ChunkedTileLayer(name="Sparse")
+	fill_rect(layer, -20, -20, 20, 20, 3)
+	assert len(layer.chunks) == 16
+	flood_fill(layer, 0, 0, -1)
+	assert layer.chunks == {}
+
+
+def test_fill_rect_clips_and_records_diff() -> None:
+	layer = TileLayer(name="Dense", width=10, height=6, data=array("i", [-1]) * 60)
+	layer.set(3, 2, 5)
+	diff = TileDiff()
+	fill_rect(layer, 12, 4, 3, -3, 5, diff)
+	region = {(x, y) for y in range(0, 5) for x in range(3, 10)}
+	assert {xy for xy, v in _snapshot(layer).items() if v == 5} == region
+	# The cell that already held 5 is not recorded
+	assert len(diff) == len(region) - 1
+	assert set(diff.old) == {-1}
+	assert diff.bounds(layer) == (3, 0, 9, 4)
+	diff.apply(layer, undo=True)
+	assert [(x, y) for (x, y), v in _snapshot(layer).items() if v != -1] == [(3, 2)]
+
+
+def test_fill_rect_on_unbounded_layer() -> None:
+	layer = ChunkedTileLayer(name="Sparse")
+	diff = TileDiff()
+	fill_rect(layer, -1, -1, CHUNK_SIZE, 0, 7, diff)
+	assert set(layer.chunks) == {(-1, -1), (0, -1), (1, -1), (-1, 0), (0, 0), (1, 0)}
+	assert len(diff) == (CHUNK_SIZE + 2) * 2
+	assert layer.get(CHUNK_SIZE, -1) == 7
+	assert layer.get(CHUNK_SIZE + 1, -1) == -1
+	diff.apply(layer, undo=True)
+	assert layer.chunks == {}
+
+
+def test_fill_pattern_anchored_at_rect_corner() -> None:
+	layer = TileLayer(name="Dense", width=8, height=8, data=array("i", [-1]) * 64)
+	pattern = array("i", [1, 2, 3, 4, 5, 6])
+	# Starts off the layer: clipping must not shift the pattern
+	fill_pattern(layer, -1, -1, 4, 3, pattern, 3)
+	for y in range(0, 4):
+		for x in range(0, 5):
+			assert layer.get(x, y) == pattern[((y + 1) % 2) * 3 + (x + 1) % 3]
+	assert layer.get(5, 0) == -1
+	with pytest.raises(ValueError):
+		fill_pattern(layer, 0, 0, 1, 1, array("i", [1, 2, 3]), 2)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from array import array
+
+import pytest
+from PyQt6.QtGui import QUndoStack
+
+from app.core import tilemap
+from app.core.commands import TileEditCommand
+from app.core.tilemap import ChunkedTileLayer, TileDiff, TileLayer, fill_rect, flood_fill
+
+
+def _cells(layer: tilemap.AnyTileLayer) -> dict[tuple[int, int], int]:
+	cells = {(x, y): layer.get(x, y) for y in range(-20, 20) for x in range(-20, 20)}
+	return {xy: v for xy, v in cells.items() if v >= 0}
+
+
+def _paint(layer: tilemap.AnyTileLayer, x: int, y: int, value: int) -> TileDiff:
+	# What the painter's pencil does: edit the layer, record the cell
+	diff = TileDiff()
+	diff.add(layer.cell_index(x, y), layer.get(x, y), value)
+	layer.set(x, y, value)
+	return diff
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_add_row_records_changed_cells(numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+	if not numpy:
+		monkeypatch.setattr(tilemap, "np", None)
+	diff = TileDiff()
+	diff.add_row(100, array("i", [1, 2, 3, 4]), array("i", [1, 5, 3, -1]))
+	assert list(diff.index) == [101, 103]
+	assert list(diff.old) == [2, 4]
+	assert list(diff.new) == [5, -1]
+	with pytest.raises(ValueError):
+		diff.add_row(0, array("i", [1, 2]), array("i", [1]))
+	assert len(diff.index) == len(diff.old) == len(diff.new) == 2
+
+
+def test_add_skips_unchanged_and_span_fills_range() -> None:
+	diff = TileDiff()
+	diff.add(5, 3, 3)
+	diff.add_span(10, 0, -1, 2)
+	diff.add_span(10, 3, 4, 4)
+	assert len(diff) == 0
+	diff.add_span(10, 3, -1, 2)
+	assert list(diff.index) == [10, 11, 12]
+	assert list(diff.old) == [-1, -1, -1]
+	assert list(diff.new) == [2, 2, 2]
+	assert diff.nbytes == 3 * (8 + 4 + 4)
+
+
+def test_merge_keeps_first_old_and_last_new() -> None:
+	first = TileDiff()
+	first.add(1, -1, 5)
+	first.add(2, 0, 6)
+	second = TileDiff()
+	second.add(2, 6, 7)
+	second.add(3, -1, 8)
+	first.merge(second)
+	third = TileDiff()
+	third.add(1, 5, 9)
+	first.merge(third)
+	assert list(first.index) == [1, 2, 3]
+	assert list(first.old) == [-1, 0, -1]
+	assert list(first.new) == [9, 7, 8]
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_edit_command_undo_redo_restores_cells(sparse: bool) -> None:
+	if sparse:
+		layer: tilemap.AnyTileLayer = ChunkedTileLayer(name="Sparse")
+	else:
+		layer = TileLayer(name="Dense", width=20, height=20, data=array("i", [-1]) * 400)
+	fill_rect(layer, 2, 2, 5, 5, 1)
+	start = _cells(layer)
+	stack = QUndoStack()
+	changes: list[TileDiff] = []
+
+	# One pencil stroke over four cells, repainting one of them
+	for x, y, v in [(0, 0, 3), (1, 0, 3), (2, 2, 3), (0, 0, 4)]:
+		diff = _paint(layer, x, y, v)
+		stack.push(TileEditCommand(layer, diff, stroke=1, on_change=changes.append))
+	after_stroke = _cells(layer)
+	assert stack.count() == 1
+	assert changes == []
+
+	diff = TileDiff()
+	flood_fill(layer, 3, 3, 2, diff)
+	stack.push(TileEditCommand(layer, diff, "Fill", on_change=changes.append))
+	after_fill = _cells(layer)
+	assert stack.count() == 2
+	assert after_fill[(3, 3)] == 2
+
+	stack.undo()
+	assert _cells(layer) == after_stroke
+	stack.undo()
+	assert _cells(layer) == start
+	assert len(changes) == 2
+	stack.redo()
+	assert _cells(layer) == after_stroke
+	stack.redo()
+	assert _cells(layer) == after_fill
+	if sparse:
+		# Undo frees the chunks the edits allocated
+		stack.setIndex(0)
+		assert set(layer.chunks) == {(0, 0)}
+
+
+def test_strokes_do_not_merge_across_layers_or_strokes() -> None:
+	a = ChunkedTileLayer(name="A")
+	b = ChunkedTileLayer(name="B")
+	stack = QUndoStack()
+	stack.push(TileEditCommand(a, _paint(a, 0, 0, 1), stroke=1))
+	stack.push(TileEditCommand(a, _paint(a, 1, 0, 1), stroke=2))
+	stack.push(TileEditCommand(b, _paint(b, 0, 0, 1), stroke=2))
+	stack.push(TileEditCommand(b, _paint(b, 1, 0, 1)))
+	stack.push(TileEditCommand(b, _paint(b, 2, 0, 1)))
+	assert stack.count() == 5
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_write_cells_rejects_mismatched_lengths(sparse: bool) -> None:
+	if sparse:
+		layer: tilemap.AnyTileLayer = ChunkedTileLayer(name="Sparse")
+	else:
+		layer = TileLayer(name="Dense", width=4, height=4, data=array("i", [-1]) * 16)
+	with pytest.raises(ValueError):
+		layer.write_cells(array("q", [0, 1]), array("i", [7]))
+	assert layer.get(0, 0) == layer.get(1, 0) == -1
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import base64
+import json
+from array import array
+
+import pytest
+
+from app.core.tilemap import (
+	CHUNK_SIZE,
+	ChunkedTileLayer,
+	TileLayer,
+	Tilemap,
+	decode_cells,
+	encode_cells,
+	fill_rect,
+	tile_layer_from_dict,
+)
+
+
+@pytest.mark.parametrize("compression", ["zlib", "gzip", ""])
+def test_encode_decode_round_trip(compression: str) -> None:
+	cells = array("i", [-1, 0, 1, 2**31 - 1, -(2**31), 7] * 50)
+	payload = encode_cells(cells, compression)
+	assert isinstance(payload, str)
+	assert decode_cells(payload, compression) == cells
+
+
+def test_decode_rejects_bad_payload() -> None:
+	with pytest.raises(ValueError, match="Unsupported tile compression"):
+		encode_cells(array("i", [1]), "lzma")
+	with pytest.raises(ValueError, match="whole number"):
+		decode_cells(base64.b64encode(b"\x01\x00\x00\x00\x02\x00").decode(), "")
+
+
+def test_layer_dict_round_trip() -> None:
+	layer = TileLayer(name="Ground", width=5, height=4, data=[i % 3 - 1 for i in range(20)])
+	assert isinstance(layer.data, array)
+	data = json.loads(json.dumps(layer.to_dict()))
+	assert data["encoding"] == "base64"
+	assert data["compression"] == "zlib"
+	assert isinstance(data["data"], str)
+	loaded = TileLayer.from_dict(data)
+	assert loaded == layer
+	assert loaded.get(4, 3) == layer.get(4, 3)
+
+
+def test_reads_legacy_list_data() -> None:
+	legacy = {
+		"tileset_path": "tiles.tileset.json",
+		"tile_width": 16,
+		"tile_height": 16,
+		"layers": [{"name": "Old", "width": 3, "height": 2, "data": [0, 1, -1, 2, "3", 4]}],
+	}
+	tilemap = Tilemap.from_dict(legacy)
+	layer = tilemap.layers[0]
+	assert isinstance(layer, TileLayer)
+	assert layer.data == array("i", [0, 1, -1, 2, 3, 4])
+	# Saved again in the encoded form
+	assert tile_layer_from_dict(layer.to_dict()) == layer
+
+
+def test_short_data_is_padded_and_unknown_encoding_rejected() -> None:
+	layer = TileLayer.from_dict({"name": "Short", "width": 3, "height": 2, "data": [5]})
+	assert list(layer.data) == [5, -1, -1, -1, -1, -1]
+	with pytest.raises(ValueError, match="Unsupported tile encoding"):
+		TileLayer.from_dict({"width": 1, "height": 1, "encoding": "hex", "data": "00"})
+
+
+def test_chunks_allocated_and_freed_across_borders() -> None:
+	layer = ChunkedTileLayer(name="Sparse")
+	# The four cells around the corner where four chunks meet
+	corner = [(-1, -1), (0, -1), (-1, 0), (0, 0)]
+	for i, (x, y) in enumerate(corner):
+		layer.set(x, y, i)
+	assert set(layer.chunks) == {(-1, -1), (0, -1), (-1, 0), (0, 0)}
+	for i, (x, y) in enumerate(corner):
+		assert layer.get(x, y) == i
+	assert layer.get(CHUNK_SIZE, 0) == -1
+	assert layer.bounds() == (-CHUNK_SIZE, -CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+
+	layer.set(CHUNK_SIZE - 1, CHUNK_SIZE - 1, 9)
+	layer.set(0, 0, -1)
+	# Still holds a tile
+	assert (0, 0) in layer.chunks
+	layer.set(CHUNK_SIZE - 1, CHUNK_SIZE - 1, -5)
+	assert (0, 0) not in layer.chunks
+	for x, y in corner[:3]:
+		layer.set(x, y, -1)
+	assert layer.chunks == {}
+	assert layer._filled == {}
+	assert layer.bounds() == (0, 0, 0, 0)
+	# Erasing where nothing is painted allocates nothing
+	layer.set(500, 500, -1)
+	assert layer.chunks == {}
+
+
+def test_bounded_layer_ignores_cells_outside() -> None:
+	layer = ChunkedTileLayer(name="Bounded", width=20, height=10)
+	layer.set(20, 0, 1)
+	layer.set(-1, 0, 1)
+	layer.set(0, 10, 1)
+	assert layer.chunks == {}
+	layer.set(19, 9, 1)
+	assert layer.get(19, 9) == 1
+	assert layer.bounds() == (0, 0, 20, 10)
+
+
+def test_unbounded_bounds_follow_chunks() -> None:
+	layer = ChunkedTileLayer(name="Sparse")
+	layer.set(0, 0, 1)
+	assert layer.bounds() == (0, 0, CHUNK_SIZE, CHUNK_SIZE)
+	layer.set(100, -40, 2)
+	assert layer.bounds() == (0, -48, 112, CHUNK_SIZE)
+	# Freeing an inner chunk keeps the extent, an edge chunk shrinks it
+	layer.set(50, -20, 3)
+	layer.set(50, -20, -1)
+	assert layer.bounds() == (0, -48, 112, CHUNK_SIZE)
+	layer.set(100, -40, -1)
+	assert layer.bounds() == (0, 0, CHUNK_SIZE, CHUNK_SIZE)
+	fill_rect(layer, -33, 0, -33, 0, 4)
+	assert layer.bounds() == (-48, 0, CHUNK_SIZE, CHUNK_SIZE)
+	fill_rect(layer, -33, 0, -33, 0, -1)
+	assert layer.bounds() == (0, 0, CHUNK_SIZE, CHUNK_SIZE)
+	assert layer.bounds() == ChunkedTileLayer.from_dict(layer.to_dict()).bounds()
+
+
+def test_dense_and_sparse_layers_agree() -> None:
+	dense = TileLayer(name="Dense", width=40, height=20, data=array("i", [-1]) * 800)
+	for x, y, v in [(0, 0, 1), (15, 15, 2), (16, 15, 3), (39, 19, 4), (20, 3, 5)]:
+		dense.set(x, y, v)
+	sparse = ChunkedTileLayer.from_layer(dense)
+	assert set(sparse.chunks) == {(0, 0), (1, 0), (2, 1)}
+	for y in range(-1, 21):
+		assert sparse.read_row(y, -2, 42) == dense.read_row(y, -2, 42)
+	loaded = ChunkedTileLayer.from_dict(json.loads(json.dumps(sparse.to_dict())))
+	assert loaded.chunks == sparse.chunks
+	assert loaded._filled == sparse._filled
+	assert isinstance(tile_layer_from_dict(sparse.to_dict()), ChunkedTileLayer)
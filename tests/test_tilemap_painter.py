@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtTest import QTest
+
+from app.core.project import Project, ProjectMeta
+from app.core.tilemap import ChunkedTileLayer, TileLayer, tile_layer_from_dict
+from app.ui.editors.tilemap_painter import TilemapPainterDialog
+
+
+@pytest.fixture
+def dialog(qapp, tmp_path: Path):
+	project = Project(root=tmp_path, meta=ProjectMeta(name="Test"))
+	project.save()
+	image = project.assets_dir / "tiles.png"
+	Image.new("RGBA", (64, 64)).save(image)
+	dlg = TilemapPainterDialog(project, str(image))
+	yield dlg
+	dlg.deleteLater()
+
+
+def _click(dlg: TilemapPainterDialog, x: int, y: int) -> None:
+	# Centre of cell (x, y); the canvas maps 1:1 to tile pixels
+	tw, th = dlg._tilemap.tile_width, dlg._tilemap.tile_height
+	QTest.mouseClick(
+		dlg._canvas, Qt.MouseButton.LeftButton, pos=QPoint(x * tw + tw // 2, y * th + th // 2)
+	)
+
+
+def test_make_sparse_converts_layer_and_undoes(dialog: TilemapPainterDialog) -> None:
+	_click(dialog, 1, 0)
+	dense = dialog._tilemap.layers[0]
+	assert isinstance(dense, TileLayer)
+
+	dialog._sparse_btn.click()
+	sparse = dialog._tilemap.layers[0]
+	assert isinstance(sparse, ChunkedTileLayer)
+	assert (sparse.width, sparse.height) == (dense.width, dense.height)
+	assert sparse.get(1, 0) == 0
+	assert not dialog._sparse_btn.isEnabled()
+
+	# Edits after the swap go to the sparse layer; undo walks back across the swap
+	_click(dialog, 5, 5)
+	assert sparse.get(5, 5) == 0
+	stack = dialog._undo_stack
+	stack.undo()
+	stack.undo()
+	assert dialog._tilemap.layers[0] is dense
+	assert dialog._sparse_btn.isEnabled()
+	assert dense.get(1, 0) == 0 and dense.get(5, 5) == -1
+	stack.redo()
+	stack.redo()
+	assert dialog._tilemap.layers[0] is sparse
+	assert sparse.get(5, 5) == 0
+
+
+def test_sparse_layer_is_saved_as_chunks(dialog: TilemapPainterDialog) -> None:
+	_click(dialog, 2, 3)
+	dialog._sparse_btn.click()
+	dialog._on_save()
+	saved = json.loads((dialog._project.scenes_dir / "tilemap.tilemap.json").read_text())
+	layer = tile_layer_from_dict(saved["layers"][0])
+	assert isinstance(layer, ChunkedTileLayer)
+	assert layer.get(2, 3) == 0
+	assert len(layer.chunks) == 1
+
+
+def _pixel(dlg: TilemapPainterDialog, x: int, y: int) -> int:
+	# Backing image colour at the centre of cell (x, y)
+	tw, th = dlg._tilemap.tile_width, dlg._tilemap.tile_height
+	return dlg._canvas._backing.pixel(x * tw + tw // 2, y * th + th // 2)
+
+
+def test_canvas_redraws_only_dirty_cells(dialog: TilemapPainterDialog) -> None:
+	canvas = dialog._canvas
+	canvas.grab()
+	assert canvas.cells_drawn == 0
+	empty = _pixel(dialog, 0, 0)
+
+	# Edits between two paints are drawn together, each cell once
+	_click(dialog, 1, 1)
+	_click(dialog, 3, 1)
+	canvas.grab()
+	assert canvas.cells_drawn == 2
+	assert canvas._dirty == []
+	painted = _pixel(dialog, 1, 1)
+	assert painted != empty
+
+	# A rect fill redraws its own cells, not the whole map
+	dialog._rect_btn.click()
+	tw, th = dialog._tilemap.tile_width, dialog._tilemap.tile_height
+	QTest.mousePress(canvas, Qt.MouseButton.LeftButton, pos=QPoint(5 * tw + 1, 2 * th + 1))
+	QTest.mouseRelease(canvas, Qt.MouseButton.LeftButton, pos=QPoint(7 * tw + 1, 3 * th + 1))
+	canvas.grab()
+	assert canvas.cells_drawn == 2 + 6
+
+	# Undo clears the cells it reverts; no other cell is redrawn
+	dialog._undo_stack.undo()
+	canvas.grab()
+	assert canvas.cells_drawn == 8
+	assert _pixel(dialog, 6, 2) == empty
+	assert _pixel(dialog, 1, 1) == painted
+
+	# A paint with nothing changed draws nothing
+	canvas.grab()
+	assert canvas.cells_drawn == 8
+
+
+def test_canvas_full_redraw_after_layer_swap(dialog: TilemapPainterDialog) -> None:
+	canvas = dialog._canvas
+	_click(dialog, 0, 0)
+	_click(dialog, 15, 11)
+	canvas.grab()
+	drawn = canvas.cells_drawn
+	# The sparse layer is a new object: the backing image is rebuilt from its chunks
+	dialog._sparse_btn.click()
+	canvas.grab()
+	assert canvas.cells_drawn == drawn + 2
+	assert _pixel(dialog, 15, 11) == _pixel(dialog, 0, 0)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.tilemap import TileLayer, Tilemap, Tileset
+from app.ui import tilemap_renderer
+from app.ui.textures import TextureCache
+from app.ui.tilemap_renderer import TilemapChunkCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+	now = [100.0]
+	monkeypatch.setattr(tilemap_renderer, "time", SimpleNamespace(monotonic=lambda: now[0]))
+	return now
+
+
+@pytest.fixture
+def stats(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+	calls: list[str] = []
+
+	def stat(path):
+		calls.append(str(path))
+		return os.stat(path)
+
+	monkeypatch.setattr(tilemap_renderer, "os", SimpleNamespace(stat=stat))
+	return calls
+
+
+def _node(tileset_path: str) -> SimpleNamespace:
+	layer = TileLayer(name="Layer", width=2, height=2, data=[0, -1, -1, 0])
+	return SimpleNamespace(id="map", tilemap=Tilemap(tileset_path, 32, 32, layers=[layer]))
+
+
+def _write_tileset(path: Path, image: str) -> None:
+	Tileset(image, 32, 32, 64, 64, 2, 2).save_json(path)
+
+
+def test_tileset_is_rechecked_once_per_interval(
+	qapp, tmp_path: Path, clock: list[float], stats: list[str]
+) -> None:
+	_write_tileset(tmp_path / "tiles.tileset.json", "tiles.png")
+	cache = TilemapChunkCache(TextureCache(), revalidate_interval=1.0)
+	node = _node("tiles.tileset.json")
+	for _ in range(5):
+		assert cache.tileset_image(node, tmp_path) == tmp_path / "tiles.png"
+	assert len(stats) == 1
+
+	# A changed file is only noticed once the interval has passed
+	_write_tileset(tmp_path / "tiles.tileset.json", "other-tiles.png")
+	assert cache.tileset_image(node, tmp_path) == tmp_path / "tiles.png"
+	clock[0] += 1.5
+	assert cache.tileset_image(node, tmp_path) == tmp_path / "other-tiles.png"
+	assert cache.tileset_image(node, tmp_path) == tmp_path / "other-tiles.png"
+	assert len(stats) == 2
+
+
+def test_missing_tileset_is_not_stat_on_every_lookup(
+	qapp, tmp_path: Path, clock: list[float], stats: list[str]
+) -> None:
+	cache = TilemapChunkCache(TextureCache(), revalidate_interval=1.0)
+	node = _node("missing.tileset.json")
+	for _ in range(3):
+		assert cache.tileset_image(node, tmp_path) is None
+	assert len(stats) == 1
+	_write_tileset(tmp_path / "missing.tileset.json", "tiles.png")
+	clock[0] += 1.5
+	assert cache.tileset_image(node, tmp_path) == tmp_path / "tiles.png"
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.scene import Node, Scene, Transform
+from app.core.transform_cache import (
+	IDENTITY,
+	WorldTransformCache,
+	compose,
+	local_affine,
+	map_point,
+)
+
+
+def _scene() -> tuple[Scene, WorldTransformCache]:
+	scene = Scene(name="Test")
+	cache = WorldTransformCache(scene)
+	scene.subscribe(cache.apply_events)
+	a = Node(name="a", id="a", transform=Transform(x=10.0, y=0.0))
+	b = Node(name="b", id="b", transform=Transform(x=0.0, y=5.0, rotation_deg=90.0))
+	c = Node(name="c", id="c", transform=Transform(x=1.0, y=0.0, scale_x=2.0))
+	scene.add_child(scene.root.id, a)
+	scene.add_child("a", b)
+	scene.add_child("b", c)
+	scene.add_child(scene.root.id, Node(name="d", id="d", transform=Transform(x=-100.0)))
+	return scene, cache
+
+
+def _expected(scene: Scene, node_id: str):
+	chain = []
+	nid: str | None = node_id
+	while nid is not None:
+		chain.append(scene.find_node(nid))
+		nid = scene.parent_id(nid)
+	m = IDENTITY
+	for node in reversed(chain):
+		m = compose(m, local_affine(node.transform))
+	return m
+
+
+def _origin(cache: WorldTransformCache, scene: Scene, node_id: str) -> tuple[float, float]:
+	return map_point(cache.world(scene.find_node(node_id)), 0.0, 0.0)
+
+
+def test_world_composes_parents() -> None:
+	scene, cache = _scene()
+	# c sits one unit along b's x axis, which points down after the 90 degree turn
+	assert _origin(cache, scene, "c") == pytest.approx((10.0, 6.0))
+	assert cache.world(scene.find_node("c")) == pytest.approx(_expected(scene, "c"))
+
+
+def test_parent_move_dirties_subtree() -> None:
+	scene, cache = _scene()
+	for nid in ("a", "b", "c", "d"):
+		cache.world(scene.find_node(nid))
+	recomputed = cache.recomputed
+	scene.find_node("a").transform.x = 20.0
+	scene.notify_transform_changed(["a"])
+	assert _origin(cache, scene, "c") == pytest.approx((20.0, 6.0))
+	assert _origin(cache, scene, "d") == pytest.approx((-100.0, 0.0))
+	# a, b and c were recomputed; d was still cached
+	assert cache.recomputed - recomputed == 3
+
+
+def test_child_move_keeps_parent_cached() -> None:
+	scene, cache = _scene()
+	cache.world(scene.find_node("c"))
+	recomputed = cache.recomputed
+	scene.find_node("c").transform.y = 3.0
+	scene.notify_transform_changed(["c"])
+	assert _origin(cache, scene, "c") == pytest.approx((7.0, 6.0))
+	assert cache.recomputed - recomputed == 1
+
+
+def test_reparent_uses_new_parent() -> None:
+	scene, cache = _scene()
+	cache.world(scene.find_node("c"))
+	assert scene.reparent_node("b", "d")
+	assert _origin(cache, scene, "b") == pytest.approx((-100.0, 5.0))
+	assert _origin(cache, scene, "c") == pytest.approx((-100.0, 6.0))
+	assert cache.world(scene.find_node("c")) == pytest.approx(_expected(scene, "c"))
+
+
+def test_removed_and_readded_subtree_is_recomputed() -> None:
+	scene, cache = _scene()
+	cache.world(scene.find_node("c"))
+	b = scene.find_node("b")
+	assert scene.remove_node("b")
+	assert scene.add_child("d", b)
+	assert _origin(cache, scene, "c") == pytest.approx((-100.0, 6.0))
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.core import transform_store  # noqa: E402
+from app.core.commands import OffsetTransformFieldCommand  # noqa: E402
+from app.core.scene import Node, Scene, Transform  # noqa: E402
+from app.core.transform_store import TransformStore, TransformView  # noqa: E402
+
+
+def _node(node_id: str, x: float = 0.0, y: float = 0.0, **fields: float) -> Node:
+	return Node(name=node_id, id=node_id, transform=Transform(x=x, y=y, **fields))
+
+
+def _values(t: Transform) -> tuple[float, ...]:
+	return t.x, t.y, t.rotation_deg, t.scale_x, t.scale_y
+
+
+def test_attach_keeps_values_and_is_idempotent() -> None:
+	store = TransformStore()
+	node = _node("a", 1.0, 2.0, rotation_deg=30.0, scale_x=2.0, scale_y=0.5)
+	store.attach(node)
+	view = node.transform
+	assert isinstance(view, TransformView)
+	assert _values(view) == (1.0, 2.0, 30.0, 2.0, 0.5)
+	store.attach(node)
+	assert node.transform is view
+	assert len(store) == 1
+	assert "a" in store
+
+
+def test_detach_returns_plain_transform_and_frees_slot() -> None:
+	store = TransformStore()
+	a, b = _node("a", 1.0, 2.0), _node("b", 3.0, 4.0)
+	store.attach(a)
+	store.attach(b)
+	a.transform.x = 7.0
+	store.detach(a)
+	assert type(a.transform) is Transform
+	assert _values(a.transform) == (7.0, 2.0, 0.0, 1.0, 1.0)
+	assert "a" not in store
+	store.detach(a)
+	assert len(store) == 1
+
+	# The freed slot is reused; the detached node no longer aliases it
+	c = _node("c", -5.0, -6.0)
+	store.attach(c)
+	assert c.transform._slot == 0
+	assert a.transform.x == 7.0
+	assert (c.transform.x, c.transform.y) == (-5.0, -6.0)
+	assert (b.transform.x, b.transform.y) == (3.0, 4.0)
+
+
+def test_store_grows_past_capacity() -> None:
+	store = TransformStore(capacity=2)
+	nodes = [_node(f"n{i}", float(i), float(-i)) for i in range(9)]
+	for node in nodes:
+		store.attach(node)
+	assert len(store) == 9
+	for i, node in enumerate(nodes):
+		assert (node.transform.x, node.transform.y) == (float(i), float(-i))
+	nodes[0].transform.y = 100.0
+	xs, ys = store.positions(store.slots(["n0", "n8"]))
+	assert xs.tolist() == [0.0, 8.0]
+	assert ys.tolist() == [100.0, -8.0]
+
+
+def test_views_and_batch_operations_write_through() -> None:
+	store = TransformStore()
+	a, b = _node("a", 1.0, 1.0), _node("b", 2.0, 2.0)
+	store.attach(a)
+	store.attach(b)
+	slots = store.slots(["b", "missing", "a"])
+	assert len(slots) == 2
+
+	store.set_positions(slots, [20.0, 10.0], [21.0, 11.0])
+	assert (a.transform.x, a.transform.y) == (10.0, 11.0)
+	assert (b.transform.x, b.transform.y) == (20.0, 21.0)
+
+	store.offset(slots, "rotation_deg", 15.0)
+	assert a.transform.rotation_deg == b.transform.rotation_deg == 15.0
+
+	a.transform.scale_x = 3.0
+	xs, _ys = store.positions(slots)
+	assert xs.tolist() == [20.0, 10.0]
+	assert store._data[3, store.slots(["a"])[0]] == 3.0
+
+
+def test_scene_store_follows_added_and_removed_nodes() -> None:
+	root = Node(name="Root", id="root")
+	parent = _node("p", 5.0, 5.0)
+	parent.add_child(_node("c", 1.0, 0.0))
+	root.add_child(parent)
+	scene = Scene(name="Test", root=root)
+	assert scene.enable_transform_store()
+	store = scene.transforms
+	assert store is not None
+	assert set(store._slots) == {"root", "p", "c"}
+	assert all(isinstance(n.transform, TransformView) for n in scene.iter_nodes())
+	assert scene.enable_transform_store()
+	assert scene.transforms is store
+
+	added = _node("new", 9.0, 9.0)
+	scene.add_child("p", added)
+	assert isinstance(added.transform, TransformView)
+	assert added.transform.x == 9.0
+
+	# Removed subtrees get plain transforms back; re-adding them (undo) re-attaches
+	parent.transform.x = 50.0
+	child = scene.find_node("c")
+	assert scene.remove_node("p")
+	assert "p" not in store and "c" not in store
+	assert type(parent.transform) is Transform and type(child.transform) is Transform
+	assert parent.transform.x == 50.0
+	scene.add_child("root", parent)
+	assert isinstance(child.transform, TransformView)
+	assert (parent.transform.x, child.transform.x) == (50.0, 1.0)
+
+
+def test_offset_command_uses_store() -> None:
+	scene = Scene(name="Test")
+	for i in range(3):
+		scene.add_child(scene.root.id, _node(f"n{i}", float(i)))
+	scene.enable_transform_store()
+	command = OffsetTransformFieldCommand(scene, ["n0", "n2"], "x", 2.5)
+	command.redo()
+	assert [scene.find_node(f"n{i}").transform.x for i in range(3)] == [2.5, 1.0, 4.5]
+	command.undo()
+	assert [scene.find_node(f"n{i}").transform.x for i in range(3)] == [0.0, 1.0, 2.0]
+
+
+def test_enable_without_numpy_keeps_plain_transforms(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(transform_store, "np", None)
+	scene = Scene(name="Test")
+	scene.add_child(scene.root.id, _node("a", 1.0))
+	assert not scene.enable_transform_store()
+	assert scene.transforms is None
+	assert type(scene.find_node("a").transform) is Transform
+	with pytest.raises(RuntimeError):
+		TransformStore()